@@ -1,7 +1,8 @@
 from .initial_solution import generate_initial_solution
 from .local_search import local_search
 from .perturbation import perturbation, adaptive_perturbation
-from .mils import modified_iterated_local_search, run_mils
+from .mils import modified_iterated_local_search, run_mils, run_parallel_mils
+from .alns import ALNS
 
 __all__ = [
     'generate_initial_solution',
@@ -9,5 +10,7 @@ __all__ = [
     'perturbation',
     'adaptive_perturbation',
     'modified_iterated_local_search',
-    'run_mils'
+    'run_mils',
+    'run_parallel_mils',
+    'ALNS'
 ]
\ No newline at end of file
@@ -0,0 +1,292 @@
+import time
+import random
+import logging
+from functools import partial
+from SyntheticErrandsScheduler.algorithms.batch_evaluation import evaluate_insertions
+from SyntheticErrandsScheduler.algorithms.insertion import regret_insertion
+from SyntheticErrandsScheduler.utils.travel_time import calculate_travel_time
+from SyntheticErrandsScheduler.config import (GRID_SIZE, MAX_DAYS, ALNS_DESTROY_FRACTION, ALNS_SEGMENT_LENGTH,
+                                              ALNS_REACTION, ALNS_MIN_WEIGHT)
+
+logger = logging.getLogger(__name__)
+
+# Registered operators by name. Destroy operators are called as
+# destroy(schedule, count) and remove at least count assignments (more if removed
+# errands have assigned successors, which go too); repair operators are
+# called as repair(schedule) and insert as many unassigned errands as they can.
+DESTROY_OPERATORS = {}
+REPAIR_OPERATORS = {}
+
+def destroy_operator(name):
+    """Register a destroy operator under a name."""
+    def register(function):
+        DESTROY_OPERATORS[name] = function
+        return function
+    return register
+
+def repair_operator(name):
+    """Register a repair operator under a name."""
+    def register(function):
+        REPAIR_OPERATORS[name] = function
+        return function
+    return register
+
+def _all_assignments(schedule):
+    return [(day, assignment) for day in range(schedule.num_days) for assignment in schedule.assignments[day]]
+
+def _remove_with_successors(schedule, removals):
+    """
+    Remove assignments, and with each one the assignments of the errands that depend on it.
+
+    Leaving a successor assigned when its predecessor is removed would break the
+    precedence constraints, which the repair step cannot fix.
+
+    Args:
+        removals (iterable): (day, assignment) pairs to remove.
+    """
+    placed = {assignment[0]: (day, assignment) for day, assignment in _all_assignments(schedule)}
+    graph = schedule.precedence.graph
+    pending = [assignment[0] for _, assignment in removals]
+    while pending:
+        errand = pending.pop()
+        placement = placed.pop(errand, None)
+        if placement is None:
+            continue
+        schedule.remove_assignment(*placement)
+        pending.extend(schedule.errands[i] for i in graph.successors[graph.index[errand]])
+
+def _randomized_index(length, randomness):
+    """Pick an index into a ranked list, favouring the front more strongly the higher randomness is."""
+    return int(random.random() ** randomness * length)
+
+@destroy_operator('random')
+def random_removal(schedule, count):
+    """Remove randomly chosen assignments."""
+    assignments = _all_assignments(schedule)
+    _remove_with_successors(schedule, random.sample(assignments, min(count, len(assignments))))
+
+# Weights of distance, day and errand type in Shaw relatedness
+SHAW_WEIGHTS = (9.0, 3.0, 2.0)
+
+@destroy_operator('shaw')
+def shaw_removal(schedule, count, randomness=6):
+    """
+    Remove assignments related to a random seed assignment (Shaw removal).
+
+    Two assignments are related if their errands are close together, on nearby days
+    and of the same type, so the repair step can rearrange them among each other.
+    """
+    remaining = _all_assignments(schedule)
+    if not remaining:
+        return
+    distance_weight, day_weight, type_weight = SHAW_WEIGHTS
+    removed = [remaining.pop(random.randrange(len(remaining)))]
+    while remaining and len(removed) < count:
+        day, (errand, _, _) = random.choice(removed)
+
+        def relatedness(candidate):
+            other_day, (other, _, _) = candidate
+            distance = abs(errand.location.x - other.location.x) + abs(errand.location.y - other.location.y)
+            return (distance_weight * distance / (2 * GRID_SIZE) +
+                    day_weight * abs(day - other_day) / MAX_DAYS +
+                    type_weight * (errand.type != other.type))
+
+        remaining.sort(key=relatedness)
+        removed.append(remaining.pop(_randomized_index(len(remaining), randomness)))
+    _remove_with_successors(schedule, removed)
+
+@destroy_operator('worst')
+def worst_removal(schedule, count, randomness=3):
+    """
+    Remove the assignments that contribute least.
+
+    An assignment's contribution is its profit on its day less the cost of travelling
+    to it from the contractor's previous errand (or home), weighted as in
+    calculate_assignment_score.
+    """
+    table = schedule.profit_table
+    contributions = {}
+    for day, (errand, contractor, start_time) in _all_assignments(schedule):
+        timeline = schedule.timelines.get(contractor, day)
+        position = timeline.errands.index(errand)
+        origin = timeline.end_locations[position - 1] if position > 0 else contractor.start_location
+        travel = calculate_travel_time(origin, errand.location)
+        contributions[(day, (errand, contractor, start_time))] = table.profit_of(errand, day) - travel * 0.05
+
+    ranked = sorted(contributions, key=contributions.get)
+    _remove_with_successors(schedule, [ranked.pop(_randomized_index(len(ranked), randomness))
+                                       for _ in range(min(count, len(ranked)))])
+
+@destroy_operator('route')
+def route_removal(schedule, count):
+    """Empty whole contractor-days, chosen at random, until count assignments are removed."""
+    routes = {}
+    for day, assignment in _all_assignments(schedule):
+        routes.setdefault((assignment[1], day), []).append((day, assignment))
+    routes = list(routes.values())
+    random.shuffle(routes)
+    removed = []
+    for route in routes:
+        if len(removed) >= count:
+            break
+        removed.extend(route)
+    _remove_with_successors(schedule, removed)
+
+def _insert_best(schedule, errand):
+    """Insert an errand at its best feasible slot. Returns False if none is feasible."""
+    best = evaluate_insertions(schedule, errand).best()
+    if best is None:
+        return False
+    day, contractor, start_time, _ = best
+    return schedule.assign_errand(contractor, errand, day, start_time)
+
+@repair_operator('greedy')
+def greedy_repair(schedule):
+    """Insert the unassigned errands one at a time, in random order, each at its best slot."""
+    pending = sorted(schedule.unassigned_errands, key=lambda errand: errand.id)
+    random.shuffle(pending)
+    # Errands whose predecessors are still pending may fit on a later round
+    while pending:
+        remaining = [errand for errand in pending if not _insert_best(schedule, errand)]
+        if len(remaining) == len(pending):
+            break
+        pending = remaining
+
+def regret_repair(schedule, k):
+    """Insert the unassigned errands by regret-k, highest regret first (see regret_insertion)."""
+    regret_insertion(schedule, k)
+
+repair_operator('regret-2')(partial(regret_repair, k=2))
+repair_operator('regret-3')(partial(regret_repair, k=3))
+
+class OperatorStats:
+    """Roulette weight and running statistics of one operator."""
+
+    __slots__ = ('name', 'weight', 'calls', 'improvements', 'gain', 'cpu_time', '_segment_gain', '_segment_time')
+
+    def __init__(self, name):
+        self.name = name
+        self.weight = 1.0
+        self.calls = 0
+        self.improvements = 0
+        self.gain = 0.0
+        self.cpu_time = 0.0
+        self._segment_gain = 0.0
+        self._segment_time = 0.0
+
+    def as_dict(self):
+        return {'weight': self.weight, 'calls': self.calls, 'improvements': self.improvements,
+                'gain': self.gain, 'cpu_time': self.cpu_time}
+
+class ALNS:
+    """
+    Adaptive Large Neighborhood Search: destroy and repair with adaptive operator choice.
+
+    Every perturbation picks a destroy and a repair operator by roulette-wheel
+    selection over their weights, removes a random fraction of the assignments
+    (within ALNS_DESTROY_FRACTION) and repairs the schedule. The caller reports the
+    resulting score gain with update. Every ALNS_SEGMENT_LENGTH perturbations each
+    used operator's weight moves towards its score gain per CPU-second in the
+    segment, relative to the best operator's, so operators that pay off cheaply are
+    chosen more often.
+    """
+
+    def __init__(self, destroy_operators=None, repair_operators=None, destroy_fraction=ALNS_DESTROY_FRACTION,
+                 segment_length=ALNS_SEGMENT_LENGTH, reaction=ALNS_REACTION, min_weight=ALNS_MIN_WEIGHT):
+        """
+        Args:
+            destroy_operators (list, optional): Names of the destroy operators to use.
+                Defaults to every registered destroy operator.
+            repair_operators (list, optional): Names of the repair operators to use.
+                Defaults to every registered repair operator.
+            destroy_fraction (tuple): Smallest and largest fraction of the assignments
+                to remove.
+            segment_length (int): Perturbations between weight updates.
+            reaction (float): How far (0 to 1) each update moves a weight.
+            min_weight (float): The smallest weight an operator can have.
+        """
+        self.destroy = {name: DESTROY_OPERATORS[name] for name in destroy_operators or DESTROY_OPERATORS}
+        self.repair = {name: REPAIR_OPERATORS[name] for name in repair_operators or REPAIR_OPERATORS}
+        self.destroy_fraction = destroy_fraction
+        self.segment_length = segment_length
+        self.reaction = reaction
+        self.min_weight = min_weight
+        self.stats = {name: OperatorStats(name) for name in list(self.destroy) + list(self.repair)}
+        self.iterations = 0
+        self._last = None
+
+    def _select(self, names):
+        weights = [self.stats[name].weight for name in names]
+        return random.choices(list(names), weights=weights)[0]
+
+    def perturb(self, schedule):
+        """
+        Destroy and repair a schedule in place with adaptively chosen operators.
+
+        Returns:
+            Schedule: The repaired schedule.
+        """
+        destroy_name = self._select(self.destroy)
+        repair_name = self._select(self.repair)
+        assigned = len(schedule.completed_errands)
+        count = max(1, round(assigned * random.uniform(*self.destroy_fraction)))
+
+        started = time.process_time()
+        self.destroy[destroy_name](schedule, count)
+        destroyed = time.process_time()
+        self.repair[repair_name](schedule)
+        repaired = time.process_time()
+
+        self._last = ((destroy_name, destroyed - started), (repair_name, repaired - destroyed))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("ALNS %s/%s removed %d of %d assignments", destroy_name, repair_name, count, assigned)
+        return schedule
+
+    def update(self, gain):
+        """
+        Credit the operators of the last perturbation with the score gain it led to.
+
+        Args:
+            gain (float): The change in score; losses count as no gain.
+        """
+        if self._last is None:
+            return
+        gain = max(0.0, gain)
+        for name, cpu_time in self._last:
+            stats = self.stats[name]
+            stats.calls += 1
+            stats.improvements += gain > 0
+            stats.gain += gain
+            stats.cpu_time += cpu_time
+            stats._segment_gain += gain
+            stats._segment_time += cpu_time
+        self._last = None
+        self.iterations += 1
+        if self.iterations % self.segment_length == 0:
+            self._update_weights(self.destroy)
+            self._update_weights(self.repair)
+
+    def _update_weights(self, names):
+        used = [self.stats[name] for name in names if self.stats[name]._segment_time > 0]
+        rates = {stats.name: stats._segment_gain / stats._segment_time for stats in used}
+        best_rate = max(rates.values(), default=0.0)
+        for stats in used:
+            relative_rate = rates[stats.name] / best_rate if best_rate > 0 else 0.0
+            stats.weight = max(self.min_weight, (1 - self.reaction) * stats.weight + self.reaction * relative_rate)
+            stats._segment_gain = 0.0
+            stats._segment_time = 0.0
+
+    def operator_stats(self):
+        """
+        Get every operator's statistics.
+
+        Returns:
+            dict: For each operator name, its weight, calls, improvements, total gain
+            and CPU time.
+        """
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
+
+    def log_stats(self):
+        for name, stats in self.stats.items():
+            logger.info("ALNS operator %s: weight %.3f, %d calls, %d improvements, gain %.2f, %.2f CPU s",
+                        name, stats.weight, stats.calls, stats.improvements, stats.gain, stats.cpu_time)
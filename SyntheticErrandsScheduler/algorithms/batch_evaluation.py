@@ -0,0 +1,200 @@
+import numpy as np
+from SyntheticErrandsScheduler.config import MAX_DAYS, WORK_START, WORK_END, SLA_DAYS
+from SyntheticErrandsScheduler.utils.travel_time import travel_time_matrix, traffic_factors
+
+# Minutes between the candidate start times of a move
+SLOT_MINUTES = 15
+
+class CandidateGrid:
+    """
+    Every way of inserting one errand, as (day, contractor, start slot) arrays.
+
+    ``feasible`` says whether schedule.can_assign_errand would accept the errand
+    with the contractor setting off at that slot, ``arrival`` is when it would
+    arrive and ``scores`` is local_search.calculate_assignment_score for the slot.
+    All three have shape (len(days), len(contractors), len(slots)).
+    """
+
+    def __init__(self, days, contractors, slots, feasible, arrival, scores):
+        self.days = days
+        self.contractors = contractors
+        self.slots = slots
+        self.feasible = feasible
+        self.arrival = arrival
+        self.scores = scores
+
+    def best(self, mask=None):
+        """
+        Find the feasible candidate with the highest score.
+
+        Ties go to the earliest day, then contractor, then slot.
+
+        Args:
+            mask (numpy.ndarray, optional): Boolean array broadcastable to the grid's
+                shape; only candidates where it is True are considered.
+
+        Returns:
+            tuple: (day, contractor, start_time, score), or None if no candidate is
+            feasible.
+        """
+        allowed = self.feasible if mask is None else self.feasible & mask
+        if not allowed.any():
+            return None
+        flat = int(np.argmax(np.where(allowed, self.scores, -np.inf)))
+        d, c, s = np.unravel_index(flat, self.scores.shape)
+        return int(self.days[d]), self.contractors[c], int(self.slots[s]), float(self.scores[d, c, s])
+
+def _gap_arrays(timelines, location_id):
+    """
+    Describe the gaps of contractor-days as padded arrays, one row per timeline.
+
+    Column i describes the gap before span i: the end and end location of the span
+    before it (the contractor's start location for the first gap), and the start and
+    start location of the span that follows it.
+
+    Args:
+        timelines (list): (timeline, contractor) pairs.
+        location_id (callable): Numbers a location.
+
+    Returns:
+        tuple: (previous_end, previous_location, next_start, next_location).
+    """
+    width = max(len(timeline) for timeline, _ in timelines) + 1
+    previous_end = np.full((len(timelines), width), -np.inf)
+    previous_location = np.zeros((len(timelines), width), dtype=np.int64)
+    next_start = np.full((len(timelines), width), np.inf)
+    next_location = np.zeros((len(timelines), width), dtype=np.int64)
+    for k, (timeline, contractor) in enumerate(timelines):
+        count = len(timeline)
+        previous_location[k, 0] = location_id(contractor.start_location)
+        if count:
+            previous_end[k, 1:count + 1] = timeline.ends
+            previous_location[k, 1:count + 1] = [location_id(location) for location in timeline.end_locations]
+            next_start[k, :count] = timeline.starts
+            next_location[k, :count] = [location_id(location) for location in timeline.start_locations]
+    return previous_end, previous_location, next_start, next_location
+
+def evaluate_insertions(schedule, errand, days=None, contractors=None, slot_minutes=SLOT_MINUTES):
+    """
+    Evaluate inserting an unassigned errand at every day, contractor and start slot at once.
+
+    The busy spans of every contractor-day are gathered into padded arrays, and
+    travel times to and from the errand are looked up once for every location
+    involved, so the gap lookup, travel, fit and score of all candidates are a few
+    array operations instead of a can_assign_errand and calculate_assignment_score
+    call per candidate.
+
+    Args:
+        schedule (Schedule): The schedule to insert into.
+        errand (Errand): The errand to insert.
+        days (Sequence[int], optional): The days to consider. Defaults to every day.
+        contractors (Sequence[Contractor], optional): The contractors to consider.
+            Defaults to every contractor.
+        slot_minutes (int): Minutes between candidate start times, which run from
+            WORK_START to the last time the errand can start and still end by WORK_END.
+
+    Returns:
+        CandidateGrid: The candidates' feasibility, arrival times and scores.
+    """
+    days = np.arange(schedule.num_days) if days is None else np.asarray(days, dtype=np.int64)
+    contractors = list(schedule.contractors if contractors is None else contractors)
+    slots = np.arange(WORK_START, WORK_END - errand.service_time + 1, slot_minutes, dtype=np.int64)
+    shape = (len(days), len(contractors), len(slots))
+    feasible = np.zeros(shape, dtype=bool)
+    arrival = np.full(shape, np.inf)
+    scores = np.full(shape, -np.inf)
+    if (not all(shape) or schedule.is_errand_assigned(errand)
+            or not schedule.predecessors_completed(errand)):
+        return CandidateGrid(days, contractors, slots, feasible, arrival, scores)
+
+    # Number every location involved, so travel times are gathered in one lookup each way
+    location_ids = {}
+    def location_id(location):
+        return location_ids.setdefault(location, len(location_ids))
+
+    timelines = [(schedule.timelines.get(contractor, int(day)), contractor)
+                 for day in days for contractor in contractors]
+    previous_end, previous_location, next_start, next_location = _gap_arrays(timelines, location_id)
+    schedule.sync_contractors()
+    current_location = np.array([location_id(contractor.current_location) for contractor in contractors])
+
+    locations = list(location_ids)
+    to_errand = travel_time_matrix(locations, [errand.location])[:, 0]
+    from_errand = travel_time_matrix([errand.location], locations)[0]
+
+    departure = slots.astype(np.float64)
+    departure_factor = traffic_factors(departure)
+    # Gap each slot falls in: the number of spans starting at or before it
+    gap = (next_start[:, None, :] <= departure[None, :, None]).sum(axis=2)
+    gap_start = np.take_along_axis(previous_end, gap, axis=1)
+    origin = np.take_along_axis(previous_location, gap, axis=1)
+    gap_end = np.take_along_axis(next_start, gap, axis=1)
+    destination = np.take_along_axis(next_location, gap, axis=1)
+
+    arrival_flat = departure + to_errand[origin] * departure_factor
+    end = arrival_flat + errand.service_time
+    reaches_next = np.isinf(gap_end) | (end + from_errand[destination] * traffic_factors(end) <= gap_end)
+    day_index = np.repeat(days, len(contractors))[:, None]
+    # Work may overflow the end of the day only on the last day
+    within_day = (end <= WORK_END) | (day_index == MAX_DAYS - 1)
+    feasible = ((gap_start <= departure) & reaches_next & within_day).reshape(shape)
+    arrival = arrival_flat.reshape(shape)
+
+    profit = schedule.profit_table.profit[schedule.profit_table.index[errand], days]
+    early_completion_bonus = np.maximum(0, (SLA_DAYS - days) * 0.1 * profit)
+    travel = to_errand[current_location][:, None] * departure_factor[None, :]
+    scores = (profit + early_completion_bonus)[:, None, None] - travel[None, :, :] * 0.05
+    return CandidateGrid(days, contractors, slots, feasible, arrival, scores)
+
+def evaluate_route_insertions(schedule, errands, day, contractor, slot_minutes=SLOT_MINUTES):
+    """
+    Evaluate inserting many unassigned errands on one contractor-day at once.
+
+    Gives the feasibility evaluate_insertions works out for a single day and
+    contractor, for every errand in one pass: the contractor-day's gaps are looked
+    up once for all slots, and the travel times between the errands and the
+    contractor-day's locations in one lookup each way.
+
+    Args:
+        schedule (Schedule): The schedule to insert into.
+        errands (Sequence[Errand]): The errands to insert.
+        day (int): The day to consider.
+        contractor (Contractor): The contractor to consider.
+        slot_minutes (int): Minutes between candidate start times.
+
+    Returns:
+        numpy.ndarray: Boolean array of shape (len(errands), number of slots), with
+        the slots running from WORK_START up to the last start of the shortest
+        errand. The first slots of an errand's row match
+        evaluate_insertions(schedule, errand, [day], [contractor]).feasible[0, 0];
+        the slots after its own last start are False.
+    """
+    service = np.array([errand.service_time for errand in errands], dtype=np.int64)
+    slots = np.arange(WORK_START, WORK_END - service.min(initial=WORK_END) + 1, slot_minutes, dtype=np.int64)
+    if not len(errands) or not len(slots):
+        return np.zeros((len(errands), len(slots)), dtype=bool)
+    ready = np.array([not schedule.is_errand_assigned(errand) and schedule.predecessors_completed(errand)
+                      for errand in errands])
+
+    location_ids = {}
+    def location_id(location):
+        return location_ids.setdefault(location, len(location_ids))
+
+    gaps = _gap_arrays([(schedule.timelines.get(contractor, day), contractor)], location_id)
+    previous_end, previous_location, next_start, next_location = (array[0] for array in gaps)
+    locations = list(location_ids)
+    errand_locations = [errand.location for errand in errands]
+    to_errand = travel_time_matrix(locations, errand_locations)
+    from_errand = travel_time_matrix(errand_locations, locations)
+
+    departure = slots.astype(np.float64)
+    departure_factor = traffic_factors(departure)
+    gap = (next_start[None, :] <= departure[:, None]).sum(axis=1)
+    gap_end = next_start[gap]
+
+    arrival = departure + to_errand[previous_location[gap]].T * departure_factor
+    end = arrival + service[:, None]
+    reaches_next = np.isinf(gap_end) | (end + from_errand[:, next_location[gap]] * traffic_factors(end) <= gap_end)
+    within_day = (end <= WORK_END) | (day == MAX_DAYS - 1)
+    fits = departure <= WORK_END - service[:, None]
+    return (previous_end[gap] <= departure) & reaches_next & within_day & fits & ready[:, None]
@@ -1,8 +1,10 @@
 import logging
-from SyntheticErrandsScheduler.config import WORK_START, WORK_END, MAX_DAYS
-from SyntheticErrandsScheduler.utils.travel_time import calculate_travel_time
+from itertools import islice
+from SyntheticErrandsScheduler.config import WORK_START, WORK_END, MAX_DAYS, SPEED, NEAREST_ERRAND_CANDIDATES
+from SyntheticErrandsScheduler.utils.travel_time import calculate_travel_time, traffic_factor
+from SyntheticErrandsScheduler.utils.spatial_index import SpatialIndex
 
-logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
 
 def calculate_contractor_workload(contractor):
     return sum(
@@ -10,23 +12,75 @@ def calculate_contractor_workload(contractor):
         for day_schedule in contractor.schedule.values()
     )
 
-def find_next_available_time(contractor, day, current_time):
-    if day not in contractor.schedule:
-        return current_time
+def find_insertion(schedule, contractor, day, errand, not_before, latest_end=WORK_END):
+    """
+    The earliest arrival at which an errand fits into a contractor's day.
 
-    day_schedule = sorted(contractor.schedule[day], key=lambda x: x[1])
-    for scheduled_errand, start_time in day_schedule:
-        if current_time < start_time:
-            return current_time
-        current_time = max(current_time, start_time + scheduled_errand.service_time)
+    The contractor's timeline is bisected for the gap containing not_before, and
+    gaps are tried from there until one leaves time to travel to the errand, do it
+    and travel on to the next errand.
 
-    return current_time
+    Returns:
+        float: The arrival time, or None if the errand does not fit by latest_end.
+    """
+    return schedule.timelines.get(contractor, day).earliest_insertion(
+        errand.location, errand.service_time, not_before, contractor.start_location,
+        calculate_travel_time, latest_end=latest_end)
+
+def assign_nearby_errand(schedule, contractor, day, start_time, errand_index, sorted_errands, errand_order):
+    """
+    Assign the contractor the first errand that fits, searching outward from its location.
+
+    Candidates come from the spatial index in widening batches of nearest errands, and
+    each batch is tried in priority order, so far-away errands are only looked at when
+    nothing nearby fits. The search stops at the distance beyond which even the
+    Manhattan travel time would not leave time to start an errand today. Each
+    candidate goes into the earliest gap of the contractor's day that fits it.
+
+    Returns:
+        float: The time the contractor finishes on this day, or None if nothing fits.
+    """
+    max_distance = (WORK_END - start_time) * SPEED / (60 * traffic_factor(start_time))
+    candidates = errand_index.iter_nearest(contractor.current_location)
+    batch_size = NEAREST_ERRAND_CANDIDATES
+    last_day = day == MAX_DAYS - 1
+
+    while True:
+        batch = [errand for distance, errand in islice(candidates, batch_size) if distance < max_distance]
+        if not batch:
+            return None
+        batch.sort(key=errand_order.__getitem__)
+        for errand in batch:
+            if not schedule.predecessors_completed(errand):
+                continue
+            arrival = find_insertion(schedule, contractor, day, errand, start_time)
+            overflow = False
+            if arrival is None and last_day:
+                # Long-duration errands may only run past the end of the day on the last day
+                arrival = find_insertion(schedule, contractor, day, errand, start_time, latest_end=None)
+                overflow = arrival is not None and arrival < WORK_END
+            if arrival is None or (arrival + errand.service_time > WORK_END and not overflow):
+                continue
+            schedule.restore_assignment(contractor, errand, day, arrival)
+            sorted_errands.remove(errand)
+            errand_index.remove(errand)
+            if overflow:
+                logger.info("Assigned errand %s to contractor %s on day %s past the end of the day",
+                            errand.id, contractor.id, day)
+                return WORK_END
+            logger.info("Assigned errand %s to contractor %s on day %s", errand.id, contractor.id, day)
+            return arrival + errand.service_time
+
+        batch_size *= 4
 
 def generate_initial_solution(schedule):
-    logging.info("Generating initial solution")
+    logger.info("Generating initial solution")
+    schedule.sync_contractors()
     
     # Sort errands by priority (higher priority first) and then by service time (longer first)
     sorted_errands = sorted(schedule.unassigned_errands, key=lambda e: (-e.priority, -e.service_time))
+    errand_order = {errand: position for position, errand in enumerate(sorted_errands)}
+    errand_index = SpatialIndex.from_items(sorted_errands, lambda errand: errand.location)
     
     for day in range(MAX_DAYS):
         # Sort contractors by their current workload (least busy first)
@@ -37,45 +91,31 @@ def generate_initial_solution(schedule):
             current_time = WORK_START
             
             while current_time < WORK_END and sorted_errands:
-                for errand in sorted_errands[:]:
-                    travel_time = calculate_travel_time(contractor.current_location, errand.location)
-                    start_time = find_next_available_time(contractor, day, current_time)
-                    end_time = start_time + travel_time + errand.service_time
-                    
-                    if end_time <= WORK_END:
-                        if schedule.assign_errand(contractor, errand, day, start_time + travel_time):
-                            sorted_errands.remove(errand)
-                            current_time = end_time
-                            logging.info(f"Assigned errand {errand.id} to contractor {contractor.id} on day {day}")
-                            break
-                    elif start_time + travel_time < WORK_END:
-                        # Handle long-duration errands by splitting them across multiple days
-                        remaining_time = WORK_END - (start_time + travel_time)
-                        if schedule.assign_errand(contractor, errand, day, start_time + travel_time):
-                            errand.service_time -= remaining_time
-                            logging.info(f"Partially assigned errand {errand.id} to contractor {contractor.id} on day {day}")
-                            current_time = WORK_END
-                            break
-                else:
+                end_time = assign_nearby_errand(schedule, contractor, day, current_time,
+                                                errand_index, sorted_errands, errand_order)
+                if end_time is None:
                     # If no errand could be assigned, move to the next contractor
                     break
+                current_time = end_time
     
     # Try to assign any remaining errands on the last day, even if they exceed working hours
     if sorted_errands:
         last_day = MAX_DAYS - 1
         for contractor in schedule.contractors:
-            current_time = WORK_START
             for errand in sorted_errands[:]:
-                if schedule.assign_errand(contractor, errand, last_day, current_time):
+                if not schedule.predecessors_completed(errand):
+                    continue
+                arrival = find_insertion(schedule, contractor, last_day, errand, WORK_START, latest_end=None)
+                if arrival is not None and arrival < WORK_END:
+                    schedule.restore_assignment(contractor, errand, last_day, arrival)
                     sorted_errands.remove(errand)
-                    current_time += errand.service_time
-                    logging.info(f"Assigned remaining errand {errand.id} to contractor {contractor.id} on last day")
+                    logger.info("Assigned remaining errand %s to contractor %s on last day", errand.id, contractor.id)
     
     # Log any remaining unassigned errands
     for errand in sorted_errands:
-        logging.warning(f"Failed to assign errand {errand.id}")
+        logger.warning(f"Failed to assign errand {errand.id}")
     
-    logging.info(f"Initial solution generated with {len(sorted_errands)} unassigned errands")
+    logger.info(f"Initial solution generated with {len(sorted_errands)} unassigned errands")
     
     stats = {
         "assigned_errands": len(schedule.errands) - len(sorted_errands),
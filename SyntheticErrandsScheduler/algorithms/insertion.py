@@ -0,0 +1,203 @@
+import numpy as np
+from SyntheticErrandsScheduler.algorithms.batch_evaluation import SLOT_MINUTES, evaluate_route_insertions
+from SyntheticErrandsScheduler.config import SLA_DAYS, WORK_START, WORK_END
+from SyntheticErrandsScheduler.utils.travel_time import travel_time_matrix, traffic_factors
+
+class InsertionCache:
+    """
+    Insertion candidates of the unassigned errands, kept up to date as errands are inserted.
+
+    The cache holds one row per errand in stacked arrays: the feasibility of each
+    day, contractor and start slot, as evaluate_insertions computes it, and the two
+    parts of its score, the errand's profit and bonus on each day and the travel
+    penalty from each contractor's current location at each slot. Every errand
+    shares the slots of the shortest one; slots after an errand's own last start are
+    never feasible. Inserting an errand only changes the timeline of one
+    contractor-day and that contractor's current location, so refreshing the cache
+    evaluates that contractor-day again for every cached errand in one pass and
+    looks up one row of travel times.
+
+    Errands with no feasible slot stay in the cache: a new errand changes where
+    the contractor sets off from for the slots after it, so a slot can become
+    feasible again. Errands whose predecessors are unassigned wait outside the
+    cache until the last of their predecessors is inserted.
+    """
+
+    def __init__(self, schedule, errands=None):
+        """
+        Args:
+            schedule (Schedule): The schedule errands are inserted into.
+            errands (iterable, optional): The errands to insert. Defaults to every
+                unassigned errand.
+        """
+        self.schedule = schedule
+        self.contractors = list(schedule.contractors)
+        self._contractor_ids = {contractor: i for i, contractor in enumerate(self.contractors)}
+        errands = sorted(schedule.unassigned_errands if errands is None else errands, key=lambda errand: errand.id)
+        shortest = min((errand.service_time for errand in errands), default=WORK_END)
+        self.slots = np.arange(WORK_START, WORK_END - shortest + 1, SLOT_MINUTES, dtype=np.int64)
+        self._factors = traffic_factors(self.slots)
+
+        self.errands = []
+        self._rows = {}
+        num_days, num_contractors = schedule.num_days, len(self.contractors)
+        self.feasible = np.zeros((0, num_days, num_contractors, len(self.slots)), dtype=bool)
+        self.value = np.zeros((0, num_days))  # profit and early completion bonus of each day
+        self.penalty = np.zeros((0, num_contractors, len(self.slots)))  # travel penalty at each departure slot
+        self.waiting = {errand for errand in errands if not schedule.predecessors_completed(errand)}
+        self._add([errand for errand in errands if errand not in self.waiting])
+
+    def __len__(self):
+        return len(self.errands)
+
+    def __contains__(self, errand):
+        return errand in self._rows
+
+    def scores(self):
+        """Scores of every cached candidate, of shape (errands, days, contractors, slots)."""
+        return self.value[:, :, None, None] - self.penalty[:, None, :, :]
+
+    def _evaluate_route(self, errands, day, c):
+        """Feasibility of errands at every slot of one contractor-day."""
+        route = evaluate_route_insertions(self.schedule, errands, day, self.contractors[c])
+        feasible = np.zeros((len(errands), len(self.slots)), dtype=bool)
+        feasible[:, :route.shape[1]] = route
+        return feasible
+
+    def _penalties(self, errands, contractor_ids):
+        """Travel penalties of errands from some contractors' current locations, as (errands, contractors, slots)."""
+        self.schedule.sync_contractors()
+        travel = travel_time_matrix([self.contractors[c].current_location for c in contractor_ids],
+                                    [errand.location for errand in errands])
+        return travel.T[:, :, None] * self._factors[None, None, :] * 0.05
+
+    def _add(self, errands):
+        """Evaluate errands on every contractor-day and add them to the cache."""
+        if not errands:
+            return
+        days = np.arange(self.schedule.num_days)
+        table = self.schedule.profit_table
+        profit = table.profit[[table.index[errand] for errand in errands]][:, days]
+        feasible = np.zeros((len(errands),) + self.feasible.shape[1:], dtype=bool)
+        for day in days:
+            for c in range(len(self.contractors)):
+                feasible[:, day, c] = self._evaluate_route(errands, int(day), c)
+        self.feasible = np.concatenate([self.feasible, feasible])
+        self.value = np.concatenate([self.value, profit + np.maximum(0, (SLA_DAYS - days) * 0.1 * profit)])
+        self.penalty = np.concatenate([self.penalty, self._penalties(errands, range(len(self.contractors)))])
+        self._set_errands(self.errands + errands)
+
+    def _set_errands(self, errands):
+        self.errands = errands
+        self._rows = {errand: row for row, errand in enumerate(errands)}
+
+    def _keep(self, keep):
+        """Keep only the rows where keep is True."""
+        if keep.all():
+            return
+        self.feasible = self.feasible[keep]
+        self.value = self.value[keep]
+        self.penalty = self.penalty[keep]
+        self._set_errands([errand for errand, kept in zip(self.errands, keep) if kept])
+
+    def inserted(self, errand, contractor, day):
+        """
+        Update the cache after an errand was inserted on a contractor-day.
+
+        The errand is dropped from the cache. Every other errand's candidates on that
+        contractor-day are evaluated again, feasible or not. Waiting errands whose
+        predecessors the insertion completed are evaluated and join the cache.
+        """
+        self.discard(errand)
+        c = self._contractor_ids[contractor]
+        if self.errands:
+            self.feasible[:, day, c] = self._evaluate_route(self.errands, day, c)
+            self.penalty[:, [c]] = self._penalties(self.errands, [c])
+
+        graph = self.schedule.precedence.graph
+        ready = [self.schedule.errands[i] for i in graph.successors[graph.index[errand]]]
+        ready = [successor for successor in ready
+                 if successor in self.waiting and self.schedule.predecessors_completed(successor)]
+        self.waiting.difference_update(ready)
+        self._add(ready)
+
+    def discard(self, errand):
+        """Stop considering an errand."""
+        self.waiting.discard(errand)
+        if errand in self._rows:
+            keep = np.ones(len(self.errands), dtype=bool)
+            keep[self._rows[errand]] = False
+            self._keep(keep)
+
+    def best_insertion(self, errand):
+        """
+        The best cached insertion of an errand.
+
+        Returns:
+            tuple: (day, contractor, start_time, score), or None if no candidate is feasible.
+        """
+        row = self._rows[errand]
+        feasible = self.feasible[row]
+        if not feasible.any():
+            return None
+        scores = np.where(feasible, self.value[row][:, None, None] - self.penalty[row][None, :, :], -np.inf)
+        d, c, s = np.unravel_index(int(np.argmax(scores)), scores.shape)
+        return int(d), self.contractors[c], int(self.slots[s]), float(scores[d, c, s])
+
+    def highest_regret(self, k):
+        """
+        Find the errand with the highest regret-k and its best insertion.
+
+        An errand's regret is the sum of the differences between its best insertion
+        score and its best score on each of the next k - 1 contractor-days, so errands
+        that stand to lose most if their best contractor-day fills up come first.
+        Errands with fewer than k feasible contractor-days have the highest regret;
+        ties go to the higher best score. Errands with no feasible insertion are
+        skipped. Every errand is scored in one pass.
+
+        Returns:
+            tuple: (errand, (day, contractor, start_time, score)), or None if no
+            errand can be inserted.
+        """
+        if not self.errands:
+            return None
+        route_scores = self.scores().max(axis=3, initial=-np.inf, where=self.feasible)
+        route_scores = -np.sort(-route_scores.reshape(len(self.errands), -1), axis=1)
+        best = route_scores[:, 0]
+        feasible = np.isfinite(best)
+        if not feasible.any():
+            return None
+        with np.errstate(invalid='ignore'):
+            regret = np.sum(best[:, None] - route_scores[:, 1:k], axis=1)
+        regret = np.where(np.isfinite(route_scores).sum(axis=1) < k, np.inf, regret)
+        regret[~feasible] = -np.inf
+        candidates = np.flatnonzero(regret == regret.max())
+        errand = self.errands[candidates[np.argmax(best[candidates])]]
+        return errand, self.best_insertion(errand)
+
+def regret_insertion(schedule, k=2, errands=None):
+    """
+    Insert unassigned errands, highest regret-k first, until none fits.
+
+    Args:
+        schedule (Schedule): The schedule to insert into.
+        k (int): The number of contractor-days the regret looks at.
+        errands (iterable, optional): The errands to insert. Defaults to every
+            unassigned errand.
+
+    Returns:
+        list: The inserted errands, in insertion order.
+    """
+    cache = InsertionCache(schedule, errands)
+    inserted = []
+    while cache:
+        choice = cache.highest_regret(k)
+        if choice is None:
+            break
+        errand, (day, contractor, start_time, _) = choice
+        if schedule.assign_errand(contractor, errand, day, start_time):
+            cache.inserted(errand, contractor, day)
+            inserted.append(errand)
+        else:
+            cache.discard(errand)
+    return inserted
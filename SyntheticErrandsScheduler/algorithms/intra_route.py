@@ -0,0 +1,250 @@
+import logging
+from SyntheticErrandsScheduler.config import MAX_DAYS, WORK_START, WORK_END, OR_OPT_MAX_CHAIN
+from SyntheticErrandsScheduler.utils.travel_time import calculate_travel_time, travel_time_matrix
+
+logger = logging.getLogger(__name__)
+
+# Smallest travel saving, in minutes, worth moving errands for
+MIN_TRAVEL_SAVING = 1e-6
+
+class Route:
+    """
+    One contractor-day, prepared for evaluating sequencing moves in constant time.
+
+    A move keeps the errands before position i and after position j in place and
+    visits the errands in between in a new order, given as a few runs of original
+    positions (see evaluate). The route holds the travel times between its errands
+    and from the contractor's start location, taken from the distance matrix under
+    normal traffic, with prefix sums of the legs in both directions, so the travel of
+    any run costs one subtraction. Time feasibility is checked by forward slack: how
+    far each errand could start later without any later errand ending after the
+    working day, given the waiting time in front of each errand.
+    """
+
+    def __init__(self, schedule, contractor, day):
+        timeline = schedule.timelines.get(contractor, day)
+        self.contractor = contractor
+        self.day = day
+        self.errands = list(timeline.errands)
+        self.starts = list(timeline.starts)
+        self.ends = list(timeline.ends)
+        self.latest_end = float('inf') if day == MAX_DAYS - 1 else WORK_END
+
+        n = len(self.errands)
+        # Node 0 is the start location, node p + 1 the errand at position p
+        locations = [contractor.start_location] + [errand.location for errand in self.errands]
+        self.travel = travel_time_matrix(locations, locations).tolist()
+        # Prefix sums of the legs between errands, forwards and backwards
+        self._forward = [0.0] * max(n, 1)
+        self._backward = [0.0] * max(n, 1)
+        self._service = [0.0] * (n + 1)
+        for p in range(n):
+            self._service[p + 1] = self._service[p] + self.ends[p] - self.starts[p]
+            if p > 0:
+                self._forward[p] = self._forward[p - 1] + self.travel[p][p + 1]
+                self._backward[p] = self._backward[p - 1] + self.travel[p + 1][p]
+
+        self.departure = max(WORK_START, self.starts[0] - self.travel[0][1]) if n else WORK_START
+        # Forward slack of each position, from the last errand backwards
+        self.slack = [0.0] * n
+        for p in range(n - 1, -1, -1):
+            self.slack[p] = self.latest_end - self.ends[p]
+            if p < n - 1:
+                wait = max(0.0, self.starts[p + 1] - self.ends[p] - self.travel[p + 1][p + 2])
+                self.slack[p] = min(self.slack[p], wait + self.slack[p + 1])
+
+    def __len__(self):
+        return len(self.errands)
+
+    def travel_minutes(self):
+        """Total travel of the route under normal traffic, from the start location on."""
+        return sum(self.travel[p][p + 1] for p in range(len(self.errands)))
+
+    def _run_travel(self, first, last):
+        """Travel along a run of positions from first to last, either way round."""
+        if first <= last:
+            return self._forward[last] - self._forward[first]
+        return self._backward[first] - self._backward[last]
+
+    def evaluate(self, i, j, runs):
+        """
+        Evaluate visiting positions i to j in a new order.
+
+        Args:
+            i (int): The first position that changes.
+            j (int): The last position that changes.
+            runs (list): The new order of positions i to j as (first, last) runs of
+                original positions, visited from first to last; first > last visits a
+                run in reverse.
+
+        Returns:
+            tuple: (travel_delta, feasible), the change in travel minutes and whether
+            every errand still ends within the working day.
+        """
+        travel = self.travel
+        before = i  # node of position i - 1, or the start location
+        after = j + 2 if j + 1 < len(self.errands) else None
+
+        old = travel[before][i + 1] + self._forward[j] - self._forward[i]
+        if after is not None:
+            old += travel[j + 1][after]
+
+        new = 0.0
+        node = before
+        for first, last in runs:
+            new += travel[node][first + 1] + self._run_travel(first, last)
+            node = last + 1
+        segment_end = ((self.ends[i - 1] if i > 0 else self.departure) + new +
+                       self._service[j + 1] - self._service[i])
+        if after is not None:
+            new += travel[node][after]
+            push = segment_end + travel[node][after] - self.starts[j + 1]
+            feasible = push <= self.slack[j + 1]
+        else:
+            feasible = segment_end <= self.latest_end
+        return new - old, feasible
+
+    def two_opt_moves(self):
+        """Reversals of positions i to j, as (i, j, runs)."""
+        n = len(self.errands)
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                yield i, j, ((j, i),)
+
+    def or_opt_moves(self, max_chain=OR_OPT_MAX_CHAIN):
+        """Moves of a chain of up to max_chain errands to another place in the route, as (i, j, runs)."""
+        n = len(self.errands)
+        for length in range(1, min(max_chain, n - 1) + 1):
+            for start in range(n - length + 1):
+                end = start + length - 1
+                # Insert the chain in front of position k
+                for k in range(start):
+                    yield k, end, ((start, end), (k, start - 1))
+                for k in range(end + 2, n + 1):
+                    yield start, k - 1, ((end + 1, k - 1), (start, end))
+
+    def best_move(self, max_chain=OR_OPT_MAX_CHAIN):
+        """
+        Find the feasible 2-opt or Or-opt move that saves the most travel.
+
+        Returns:
+            tuple: (travel_delta, i, j, runs, evaluations), where the move is None
+            (and travel_delta 0) if no feasible move saves travel.
+        """
+        best = (-MIN_TRAVEL_SAVING, None, None, None)
+        evaluations = 0
+        for moves in (self.two_opt_moves(), self.or_opt_moves(max_chain)):
+            for i, j, runs in moves:
+                evaluations += 1
+                delta, feasible = self.evaluate(i, j, runs)
+                if feasible and delta < best[0]:
+                    best = (delta, i, j, runs)
+        if best[1] is None:
+            return 0.0, None, None, None, evaluations
+        return best + (evaluations,)
+
+    def retime(self, i, j, runs):
+        """
+        Work out the start times of a move's errands under the real traffic factors.
+
+        The errands from position i on are visited in the new order, each as soon as
+        the contractor can get there; errands after position j keep their start time
+        unless they have to start later.
+
+        Returns:
+            list: (errand, old_start, new_start) for every errand whose start changes,
+            or None if an errand would end after the working day.
+        """
+        order = [p for first, last in runs
+                 for p in (range(first, last + 1) if first <= last else range(first, last - 1, -1))]
+        if i > 0:
+            time, location = self.ends[i - 1], self.errands[i - 1].location
+        else:
+            time, location = self.departure, self.contractor.start_location
+
+        changes = []
+        for p in order + list(range(j + 1, len(self.errands))):
+            errand = self.errands[p]
+            arrival = time + calculate_travel_time(location, errand.location, departure_time=time)
+            if p > j:
+                if arrival <= self.starts[p]:
+                    break
+            time = arrival + self.ends[p] - self.starts[p]
+            if time > self.latest_end:
+                return None
+            if arrival != self.starts[p]:
+                changes.append((errand, self.starts[p], arrival))
+            location = errand.location
+        return changes
+
+def apply_changes(schedule, contractor, day, changes):
+    """
+    Move errands to new start times on a contractor-day, all or nothing.
+
+    Returns:
+        bool: True if every errand was moved, False if the schedule was left unchanged.
+    """
+    schedule.journal.checkpoint()
+    for errand, old_start, _ in changes:
+        schedule.remove_assignment(day, (errand, contractor, old_start))
+    try:
+        for errand, _, new_start in changes:
+            schedule.restore_assignment(contractor, errand, day, new_start)
+    except ValueError:
+        schedule.journal.rollback()
+        return False
+    schedule.journal.commit()
+    return True
+
+def improve_route(schedule, contractor, day, max_chain=OR_OPT_MAX_CHAIN, neighborhood=None):
+    """
+    Resequence one contractor-day with 2-opt and Or-opt moves until none saves travel.
+
+    Each round applies the feasible move that saves the most travel minutes. The
+    errands stay with the same contractor on the same day, so the score does not
+    change; the saved travel leaves room for other errands.
+
+    Returns:
+        float: The travel minutes saved, under normal traffic.
+    """
+    saved = 0.0
+    while True:
+        route = Route(schedule, contractor, day)
+        if len(route) < 2:
+            return saved
+        delta, i, j, runs, evaluations = route.best_move(max_chain)
+        if neighborhood is not None:
+            neighborhood.evaluations += evaluations
+        if runs is None:
+            return saved
+        changes = route.retime(i, j, runs)
+        if not changes or not apply_changes(schedule, contractor, day, changes):
+            # The move only fits under normal traffic
+            return saved
+        saved -= delta
+        if neighborhood is not None:
+            for errand, _, _ in changes:
+                neighborhood.touched(schedule, errand, contractor, day)
+
+def optimize_routes(schedule, neighborhood=None, max_chain=OR_OPT_MAX_CHAIN):
+    """
+    Resequence every contractor-day with 2-opt and Or-opt moves.
+
+    With a neighborhood, only contractor-days with an errand looked at in this pass
+    are resequenced.
+
+    Returns:
+        bool: True if any route changed.
+    """
+    saved = 0.0
+    for day in range(schedule.num_days):
+        for contractor in schedule.contractors:
+            errands = schedule.timelines.get(contractor, day).errands
+            if len(errands) < 2:
+                continue
+            if neighborhood is not None and not any(neighborhood.should_look(errand) for errand in errands):
+                continue
+            saved += improve_route(schedule, contractor, day, max_chain, neighborhood)
+    if saved > 0 and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Route moves saved %.1f travel minutes", saved)
+    return saved > 0
@@ -1,43 +1,88 @@
 import time
 import random
 import logging
-from SyntheticErrandsScheduler.config import MAX_DAYS, WORK_START, WORK_END, SLA_DAYS
+import numpy as np
+from SyntheticErrandsScheduler.algorithms.batch_evaluation import evaluate_insertions
+from SyntheticErrandsScheduler.algorithms.intra_route import optimize_routes
+from SyntheticErrandsScheduler.algorithms.neighborhood import Neighborhood
+from SyntheticErrandsScheduler.config import (MAX_DAYS, WORK_START, WORK_END, SLA_DAYS,
+                                              LOCAL_SEARCH_NEIGHBORS, LOCAL_SEARCH_DONT_LOOK_BITS)
 from SyntheticErrandsScheduler.utils.travel_time import calculate_travel_time
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-def local_search(schedule, max_time=10):
-    logger.debug(f"Starting optimized local search with schedule: {schedule}")
+# Score changes smaller than this count as no change
+SCORE_TOLERANCE = 1e-9
+
+def local_search(schedule, max_time=10, neighbors=LOCAL_SEARCH_NEIGHBORS, dont_look_bits=LOCAL_SEARCH_DONT_LOOK_BITS,
+                 neighborhood=None):
+    """
+    Improve a schedule in place with timing, route sequencing, swap and relocation moves
+    until no move helps.
+
+    Args:
+        schedule (Schedule): The schedule to improve.
+        max_time (float): The maximum time (in seconds) to search.
+        neighbors (int, optional): Only try moves between an errand and its this many
+            nearest errands and contractors. None tries every errand and contractor.
+        dont_look_bits (bool): After the first pass, only look at errands whose
+            surroundings a move changed in the previous pass.
+        neighborhood (Neighborhood, optional): Use this neighborhood instead of one
+            built from neighbors and dont_look_bits, e.g. to read its evaluation
+            count afterwards.
+
+    Returns:
+        Schedule: The improved schedule.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Starting optimized local search with schedule: %s", schedule)
     start_time = time.time()
+    initial_score = schedule.score()
+    if neighborhood is None:
+        neighborhood = Neighborhood(schedule, neighbors, dont_look_bits)
     improved = True
 
     while improved and time.time() - start_time < max_time:
         improved = False
         
-        improved |= optimize_errand_timing(schedule)
-        improved |= swap_errands(schedule)
-        improved |= relocate_errand(schedule)
+        for move in (optimize_errand_timing, optimize_routes, swap_errands, relocate_errand):
+            # The schedule keeps its score up to date, so each move's effect costs O(1) to report
+            score_before = schedule.score()
+            if move(schedule, neighborhood):
+                improved = True
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("%s changed the score by %.4f", move.__name__, schedule.score() - score_before)
+            if time.time() - start_time >= max_time:
+                break
 
         if time.time() - start_time >= max_time:
             logger.info("Time limit reached in optimized local search.")
             break
+        if not neighborhood.next_pass():
+            break
     
-    logger.debug(f"Optimized local search completed. Final schedule: {schedule}")
+    logger.info("Local search changed the score by %.4f in %d move evaluations",
+                schedule.score() - initial_score, neighborhood.evaluations)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Optimized local search completed. Final schedule: %s", schedule)
     return schedule
 
-def optimize_errand_timing(schedule):
+def optimize_errand_timing(schedule, neighborhood=None):
     """Optimize the timing of errands to maximize early completion bonuses."""
     improved = False
     for day in range(schedule.num_days):
         assignments = schedule.assignments[day]
-        for i, (errand, contractor, start_time) in enumerate(assignments):
+        for errand, contractor, start_time in list(assignments):
+            if neighborhood is not None and not neighborhood.should_look(errand):
+                continue
             earliest_start = max(WORK_START, int(start_time - 60))  # Try up to 1 hour earlier
             latest_start = min(WORK_END - errand.service_time, int(start_time + 60))  # Try up to 1 hour later
             
             best_start = start_time
-            best_score = calculate_assignment_score(schedule, day, errand, contractor, start_time)
+            best_score = current_score = calculate_assignment_score(schedule, day, errand, contractor, start_time)
             
+            if neighborhood is not None:
+                neighborhood.evaluations += len(range(earliest_start, latest_start + 1, 15))
             for new_start in range(earliest_start, latest_start + 1, 15):  # Check every 15 minutes
                 if new_start != start_time:
                     new_score = calculate_assignment_score(schedule, day, errand, contractor, new_start)
@@ -46,71 +91,126 @@ def optimize_errand_timing(schedule):
                         best_score = new_score
             
             if best_start != start_time:
+                # The new time may not fit around the contractor's other errands
+                score_before = schedule.score()
+                schedule.journal.checkpoint()
                 schedule.remove_assignment(day, (errand, contractor, start_time))
-                schedule.assign_errand(contractor, errand, day, best_start)
+                if (not schedule.assign_errand(contractor, errand, day, best_start) or
+                        not accept_move(schedule, score_before, best_score - current_score)):
+                    schedule.journal.rollback()
+                    continue
+                schedule.journal.commit()
+                if neighborhood is not None:
+                    neighborhood.touched(schedule, errand, contractor, day)
                 improved = True
     
     return improved
 
-def swap_errands(schedule):
-    """Attempt to improve the schedule by swapping pairs of errands."""
+def swap_errands(schedule, neighborhood=None):
+    """
+    Attempt to improve the schedule by swapping pairs of errands.
+
+    With a neighborhood, only pairs of neighbouring errands are tried, and only if
+    at least one of them is looked at in this pass.
+    """
     improved = False
     for day in range(schedule.num_days):
         assignments = schedule.assignments[day]
         for i in range(len(assignments)):
             for j in range(i + 1, len(assignments)):
-                if try_swap(schedule, day, i, j):
+                pair = (assignments[i], assignments[j])
+                if neighborhood is not None:
+                    if not _worth_trying(neighborhood, pair[0][0], pair[1][0]):
+                        continue
+                    neighborhood.evaluations += 1
+                if swap_assignments(schedule, day, *pair):
+                    if neighborhood is not None:
+                        _touched_by_swap(schedule, neighborhood, pair, day, day)
                     improved = True
+                    # The swapped assignments moved to the end of the day's list, which
+                    # the array backend hands out as a copy
+                    assignments = schedule.assignments[day]
     
     # Try swapping errands between days
     for day1 in range(schedule.num_days):
         for day2 in range(day1 + 1, schedule.num_days):
+            if neighborhood is None:
+                if try_swap_between_days(schedule, day1, day2):
+                    improved = True
+                continue
+            if not schedule.assignments[day1] or not schedule.assignments[day2]:
+                continue
+            pair = (schedule.assignments[day1][0], schedule.assignments[day2][0])
+            if not _worth_trying(neighborhood, pair[0][0], pair[1][0]):
+                continue
+            neighborhood.evaluations += 1
             if try_swap_between_days(schedule, day1, day2):
+                _touched_by_swap(schedule, neighborhood, pair, day1, day2)
                 improved = True
     
     return improved
 
+def _worth_trying(neighborhood, errand1, errand2):
+    return ((neighborhood.should_look(errand1) or neighborhood.should_look(errand2))
+            and neighborhood.are_neighbors(errand1, errand2))
+
+def _touched_by_swap(schedule, neighborhood, pair, day1, day2):
+    """Record the contractor-days a swap between two assignments changed."""
+    (errand1, contractor1, _), (errand2, contractor2, _) = pair
+    neighborhood.touched(schedule, errand1, contractor1, day1)
+    neighborhood.touched(schedule, errand1, contractor2, day2)
+    neighborhood.touched(schedule, errand2, contractor2, day2)
+    neighborhood.touched(schedule, errand2, contractor1, day1)
+
+def accept_move(schedule, score_before, assignment_gain):
+    """
+    Decide whether to keep a move, from the change in the schedule's score.
+
+    A move that raises the score is kept and one that lowers it is not. Moves that
+    leave it unchanged, such as retiming or swapping errands on the same day, are
+    kept if they improve calculate_assignment_score by assignment_gain.
+    """
+    delta = schedule.score() - score_before
+    return delta > SCORE_TOLERANCE or (delta >= -SCORE_TOLERANCE and assignment_gain > 0)
+
 def try_swap(schedule, day, i, j):
     assignments = schedule.assignments[day]
     if i >= len(assignments) or j >= len(assignments):
         return False
+    return swap_assignments(schedule, day, assignments[i], assignments[j])
 
-    errand1, contractor1, start_time1 = assignments[i]
-    errand2, contractor2, start_time2 = assignments[j]
+def swap_assignments(schedule, day, assignment1, assignment2):
+    """Give two assignments on a day each other's contractor, if accept_move keeps the swap."""
+    errand1, contractor1, start_time1 = assignment1
+    errand2, contractor2, start_time2 = assignment2
 
-    if not (errand1.are_predecessors_completed(schedule.completed_errands - {errand2}) and
-            errand2.are_predecessors_completed(schedule.completed_errands - {errand1})):
+    if not (schedule.predecessors_completed(errand1, excluding=errand2) and
+            schedule.predecessors_completed(errand2, excluding=errand1)):
         return False
 
     current_score = (calculate_assignment_score(schedule, day, errand1, contractor1, start_time1) +
                      calculate_assignment_score(schedule, day, errand2, contractor2, start_time2))
 
-    travel_time1 = calculate_travel_time(contractor2.current_location, errand1.location)
-    travel_time2 = calculate_travel_time(contractor1.current_location, errand2.location)
-
-    # Check if the swap is valid before making any changes
-    if (schedule.can_assign_errand(contractor2, errand1, day, start_time1 + travel_time1) and
-        schedule.can_assign_errand(contractor1, errand2, day, start_time2 + travel_time2)):
+    schedule.sync_contractors()
+    travel_time1 = calculate_travel_time(contractor2.current_location, errand1.location, departure_time=start_time1)
+    travel_time2 = calculate_travel_time(contractor1.current_location, errand2.location, departure_time=start_time2)
 
-        # Now it's safe to remove and reassign
-        schedule.remove_assignment(day, (errand1, contractor1, start_time1))
-        schedule.remove_assignment(day, (errand2, contractor2, start_time2))
-
-        schedule.assign_errand(contractor2, errand1, day, start_time1 + travel_time1)
-        schedule.assign_errand(contractor1, errand2, day, start_time2 + travel_time2)
+    # The journal undoes the swap exactly if it does not fit or does not pay off
+    score_before = schedule.score()
+    schedule.journal.checkpoint()
+    schedule.remove_assignment(day, assignment1)
+    schedule.remove_assignment(day, assignment2)
 
+    if (schedule.assign_errand(contractor2, errand1, day, start_time1 + travel_time1) and
+            schedule.assign_errand(contractor1, errand2, day, start_time2 + travel_time2)):
         new_score = (calculate_assignment_score(schedule, day, errand1, contractor2, start_time1 + travel_time1) +
                      calculate_assignment_score(schedule, day, errand2, contractor1, start_time2 + travel_time2))
 
-        if new_score > current_score:
+        if accept_move(schedule, score_before, new_score - current_score):
+            schedule.journal.commit()
             return True
-        else:
-            # Swap back if no improvement
-            schedule.remove_assignment(day, (errand1, contractor2, start_time1 + travel_time1))
-            schedule.remove_assignment(day, (errand2, contractor1, start_time2 + travel_time2))
-            schedule.assign_errand(contractor1, errand1, day, start_time1)
-            schedule.assign_errand(contractor2, errand2, day, start_time2)
 
+    schedule.journal.rollback()
     return False
 
 def try_swap_between_days(schedule, day1, day2):
@@ -123,61 +223,92 @@ def try_swap_between_days(schedule, day1, day2):
     current_score = (calculate_assignment_score(schedule, day1, errand1, contractor1, start_time1) +
                      calculate_assignment_score(schedule, day2, errand2, contractor2, start_time2))
 
-    if (schedule.can_assign_errand(contractor2, errand1, day2, start_time2) and
-        schedule.can_assign_errand(contractor1, errand2, day1, start_time1)):
-
-        schedule.remove_assignment(day1, (errand1, contractor1, start_time1))
-        schedule.remove_assignment(day2, (errand2, contractor2, start_time2))
-
-        schedule.assign_errand(contractor2, errand1, day2, start_time2)
-        schedule.assign_errand(contractor1, errand2, day1, start_time1)
+    # The journal undoes the swap exactly if it does not fit or does not pay off
+    score_before = schedule.score()
+    schedule.journal.checkpoint()
+    schedule.remove_assignment(day1, (errand1, contractor1, start_time1))
+    schedule.remove_assignment(day2, (errand2, contractor2, start_time2))
 
+    if (schedule.assign_errand(contractor2, errand1, day2, start_time2) and
+            schedule.assign_errand(contractor1, errand2, day1, start_time1)):
         new_score = (calculate_assignment_score(schedule, day2, errand1, contractor2, start_time2) +
                      calculate_assignment_score(schedule, day1, errand2, contractor1, start_time1))
 
-        if new_score > current_score:
+        if accept_move(schedule, score_before, new_score - current_score):
+            schedule.journal.commit()
             return True
-        else:
-            # Swap back if no improvement
-            schedule.remove_assignment(day2, (errand1, contractor2, start_time2))
-            schedule.remove_assignment(day1, (errand2, contractor1, start_time1))
-            schedule.assign_errand(contractor1, errand1, day1, start_time1)
-            schedule.assign_errand(contractor2, errand2, day2, start_time2)
 
+    schedule.journal.rollback()
     return False
 
-def relocate_errand(schedule):
-    """Attempt to improve the schedule by moving an errand to a different position or contractor."""
-    improved = False
+def relocate_errand(schedule, neighborhood=None):
+    """Attempt to improve the schedule by moving an errand to a different day or contractor."""
     for day in range(schedule.num_days):
-        assignments = schedule.assignments[day]
-        for i, (errand, contractor, start_time) in enumerate(assignments):
-            for new_day in range(schedule.num_days):
-                if new_day != day:
-                    if try_relocate(schedule, day, new_day, i):
-                        improved = True
-                        break
-            
-            if not improved:
-                for new_contractor in schedule.contractors:
-                    if new_contractor != contractor:
-                        if try_relocate(schedule, day, day, i, new_contractor):
-                            improved = True
-                            break
-            
-            if improved:
-                break
-        if improved:
-            break
-    return improved
+        for i in range(len(schedule.assignments[day])):
+            if try_relocate_best(schedule, day, i, neighborhood):
+                return True
+    return False
+
+def try_relocate_best(schedule, old_day, index, neighborhood=None):
+    """
+    Move an errand to the best start slot on any other day or with any other contractor,
+    if accept_move keeps the move.
+
+    All candidates are evaluated together with evaluate_insertions. Staying with the
+    same contractor on the same day is not a candidate, as with try_relocate. With a
+    neighborhood, only the errand's nearest contractors and its own are candidates.
+    """
+    assignments = schedule.assignments[old_day]
+    if index >= len(assignments):
+        return False
+    errand, old_contractor, old_start_time = assignments[index]
+
+    if neighborhood is not None and not neighborhood.should_look(errand):
+        return False
+    if not schedule.predecessors_completed(errand):
+        return False
+
+    current_score = calculate_assignment_score(schedule, old_day, errand, old_contractor, old_start_time)
+    score_before = schedule.score()
+    schedule.journal.checkpoint()
+    schedule.remove_assignment(old_day, (errand, old_contractor, old_start_time))
+
+    contractors = None
+    if neighborhood is not None:
+        contractors = neighborhood.contractors_for(errand, old_contractor, schedule.contractors)
+    grid = evaluate_insertions(schedule, errand, contractors=contractors)
+    if neighborhood is not None:
+        neighborhood.evaluations += grid.feasible.size
+    same_place = ((grid.days == old_day)[:, None] &
+                  np.array([contractor == old_contractor for contractor in grid.contractors])[None, :])
+    best = grid.best(~same_place[:, :, None])
+
+    if best is not None:
+        new_day, new_contractor, new_start_time, new_score = best
+        if (schedule.assign_errand(new_contractor, errand, new_day, new_start_time) and
+                accept_move(schedule, score_before, new_score - current_score)):
+            schedule.journal.commit()
+            if neighborhood is not None:
+                neighborhood.touched(schedule, errand, old_contractor, old_day)
+                neighborhood.touched(schedule, errand, new_contractor, new_day)
+            return True
+
+    # Put the errand back exactly where it was
+    schedule.journal.rollback()
+    return False
 
 def try_relocate(schedule, old_day, new_day, index, new_contractor=None):
     assignments = schedule.assignments[old_day]
+    if index >= len(assignments):
+        return False
     errand, old_contractor, old_start_time = assignments[index]
 
-    if not errand.are_predecessors_completed(schedule.completed_errands - {errand}):
+    if not schedule.predecessors_completed(errand):
         return False
 
+    current_score = calculate_assignment_score(schedule, old_day, errand, old_contractor, old_start_time)
+    score_before = schedule.score()
+    schedule.journal.checkpoint()
     schedule.remove_assignment(old_day, (errand, old_contractor, old_start_time))
 
     new_contractor = new_contractor or old_contractor
@@ -192,15 +323,20 @@ def try_relocate(schedule, old_day, new_day, index, new_contractor=None):
                 best_start_time = new_start_time
 
     if best_start_time is not None:
-        if schedule.assign_errand(new_contractor, errand, new_day, best_start_time):
+        if (schedule.assign_errand(new_contractor, errand, new_day, best_start_time) and
+                accept_move(schedule, score_before, best_score - current_score)):
+            schedule.journal.commit()
             return True
 
-    schedule.assign_errand(old_contractor, errand, old_day, old_start_time)
+    # Put the errand back exactly where it was
+    schedule.journal.rollback()
     return False
 
-def calculate_assignment_score(schedule, day, errand, contractor, start_time):
-    profit = errand.calculate_profit(day, SLA_DAYS)
+def calculate_assignment_score(schedule, day, errand, contractor, start_time, travel_time=None):
+    profit = schedule.profit_table.profit_of(errand, day)
     early_completion_bonus = max(0, (SLA_DAYS - day) * 0.1 * profit)  # Increased bonus for earlier completion
-    travel_time = calculate_travel_time(contractor.current_location, errand.location)
+    if travel_time is None:
+        schedule.sync_contractors()
+        travel_time = calculate_travel_time(contractor.current_location, errand.location, departure_time=start_time)
     
     return profit + early_completion_bonus - travel_time * 0.05  # Reduced travel time penalty
\ No newline at end of file
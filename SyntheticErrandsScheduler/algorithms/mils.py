@@ -2,17 +2,25 @@ import time
 import random
 import math
 import logging
+from multiprocessing import Pool
+import numpy as np
 from SyntheticErrandsScheduler.algorithms.initial_solution import generate_initial_solution
 from SyntheticErrandsScheduler.algorithms.local_search import local_search
 from SyntheticErrandsScheduler.algorithms.perturbation import adaptive_perturbation
+from SyntheticErrandsScheduler.algorithms.alns import ALNS
 from SyntheticErrandsScheduler.models.schedule import Schedule
-from SyntheticErrandsScheduler.config import SLA_DAYS, WORK_START, WORK_END
+from SyntheticErrandsScheduler.models.problem import describe_problem, describe_assignments, build_schedule, load_assignments
+from SyntheticErrandsScheduler.utils.travel_time import get_travel_time_cache
+from SyntheticErrandsScheduler.config import (WORK_START, WORK_END, SCORE_WEIGHTS, MAX_SOLVE_TIME, MILS_WORKERS,
+                                              MILS_PERTURBATION)
 
-# Set up logging
-logging.basicConfig(filename='mils_log.log', level=logging.DEBUG,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
-def modified_iterated_local_search(schedule, max_iterations=1000, max_time=300, temperature=100.0, cooling_rate=0.995):
+# Seconds to wait past the deadline for parallel runs to finish their last iteration
+_RESULT_GRACE = 1.0
+
+def modified_iterated_local_search(schedule, max_iterations=1000, max_time=300, temperature=100.0, cooling_rate=0.995,
+                                   perturbation=MILS_PERTURBATION):
     """
     Perform Modified Iterated Local Search to maximize profit while satisfying constraints.
 
@@ -26,24 +34,36 @@ def modified_iterated_local_search(schedule, max_iterations=1000, max_time=300,
         max_time (float): The maximum time (in seconds) to run the algorithm.
         temperature (float): The initial temperature for the acceptance criterion.
         cooling_rate (float): The rate at which the temperature cools down.
+        perturbation (str or ALNS): 'adaptive' to perturb with adaptive_perturbation,
+            'alns' to destroy and repair with a new ALNS engine, or an ALNS engine to
+            use (whose operator statistics can be read afterwards).
 
     Returns:
         Schedule: The best profit-maximized schedule found.
     """
     start_time = time.time()
+    if perturbation == 'alns':
+        perturbation = ALNS()
+    elif perturbation != 'adaptive' and not isinstance(perturbation, ALNS):
+        raise ValueError(f"Invalid perturbation: {perturbation}")
+    alns = perturbation if isinstance(perturbation, ALNS) else None
     
     try:
-        logging.info("Generating initial solution")
+        logger.info("Generating initial solution")
         current_solution, stats = generate_initial_solution(schedule)
-        logging.debug(f"Initial solution generated: {current_solution}, Stats: {stats}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Initial solution generated: %s, Stats: %s", current_solution, stats)
         
-        logging.info("Performing initial local search to maximize profit")
-        current_solution = local_search(current_solution, max_time=30)
-        logging.debug(f"After initial profit-maximizing local search: {current_solution}")
+        logger.info("Performing initial local search to maximize profit")
+        remaining_time = max(0.0, max_time - (time.time() - start_time))
+        current_solution = local_search(current_solution, max_time=min(30, remaining_time))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("After initial profit-maximizing local search: %s", current_solution)
         
         best_solution = current_solution.copy()
         best_score = calculate_solution_score(best_solution)
-        logging.info(f"Initial best score: {best_score}")
+        current_score = best_score
+        logger.info("Initial best score: %s", best_score)
 
         iteration = 0
         plateau_counter = 0
@@ -51,49 +71,68 @@ def modified_iterated_local_search(schedule, max_iterations=1000, max_time=300,
 
         while iteration < max_iterations and time.time() - start_time < max_time:
             try:
-                logging.info(f"Starting iteration {iteration}")
+                logger.info("Starting iteration %d", iteration)
                 
+                # Perturb and improve the current solution in place; the journal
+                # undoes both if the result is rejected
+                current_solution.journal.checkpoint()
+
                 # Perturbation
-                logging.info("Performing adaptive perturbation")
-                perturbed_solution = adaptive_perturbation(current_solution.copy(), iteration, max_iterations)
-                logging.debug(f"After perturbation: {perturbed_solution}")
+                if alns is not None:
+                    logger.info("Performing ALNS destroy and repair")
+                    perturbed_solution = alns.perturb(current_solution)
+                else:
+                    logger.info("Performing adaptive perturbation")
+                    perturbed_solution = adaptive_perturbation(current_solution, iteration, max_iterations)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("After perturbation: %s", perturbed_solution)
                 
                 # Local search
-                logging.info("Performing local search focused on profit maximization")
-                improved_solution = local_search(perturbed_solution, max_time=10)
-                logging.debug(f"After local search: {improved_solution}")
+                logger.info("Performing local search focused on profit maximization")
+                remaining_time = max(0.0, max_time - (time.time() - start_time))
+                improved_solution = local_search(perturbed_solution, max_time=min(10, remaining_time))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("After local search: %s", improved_solution)
                 
                 # Solution evaluation
-                current_score = calculate_solution_score(current_solution)
                 improved_score = calculate_solution_score(improved_solution)
 
-                logging.debug(f"Current score: {current_score}, Improved score: {improved_score}")
+                logger.debug("Current score: %s, Improved score: %s", current_score, improved_score)
+                if alns is not None:
+                    alns.update(improved_score - current_score)
 
                 # Acceptance criterion (simulated annealing-like with adaptive temperature)
                 if improved_score > current_score:
-                    current_solution = improved_solution
-                    logging.debug("Accepted new solution (improvement)")
+                    accepted = True
+                    logger.debug("Accepted new solution (improvement)")
                     plateau_counter = 0
                 elif random.random() < math.exp((improved_score - current_score) / adaptive_temp):
-                    current_solution = improved_solution
-                    logging.debug(f"Accepted new solution (probabilistic, temp: {adaptive_temp})")
+                    accepted = True
+                    logger.debug("Accepted new solution (probabilistic, temp: %s)", adaptive_temp)
                     plateau_counter = 0
                 else:
-                    logging.debug("Rejected new solution")
+                    accepted = False
+                    logger.debug("Rejected new solution")
                     plateau_counter += 1
                 
                 # Update best solution if necessary
                 if improved_score > best_score:
                     best_solution = improved_solution.copy()
                     best_score = improved_score
-                    logging.info(f"New best score: {best_score}")
+                    logger.info("New best score: %s", best_score)
                     plateau_counter = 0
+
+                if accepted:
+                    current_solution.journal.commit()
+                    current_score = improved_score
+                else:
+                    current_solution.journal.rollback()
                 
                 # Adaptive mechanisms
                 if plateau_counter > 50:
                     adaptive_temp *= 2  # Increase temperature to encourage exploration
                     plateau_counter = 0
-                    logging.info(f"Increased temperature to {adaptive_temp}")
+                    logger.info("Increased temperature to %s", adaptive_temp)
                 else:
                     adaptive_temp *= cooling_rate
                 
@@ -101,50 +140,79 @@ def modified_iterated_local_search(schedule, max_iterations=1000, max_time=300,
                 iteration += 1
                 
                 if iteration % 100 == 0:
-                    logging.info(f"Iteration {iteration}: Best score = {best_score}")
+                    logger.info("Iteration %d: Best score = %s", iteration, best_score)
             
             except Exception as e:
-                logging.error(f"Error in iteration {iteration}: {str(e)}")
-                logging.exception("Exception traceback:")
+                logger.error("Error in iteration %d: %s", iteration, e)
+                logger.exception("Exception traceback:")
+                # Undo whatever the failed iteration had changed
+                while current_solution.journal.recording:
+                    current_solution.journal.rollback()
                 continue
 
     except Exception as e:
-        logging.error(f"Error in modified_iterated_local_search: {str(e)}")
-        logging.exception("Exception traceback:")
+        logger.error(f"Error in modified_iterated_local_search: {str(e)}")
+        logger.exception("Exception traceback:")
         return schedule  # Return the original schedule if an error occurs
     
-    logging.info("Finished modified_iterated_local_search")
+    if alns is not None:
+        alns.log_stats()
+    logger.info("Finished modified_iterated_local_search")
     return best_solution
 
 def calculate_solution_score(solution):
     """
     Calculate a comprehensive score for the solution, considering profit, SLA compliance,
     early completion incentives, and resource utilization.
+
+    The score comes from the running totals the schedule keeps up to date on every
+    assignment and removal, so it costs O(1). When debug logging is enabled it is
+    checked against a full recomputation.
     """
-    profit = solution.calculate_total_profit()
+    score = solution.score()
+    if logger.isEnabledFor(logging.DEBUG):
+        check_solution_score(solution, score)
+    return score
+
+def recalculate_solution_score(solution):
+    """Calculate the solution score from scratch by walking every assignment."""
+    profit = sum(errand.charge for day_assignments in solution.assignments.values()
+                 for errand, _, _ in day_assignments)
     sla_compliance = solution.calculate_sla_compliance()
     early_completion_bonus = calculate_early_completion_bonus(solution)
     resource_utilization = calculate_resource_utilization(solution)
     
     # Combine the factors with appropriate weights
-    score = (profit * 0.5 +
-             sla_compliance * 0.3 +
-             early_completion_bonus * 0.1 +
-             resource_utilization * 0.1)
+    score = (profit * SCORE_WEIGHTS['profit'] +
+             sla_compliance * SCORE_WEIGHTS['sla_compliance'] +
+             early_completion_bonus * SCORE_WEIGHTS['early_completion_bonus'] +
+             resource_utilization * SCORE_WEIGHTS['resource_utilization'])
     
-    logging.debug(f"Score breakdown - Profit: {profit}, SLA Compliance: {sla_compliance}, "
-                  f"Early Completion Bonus: {early_completion_bonus}, "
-                  f"Resource Utilization: {resource_utilization}")
+    logger.debug("Score breakdown - Profit: %s, SLA Compliance: %s, Early Completion Bonus: %s, "
+                 "Resource Utilization: %s", profit, sla_compliance, early_completion_bonus, resource_utilization)
     
     return score
 
+def check_solution_score(solution, score=None, tolerance=1e-6):
+    """
+    Check the incrementally maintained score of a solution against a full recomputation.
+
+    Raises:
+        AssertionError: If the two scores differ by more than the relative tolerance.
+    """
+    if score is None:
+        score = solution.score()
+    expected = recalculate_solution_score(solution)
+    if abs(score - expected) > tolerance * max(1.0, abs(expected)):
+        raise AssertionError(f"Incremental score {score} differs from recomputed score {expected}")
+
 def calculate_early_completion_bonus(solution):
     """Calculate the total early completion bonus for all errands in the solution."""
+    table = solution.profit_table
     total_bonus = 0
     for day in range(solution.num_days):
         for errand, _, _ in solution.assignments[day]:
-            days_early = max(0, SLA_DAYS - (day - errand.days_since_request))
-            total_bonus += days_early * 0.05 * errand.charge
+            total_bonus += table.completion_bonus_of(errand, day)
     return total_bonus
 
 def calculate_resource_utilization(solution):
@@ -156,76 +224,194 @@ def calculate_resource_utilization(solution):
     )
     return total_used / total_capacity if total_capacity > 0 else 0
 
-def verify_solution(solution):
+def run_seeds(seed, num_runs):
     """
-    Perform sanity checks on the solution to ensure it's valid.
+    Derive independent RNG seeds for a number of runs from one root seed.
+
+    Args:
+        seed (int): The root seed, or None to draw one from the OS.
+        num_runs (int): The number of runs.
+
+    Returns:
+        tuple: (root_seed, seeds) where root_seed reproduces the same seeds.
     """
-    # Check if all errands are assigned
-    assigned_errands = set()
-    for day_assignments in solution.assignments.values():
-        for errand, _, _ in day_assignments:
-            assigned_errands.add(errand.id)
-    
-    if len(assigned_errands) != len(solution.errands):
-        logging.warning(f"Not all errands are assigned. Assigned: {len(assigned_errands)}, Total: {len(solution.errands)}")
-    
-    # Check for overlapping assignments
-    for day, day_assignments in solution.assignments.items():
-        contractor_schedules = {}
-        for errand, contractor, start_time in day_assignments:
-            if contractor.id not in contractor_schedules:
-                contractor_schedules[contractor.id] = []
-            contractor_schedules[contractor.id].append((start_time, start_time + errand.service_time))
-        
-        for contractor_id, schedule in contractor_schedules.items():
-            schedule.sort()
-            for i in range(len(schedule) - 1):
-                if schedule[i][1] > schedule[i+1][0]:
-                    logging.warning(f"Overlapping assignments for contractor {contractor_id} on day {day}")
-    
-    return True
+    sequence = np.random.SeedSequence(seed)
+    seeds = [int(child.generate_state(1)[0]) for child in sequence.spawn(num_runs)]
+    return sequence.entropy, seeds
 
-def run_mils(schedule, num_runs=5, **kwargs):
+def run_mils(schedule, num_runs=5, workers=None, seed=None, time_limit=None, **kwargs):
     """
     Run the MILS algorithm multiple times and return the best result.
 
     Args:
         schedule (Schedule): The initial schedule to optimize.
         num_runs (int): The number of times to run the MILS algorithm.
+        workers (int, optional): Run in this many processes with run_parallel_mils.
+            Defaults to MILS_WORKERS; 1 runs one after another in this process.
+        seed (int, optional): Root seed the runs' RNG seeds are derived from.
+        time_limit (float, optional): Wall-clock limit in seconds across all runs.
+            Defaults to MAX_SOLVE_TIME.
         **kwargs: Additional arguments to pass to the MILS function.
 
     Returns:
-        Schedule: The best schedule found across all runs.
+        Schedule: The best schedule found across all runs, or a copy of schedule if
+        every run failed.
     """
+    workers = workers or MILS_WORKERS
+    if workers > 1:
+        best_solution, _ = run_parallel_mils(schedule, num_runs, workers, seed, time_limit, **kwargs)
+        return best_solution
+
+    deadline = time.time() + (MAX_SOLVE_TIME if time_limit is None else time_limit)
+    root_seed, seeds = run_seeds(seed, num_runs)
+    logger.info("Run seeds derived from root seed %s", root_seed)
     best_solution = None
     best_score = float('-inf')
 
     for run in range(num_runs):
-        logging.info(f"Starting run {run + 1}/{num_runs}")
+        remaining_time = deadline - time.time()
+        if remaining_time <= 0:
+            logger.warning("Time limit reached after %d of %d runs", run, num_runs)
+            break
+        logger.info(f"Starting run {run + 1}/{num_runs}")
         try:
-            solution = modified_iterated_local_search(schedule, **kwargs)
+            random.seed(seeds[run])
+            run_kwargs = dict(kwargs, max_time=min(kwargs.get('max_time', 300), remaining_time))
+            solution = modified_iterated_local_search(schedule, **run_kwargs)
             score = calculate_solution_score(solution)
             
             if score > best_score:
                 best_solution = solution
                 best_score = score
             
-            logging.info(f"Run {run + 1} completed. Score: {score}")
-            logging.info(f"Solution details - Profit: {solution.calculate_total_profit()}, "
+            logger.info(f"Run {run + 1} completed. Score: {score}")
+            logger.info(f"Solution details - Profit: {solution.calculate_total_profit()}, "
                          f"SLA Compliance: {solution.calculate_sla_compliance()}, "
-                         f"Resource Utilization: {calculate_resource_utilization(solution)}")
-            
-            verify_solution(solution)
+                         f"Resource Utilization: {calculate_resource_utilization(solution)}, "
+                         f"Unassigned errands: {len(solution.unassigned_errands)}")
         except Exception as e:
-            logging.error(f"Error in run {run + 1}: {str(e)}")
-            logging.exception("Exception traceback:")
+            logger.error(f"Error in run {run + 1}: {str(e)}")
+            logger.exception("Exception traceback:")
 
     if best_solution:
-        logging.info(f"Best overall score: {best_score}")
-        logging.info(f"Best profit: {best_solution.calculate_total_profit()}")
-        logging.info(f"Best SLA compliance: {best_solution.calculate_sla_compliance()}")
-        logging.info(f"Best resource utilization: {calculate_resource_utilization(best_solution)}")
+        logger.info(f"Best overall score: {best_score}")
+        logger.info(f"Best profit: {best_solution.calculate_total_profit()}")
+        logger.info(f"Best SLA compliance: {best_solution.calculate_sla_compliance()}")
+        logger.info(f"Best resource utilization: {calculate_resource_utilization(best_solution)}")
     else:
-        logging.error("All runs failed.")
+        logger.error("All runs failed; returning the initial schedule.")
+        best_solution = schedule.copy()
+
+    cache_stats = get_travel_time_cache().stats()
+    logger.info(f"Travel time cache - Hits: {cache_stats['hits']}, Misses: {cache_stats['misses']}, "
+                 f"Evictions: {cache_stats['evictions']}, Hit rate: {cache_stats['hit_rate']:.2%}, "
+                 f"Size: {cache_stats['size']}/{cache_stats['maxsize']}")
     
-    return best_solution
\ No newline at end of file
+    return best_solution
+
+def run_parallel_mils(schedule, num_runs=5, workers=None, seed=None, time_limit=None, **kwargs):
+    """
+    Run the MILS algorithm multiple times in worker processes and return the best result.
+
+    Every worker gets a compact description of the problem (see describe_problem)
+    rather than pickled schedule objects, rebuilds the schedule, seeds its RNG with
+    its own seed and sends back its solution's assignments and statistics. All runs
+    share one wall-clock deadline: each run's max_time is cut to the time left, and
+    worker processes still running shortly after the deadline are terminated, so the
+    call returns within time_limit plus about a second.
+
+    Args:
+        schedule (Schedule): The initial schedule to optimize.
+        num_runs (int): The number of times to run the MILS algorithm.
+        workers (int, optional): The number of worker processes. Defaults to one per CPU.
+        seed (int, optional): Root seed the runs' RNG seeds are derived from.
+        time_limit (float, optional): Wall-clock limit in seconds across all runs.
+            Defaults to MAX_SOLVE_TIME.
+        **kwargs: Additional arguments to pass to the MILS function.
+
+    Returns:
+        tuple: (best_solution, run_stats) where best_solution is a copy of schedule
+        holding the best run's assignments (its own assignments if no run finished)
+        and run_stats has one dict per run, in run order.
+    """
+    deadline = time.time() + (MAX_SOLVE_TIME if time_limit is None else time_limit)
+    root_seed, seeds = run_seeds(seed, num_runs)
+    logger.info("Starting %d runs in parallel, seeds derived from root seed %s", num_runs, root_seed)
+    description = describe_problem(schedule)
+
+    pool = Pool(processes=workers)
+    try:
+        pending = [pool.apply_async(_mils_worker, (description, run, seeds[run], deadline, kwargs))
+                   for run in range(num_runs)]
+        cutoff = deadline + _RESULT_GRACE
+        for result in pending:
+            result.wait(max(0.0, cutoff - time.time()))
+    finally:
+        # Stop overdue runs; left running, they would hold up the interpreter's exit
+        pool.terminate()
+        pool.join()
+
+    run_stats = [{'run': run, 'seed': seeds[run], 'status': 'timed out'} for run in range(num_runs)]
+    results = {}
+    for run, pending_result in enumerate(pending):
+        if not pending_result.ready():
+            continue
+        try:
+            result = pending_result.get()
+        except Exception as e:
+            logger.error(f"Error in run {run + 1}: {str(e)}")
+            run_stats[run]['status'] = 'failed'
+            continue
+        if result['stats']['status'] != 'ok':
+            continue
+        results[run] = result
+        run_stats[run] = result['stats']
+    timed_out = sum(stats['status'] == 'timed out' for stats in run_stats)
+    if timed_out:
+        logger.warning("%d of %d runs did not finish within the time limit", timed_out, num_runs)
+
+    for stats in run_stats:
+        if stats['status'] == 'ok':
+            logger.info(f"Run {stats['run'] + 1} completed in {stats['elapsed']:.1f}s. Score: {stats['score']}, "
+                        f"Profit: {stats['profit']}, SLA Compliance: {stats['sla_compliance']}, "
+                        f"Resource Utilization: {stats['resource_utilization']}, "
+                        f"Unassigned errands: {stats['unassigned']}")
+
+    if not results:
+        logger.error("No run finished; returning the initial schedule.")
+        return schedule.copy(), run_stats
+
+    # Ties go to the earliest run, as in the sequential loop
+    best_run = max(sorted(results), key=lambda run: results[run]['stats']['score'])
+    best_solution = schedule.copy()
+    load_assignments(best_solution, results[best_run]['assignments'])
+    logger.info(f"Best overall score: {calculate_solution_score(best_solution)} (run {best_run + 1})")
+    logger.info(f"Best profit: {best_solution.calculate_total_profit()}")
+    logger.info(f"Best SLA compliance: {best_solution.calculate_sla_compliance()}")
+    logger.info(f"Best resource utilization: {calculate_resource_utilization(best_solution)}")
+    return best_solution, run_stats
+
+def _mils_worker(description, run, seed, deadline, kwargs):
+    """Run one MILS run in a worker process from a describe_problem description."""
+    started = time.time()
+    if started >= deadline:
+        # Queued behind other runs until the time was up
+        return {'assignments': None, 'stats': {'run': run, 'seed': seed, 'status': 'timed out'}}
+    random.seed(seed)
+    schedule = build_schedule(description)
+    run_kwargs = dict(kwargs, max_time=min(kwargs.get('max_time', 300), max(0.0, deadline - time.time())))
+    solution = modified_iterated_local_search(schedule, **run_kwargs)
+    return {
+        'assignments': describe_assignments(solution),
+        'stats': {
+            'run': run,
+            'seed': seed,
+            'status': 'ok',
+            'score': calculate_solution_score(solution),
+            'profit': solution.calculate_total_profit(),
+            'sla_compliance': solution.calculate_sla_compliance(),
+            'resource_utilization': calculate_resource_utilization(solution),
+            'unassigned': len(solution.unassigned_errands),
+            'elapsed': time.time() - started,
+        },
+    }
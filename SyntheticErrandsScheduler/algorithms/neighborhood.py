@@ -0,0 +1,107 @@
+from SyntheticErrandsScheduler.config import LOCAL_SEARCH_NEIGHBORS
+from SyntheticErrandsScheduler.utils.spatial_index import SpatialIndex
+
+class CandidateLists:
+    """
+    The k geographically nearest errands and contractors of every errand.
+
+    Contractors are ranked by the distance from their start location. The lists
+    only depend on the problem, so they are built once and shared by every copy
+    of a schedule (see get_candidate_lists).
+    """
+
+    def __init__(self, errands, contractors, k):
+        """
+        Args:
+            errands (list): The errands of the problem.
+            contractors (list): The contractors of the problem.
+            k (int): The number of nearest errands and contractors to keep.
+        """
+        self.k = k
+        errand_index = SpatialIndex.from_items(errands, lambda errand: errand.location)
+        contractor_index = SpatialIndex.from_items(contractors, lambda contractor: contractor.start_location)
+        self.errands = {
+            errand: frozenset(errand_index.nearest(errand.location, k, lambda other, errand=errand: other != errand))
+            for errand in errands
+        }
+        self.contractors = {errand: contractor_index.nearest(errand.location, k) for errand in errands}
+
+    def are_neighbors(self, errand1, errand2):
+        """Check whether either errand is among the other's nearest errands."""
+        return errand2 in self.errands[errand1] or errand1 in self.errands[errand2]
+
+_candidate_lists = None
+
+def get_candidate_lists(schedule, k=LOCAL_SEARCH_NEIGHBORS):
+    """
+    Get the candidate lists for a schedule's problem, building them on first use.
+
+    The most recently built lists are kept and reused as long as the schedule has
+    the same errand and contractor lists, which every copy of a schedule shares.
+    """
+    global _candidate_lists
+    lists = _candidate_lists
+    if lists is None or lists[0] is not schedule.errands or lists[1] is not schedule.contractors or lists[2].k != k:
+        lists = (schedule.errands, schedule.contractors, CandidateLists(schedule.errands, schedule.contractors, k))
+        _candidate_lists = lists
+    return lists[2]
+
+class Neighborhood:
+    """
+    Which moves a local search pass looks at: granular candidate lists and don't-look bits.
+
+    With candidate lists, swaps are only tried between neighbouring errands and
+    relocations only to an errand's nearest contractors (and its own contractor).
+    With don't-look bits, the first pass looks at every errand, and each later pass
+    only at the errands that a move in the previous pass touched, together with their
+    neighbours and the errands sharing a contractor-day with them.
+    """
+
+    def __init__(self, schedule, neighbors=LOCAL_SEARCH_NEIGHBORS, dont_look_bits=True):
+        """
+        Args:
+            schedule (Schedule): The schedule being searched.
+            neighbors (int, optional): The number of nearest errands and contractors
+                each errand considers, or None to consider all of them.
+            dont_look_bits (bool): Whether to skip errands whose surroundings did not
+                change in the previous pass.
+        """
+        self.candidates = get_candidate_lists(schedule, neighbors) if neighbors else None
+        self.dont_look_bits = dont_look_bits
+        self.evaluations = 0
+        self._active = None  # None while every errand is looked at
+        self._touched = set()
+
+    def should_look(self, errand):
+        """Check whether moves of an errand are looked at in this pass."""
+        return self._active is None or errand in self._active
+
+    def are_neighbors(self, errand1, errand2):
+        """Check whether a move between two errands is in the neighbourhood."""
+        return self.candidates is None or self.candidates.are_neighbors(errand1, errand2)
+
+    def contractors_for(self, errand, contractor, all_contractors):
+        """The contractors an errand may be relocated to, given its current contractor."""
+        if self.candidates is None:
+            return all_contractors
+        nearest = self.candidates.contractors[errand]
+        return nearest if contractor in nearest else nearest + [contractor]
+
+    def touched(self, schedule, errand, contractor, day):
+        """Record that a move changed an errand's assignment on a contractor-day."""
+        self._touched.add(errand)
+        if self.candidates is not None:
+            self._touched.update(self.candidates.errands[errand])
+        self._touched.update(schedule.timelines.get(contractor, day).errands)
+
+    def next_pass(self):
+        """
+        Start a new pass.
+
+        Returns:
+            bool: False if don't-look bits leave no errand to look at.
+        """
+        if not self.dont_look_bits:
+            return True
+        self._active, self._touched = self._touched, set()
+        return bool(self._active)
@@ -1,7 +1,11 @@
 import random
-from SyntheticErrandsScheduler.config import MAX_DAYS, WORK_START, WORK_END, SLA_DAYS
+import logging
+from SyntheticErrandsScheduler.algorithms.insertion import regret_insertion
+from SyntheticErrandsScheduler.config import MAX_DAYS, WORK_START, WORK_END, SLA_DAYS, REINSERTION_REGRET_K
 from SyntheticErrandsScheduler.utils.travel_time import calculate_travel_time
 
+logger = logging.getLogger(__name__)
+
 def perturbation(schedule, perturbation_strength=0.2):
     """
     Perform perturbation on the current schedule to escape local optima.
@@ -27,7 +31,11 @@ def perturbation(schedule, perturbation_strength=0.2):
     ]
     
     strategy = random.choice(perturbation_strategies)
-    return strategy(schedule, perturbation_strength)
+    score_before = schedule.score()
+    schedule = strategy(schedule, perturbation_strength)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s changed the score by %.4f", strategy.__name__, schedule.score() - score_before)
+    return schedule
 
 def random_removal_reinsertion(schedule, perturbation_strength):
     """Randomly remove a subset of assignments and reinsert them."""
@@ -139,44 +147,26 @@ def priority_based_rescheduling(schedule, perturbation_strength):
     reinsert_unassigned_errands(schedule)
     return schedule
 
-def reinsert_unassigned_errands(schedule):
-    """Try to reinsert any unassigned errands back into the schedule."""
-    unassigned = list(schedule.unassigned_errands)
-    random.shuffle(unassigned)
-
-    for errand in unassigned:
-        best_score = float('-inf')
-        best_assignment = None
-
-        for day in range(MAX_DAYS):
-            for contractor in schedule.contractors:
-                current_time = get_resource_end_time(contractor, day)
-                travel_time = calculate_travel_time(contractor.current_location, errand.location)
-                start_time = current_time + travel_time
-
-                if start_time + travel_time + errand.service_time <= WORK_END:
-                    if errand.are_predecessors_completed(schedule.completed_errands):
-                        if contractor.can_perform_errand(errand, day, start_time, travel_time):
-                            score = calculate_assignment_score(schedule, day, errand, contractor, start_time)
-                            if score > best_score:
-                                best_score = score
-                                best_assignment = (contractor, day, start_time)
+def reinsert_unassigned_errands(schedule, k=REINSERTION_REGRET_K):
+    """
+    Try to reinsert any unassigned errands back into the schedule.
 
-        if best_assignment:
-            contractor, day, start_time = best_assignment
-            if schedule.assign_errand(contractor, errand, day, start_time):
-                schedule.unassigned_errands.remove(errand)
+    Errands are inserted by regret-k (see regret_insertion): the errand that would
+    lose most by not getting its best contractor-day goes first, and after each
+    insertion only the candidates on the contractor-day that changed are evaluated
+    again.
 
-def get_resource_end_time(contractor, day):
-    if day not in contractor.schedule or not contractor.schedule[day]:
-        return WORK_START
-    last_errand, last_start_time = contractor.schedule[day][-1]
-    return last_start_time + last_errand.service_time
+    Returns:
+        list: The reinserted errands.
+    """
+    return regret_insertion(schedule, k)
 
-def calculate_assignment_score(schedule, day, errand, contractor, start_time):
-    profit = errand.calculate_profit(day, SLA_DAYS)
+def calculate_assignment_score(schedule, day, errand, contractor, start_time, travel_time=None):
+    profit = schedule.profit_table.profit_of(errand, day)
     early_completion_bonus = max(0, (SLA_DAYS - day) * 0.05 * profit)
-    travel_time = calculate_travel_time(contractor.current_location, errand.location)
+    if travel_time is None:
+        schedule.sync_contractors()
+        travel_time = calculate_travel_time(contractor.current_location, errand.location, departure_time=start_time)
     
     return profit + early_completion_bonus - travel_time * 0.1
 
@@ -1,3 +1,4 @@
+import os
 import numpy as np
 
 # City and Grid Configuration
@@ -108,27 +109,76 @@ def create_busyville_map(size=GRID_SIZE):
     
     return map
 
-BUSYVILLE_MAP = create_busyville_map()
-
 # Road Network Configuration
+MAIN_ROAD_SPACING = 10  # Main roads run along every 10th row and column
+SECONDARY_ROAD_SPACING = 5  # Secondary roads run along every 5th row and column of built-up areas
+
 def create_road_network(city_map):
     size = city_map.shape[0]
     roads = np.zeros((size, size), dtype=bool)
     
     # Main roads
-    roads[::10, :] = True
-    roads[:, ::10] = True
+    roads[::MAIN_ROAD_SPACING, :] = True
+    roads[:, ::MAIN_ROAD_SPACING] = True
     
     # Secondary roads in residential and commercial areas
-    for i in range(size):
-        for j in range(size):
-            if city_map[i, j] in [RESIDENTIAL, COMMERCIAL]:
-                if i % 5 == 0 or j % 5 == 0:
-                    roads[i, j] = True
+    on_secondary_line = np.zeros((size, size), dtype=bool)
+    on_secondary_line[::SECONDARY_ROAD_SPACING, :] = True
+    on_secondary_line[:, ::SECONDARY_ROAD_SPACING] = True
+    roads |= on_secondary_line & np.isin(city_map, [RESIDENTIAL, COMMERCIAL])
     
     return roads
 
-ROAD_NETWORK = create_road_network(BUSYVILLE_MAP)
+_city_maps = {}
+
+def get_busyville_map():
+    """
+    Get the Busyville area map, building it on first use.
+
+    Returns:
+        numpy.ndarray: The area type of every grid cell, indexed as map[y, x].
+    """
+    if 'busyville' not in _city_maps:
+        _city_maps['busyville'] = create_busyville_map()
+    return _city_maps['busyville']
+
+def get_road_network():
+    """
+    Get the Busyville road network, building it on first use.
+
+    Returns:
+        numpy.ndarray: Boolean road grid indexed as roads[y, x].
+    """
+    if 'roads' not in _city_maps:
+        _city_maps['roads'] = create_road_network(get_busyville_map())
+    return _city_maps['roads']
+
+def __getattr__(name):
+    # BUSYVILLE_MAP and ROAD_NETWORK are built on first access rather than at import time
+    if name == 'BUSYVILLE_MAP':
+        return get_busyville_map()
+    if name == 'ROAD_NETWORK':
+        return get_road_network()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Routing Configuration
+# 'matrix' precomputes all-pairs road distances; 'astar' searches on demand, and
+# 'landmarks' searches on demand with landmark (ALT) bounds for large grids
+ROUTING_MODE = 'matrix'
+NUM_LANDMARKS = 16  # Landmarks placed on main road intersections
+ACTIVE_LANDMARKS = 4  # Landmarks consulted by each landmark query
+TRAVEL_TIME_CACHE_SIZE = 200000  # Maximum number of memoized searched travel times
+# Directory for the persisted road distance matrix: $ERRANDS_CACHE_DIR if set, otherwise
+# ~/.cache/SyntheticErrandsScheduler. load_distance_matrix falls back to an in-memory
+# matrix if it cannot write there; pass cache_dir=None to it to skip the cache entirely
+DISTANCE_MATRIX_CACHE_DIR = os.environ.get(
+    'ERRANDS_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'SyntheticErrandsScheduler')
+)
+
+# Spatial Index Configuration
+SPATIAL_BUCKET_SIZE = 10  # Width of the grid buckets used for nearest-neighbour queries
+NEAREST_ERRAND_CANDIDATES = 16  # Errands considered per step of the initial solution before widening
 
 # Traffic Factors (1.0 means normal speed, higher values mean slower traffic)
 TRAFFIC_FACTORS = {
@@ -138,10 +188,42 @@ TRAFFIC_FACTORS = {
     'night': 0.8
 }
 
+# Traffic periods as (start minute, end minute, period) within a day; other times are 'normal'
+TRAFFIC_PERIODS = [
+    (0, 6 * 60, 'night'),
+    (7 * 60, 9 * 60 + 30, 'morning_rush'),
+    (16 * 60, 18 * 60 + 30, 'evening_rush'),
+    (21 * 60, 24 * 60, 'night'),
+]
+
+# Schedule Configuration
+# 'dict' keeps per-day lists of assignment tuples; 'array' stores assignments in
+# parallel NumPy arrays instead
+SCHEDULE_BACKEND = 'dict'
+
 # Algorithm Configuration
 MILS_ITERATIONS = 1000  # Number of iterations for Modified Iterated Local Search
 PERTURBATION_STRENGTH = 0.2  # Initial perturbation strength
 COOLING_RATE = 0.995  # Cooling rate for simulated annealing-like acceptance
+MILS_WORKERS = 1  # Processes run_mils spreads its runs over; 1 runs them one after another
+LOCAL_SEARCH_NEIGHBORS = 8  # Nearest errands and contractors each errand's local search moves consider
+LOCAL_SEARCH_DONT_LOOK_BITS = True  # Skip errands whose surroundings did not change in the last pass
+OR_OPT_MAX_CHAIN = 3  # Longest chain of consecutive errands an Or-opt move takes elsewhere in its route
+MILS_PERTURBATION = 'adaptive'  # 'adaptive' for adaptive_perturbation, 'alns' for the ALNS engine
+
+# Adaptive Large Neighborhood Search Configuration
+ALNS_DESTROY_FRACTION = (0.1, 0.3)  # Smallest and largest fraction of assignments a destroy operator removes
+ALNS_SEGMENT_LENGTH = 20  # Perturbations between operator weight updates
+ALNS_REACTION = 0.2  # How far each update moves a weight towards the operator's gain per CPU-second
+ALNS_MIN_WEIGHT = 0.05  # Smallest roulette weight an operator can have
+REINSERTION_REGRET_K = 2  # Contractor-days the regret of reinserting an errand looks at
+# Weights of the terms of the solution score
+SCORE_WEIGHTS = {
+    'profit': 0.5,
+    'sla_compliance': 0.3,
+    'early_completion_bonus': 0.1,
+    'resource_utilization': 0.1
+}
 
 # SLA Configuration
 SLA_DAYS = 14  # Number of days within which all errands must be completed
@@ -7,7 +7,7 @@ import threading
 import io
 import sys
 
-from SyntheticErrandsScheduler.models import Location, Errand, Contractor, Schedule
+from SyntheticErrandsScheduler.models import Location, Errand, Contractor, create_schedule
 from SyntheticErrandsScheduler.algorithms import modified_iterated_local_search, run_mils, generate_initial_solution
 from SyntheticErrandsScheduler.utils import visualize_city_map, plot_route
 from SyntheticErrandsScheduler.config import GRID_SIZE, ERRANDS, MAX_DAYS
@@ -177,7 +177,7 @@ class SchedulerGUI:
                 for i in range(num_contractors)
             ]
 
-            self.schedule = Schedule(self.contractors, self.errands)
+            self.schedule = create_schedule(self.contractors, self.errands)
 
             # Capture print output
             old_stdout = sys.stdout
@@ -385,7 +385,7 @@ class SchedulerGUI:
                     x, y = map(int, parts[-1][1:-1].split(','))
                     self.contractors.append(Contractor(len(self.contractors), Location(x, y)))
             
-            self.schedule = Schedule(self.contractors, self.errands)
+            self.schedule = create_schedule(self.contractors, self.errands)
             self.display_initial_conditions()
             self.visualize_problem()
             self.update_parameters_tab()
@@ -1,15 +1,11 @@
 import argparse
 import logging
 import random
-import matplotlib.pyplot as plt
-import tkinter as tk
-from SyntheticErrandsScheduler.models import Location, Errand, Contractor, Schedule
+from SyntheticErrandsScheduler.models import Location, Errand, Contractor, create_schedule
 from SyntheticErrandsScheduler.algorithms import run_mils, generate_initial_solution
 from SyntheticErrandsScheduler.utils import visualize_city_map, plot_schedule
-from SyntheticErrandsScheduler.config import GRID_SIZE, ERRANDS, MAX_DAYS, WORK_START, WORK_END
-from SyntheticErrandsScheduler.gui.scheduler_gui import SchedulerGUI
-
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+from SyntheticErrandsScheduler.config import GRID_SIZE, ERRANDS, MAX_DAYS, WORK_START, WORK_END, MILS_PERTURBATION
+from SyntheticErrandsScheduler.utils.log_sink import configure_logging
 
 def generate_problem(num_errands, num_contractors, num_days):
     errands = [
@@ -23,7 +19,8 @@ def generate_problem(num_errands, num_contractors, num_days):
 
     # Log and verify time windows for each errand
     for errand in errands:
-        logging.debug(f"Errand {errand.id} time window: {errand.start_time} - {errand.end_time}")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Errand %s time window: %s - %s", errand.id, errand.start_time, errand.end_time)
         if errand.start_time != WORK_START or errand.end_time != WORK_END:
             logging.warning(f"Errand {errand.id} does not have the expected wide-open time window!")
 
@@ -32,10 +29,11 @@ def generate_problem(num_errands, num_contractors, num_days):
         for i in range(num_contractors)
     ]
 
-    schedule = Schedule(contractors, errands)
+    schedule = create_schedule(contractors, errands)
     return schedule
 
-def solve_and_display(schedule, max_iterations, max_time, temperature, cooling_rate, num_runs):
+def solve_and_display(schedule, max_iterations, max_time, temperature, cooling_rate, num_runs, workers=None, seed=None,
+                      perturbation=MILS_PERTURBATION):
     logging.info("Generating initial solution...")
     schedule, initial_stats = generate_initial_solution(schedule)
     logging.info(f"Initial solution generated. Assigned errands: {initial_stats['assigned_errands']} / {initial_stats['total_errands']}")
@@ -46,7 +44,8 @@ def solve_and_display(schedule, max_iterations, max_time, temperature, cooling_r
     logging.info("Starting optimization process...")
     
     solution = run_mils(schedule, num_runs=num_runs, max_iterations=max_iterations, 
-                        max_time=max_time, temperature=temperature, cooling_rate=cooling_rate)
+                        max_time=max_time, temperature=temperature, cooling_rate=cooling_rate,
+                        workers=workers, seed=seed, perturbation=perturbation)
     
     logging.info(f"Optimization completed. Total profit: ${solution.calculate_total_profit():.2f}")
     logging.info(f"SLA Compliance: {solution.calculate_sla_compliance():.2%}")
@@ -61,6 +60,7 @@ def solve_and_display(schedule, max_iterations, max_time, temperature, cooling_r
         logging.info(f"{errand_type}: {count}")
 
     # Plot the schedule for each day
+    import matplotlib.pyplot as plt
     for day in range(solution.num_days):
         fig = plot_schedule(solution, day)
         plt.savefig(f"schedule_day_{day+1}.png", dpi=300, bbox_inches='tight')
@@ -70,6 +70,10 @@ def solve_and_display(schedule, max_iterations, max_time, temperature, cooling_r
     return solution
 
 def run_gui():
+    # tkinter and the GUI (with its matplotlib canvas) are only loaded when the GUI is requested
+    import tkinter as tk
+    from SyntheticErrandsScheduler.gui.scheduler_gui import SchedulerGUI
+
     root = tk.Tk()
     gui = SchedulerGUI(root)
     root.mainloop()
@@ -85,9 +89,17 @@ def main():
     parser.add_argument("--temperature", type=float, default=100.0, help="Initial temperature")
     parser.add_argument("--cooling-rate", type=float, default=0.995, help="Cooling rate")
     parser.add_argument("--runs", type=int, default=2, help="Number of runs")
+    parser.add_argument("--workers", type=int, default=None, help="Number of processes to spread the runs over")
+    parser.add_argument("--seed", type=int, default=None, help="Root seed for reproducible runs")
+    parser.add_argument("--perturbation", default=MILS_PERTURBATION, choices=["adaptive", "alns"],
+                        help="How MILS perturbs the current solution")
     parser.add_argument("--generate-only", action="store_true", help="Only generate the problem without solving")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="Logging level")
+    parser.add_argument("--log-file", default=None, help="Write logs to this (rotated) file instead of stderr")
+    parser.add_argument("--log-sample", type=int, default=1, help="Keep one in N INFO/DEBUG messages from each call site")
 
     args = parser.parse_args()
+    configure_logging(level=getattr(logging, args.log_level), filename=args.log_file, sample_rate=args.log_sample)
 
     if args.gui:
         run_gui()
@@ -97,7 +109,8 @@ def main():
         
         if not args.generate_only:
             logging.info("Generating initial solution and optimizing...")
-            solve_and_display(schedule, args.iterations, args.time, args.temperature, args.cooling_rate, args.runs)
+            solve_and_display(schedule, args.iterations, args.time, args.temperature, args.cooling_rate, args.runs,
+                              workers=args.workers, seed=args.seed, perturbation=args.perturbation)
         else:
             logging.info("Problem generation complete. Use --generate-only flag to solve the problem.")
 
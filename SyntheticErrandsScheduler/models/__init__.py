@@ -3,6 +3,9 @@
 from .location import Location
 from .errand import Errand
 from .contractor import Contractor
-from .schedule import Schedule
+from .schedule import Schedule, create_schedule
+from .array_schedule import ArraySchedule
+from .problem import describe_problem, build_schedule
 
-__all__ = ['Location', 'Errand', 'Contractor', 'Schedule']
\ No newline at end of file
+__all__ = ['Location', 'Errand', 'Contractor', 'Schedule', 'ArraySchedule', 'create_schedule',
+           'describe_problem', 'build_schedule']
\ No newline at end of file
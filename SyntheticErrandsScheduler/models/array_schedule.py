@@ -0,0 +1,423 @@
+import logging
+from collections.abc import Mapping, Set
+import numpy as np
+from SyntheticErrandsScheduler.config import WORK_START, WORK_END, MAX_DAYS
+from SyntheticErrandsScheduler.models.objective import ObjectiveTotals
+from SyntheticErrandsScheduler.models.journal import MoveJournal, ASSIGN, REMOVE
+from SyntheticErrandsScheduler.models.timeline import TimelineIndex, plan_arrival
+from SyntheticErrandsScheduler.models.precedence import PrecedenceGraph, PrecedenceTracker
+from SyntheticErrandsScheduler.models.profit_table import ProfitTable
+
+logger = logging.getLogger(__name__)
+
+class ArraySchedule:
+    """
+    Schedule backend that stores assignments in parallel NumPy arrays.
+
+    Each assignment is one row of four arrays: errand index, contractor index, day and
+    start minute, kept in the order the assignments were made. Which errands are
+    assigned is derived from the same arrays, so copying a schedule is a handful of
+    array copies instead of copying lists of tuples and sets of errands.
+
+    The public interface matches Schedule. ``assignments``, ``unassigned_errands`` and
+    ``completed_errands`` are views over the arrays, and the contractors' own schedules
+    and locations are kept in step with whichever copy last changed them or asked for
+    them with sync_contractors.
+    """
+
+    def __init__(self, contractors, errands):
+        self.contractors = contractors
+        self.errands = errands
+        self._errand_ids = {errand: i for i, errand in enumerate(errands)}
+        self._contractor_ids = {contractor: i for i, contractor in enumerate(contractors)}
+
+        capacity = len(errands)
+        self.errand_index = np.empty(capacity, dtype=np.int32)
+        self.contractor_index = np.empty(capacity, dtype=np.int32)
+        self.day = np.empty(capacity, dtype=np.int16)
+        self.start_time = np.empty(capacity, dtype=np.float64)
+        self.num_assignments = 0
+        # Row of each errand's assignment, or -1 while it is unassigned
+        self._row_of = np.full(capacity, -1, dtype=np.int32)
+
+        self.totals = ObjectiveTotals()
+        self.journal = MoveJournal(self)
+        self.timelines = TimelineIndex()
+        self.precedence = PrecedenceTracker(PrecedenceGraph(errands))
+        self.profit_table = ProfitTable(errands)
+        self._day_cache = {}
+        self._mirror = _ContractorMirror(self)
+        # The contractors' locations as this copy left them, while another copy owns the contractors
+        self._locations = None
+
+    @property
+    def num_days(self):
+        return MAX_DAYS
+
+    @property
+    def total_profit(self):
+        return self.totals.profit
+
+    def score(self):
+        """The weighted solution score, from running totals in O(1)."""
+        return self.totals.score(len(self.errands), len(self.contractors), MAX_DAYS)
+
+    @property
+    def assignments(self):
+        """Mapping of day to the list of (errand, contractor, start_time) assignments."""
+        return _AssignmentsView(self)
+
+    @property
+    def unassigned_errands(self):
+        return _UnassignedErrands(self)
+
+    @property
+    def completed_errands(self):
+        return _CompletedErrands(self)
+
+    def copy(self):
+        """
+        Copy the schedule's assignments.
+
+        Only the assignment arrays are copied; errands, contractors and the lookup
+        tables built from them are shared with the copy.
+        """
+        clone = ArraySchedule.__new__(ArraySchedule)
+        clone.__dict__.update(self.__dict__)
+        clone.errand_index = self.errand_index.copy()
+        clone.contractor_index = self.contractor_index.copy()
+        clone.day = self.day.copy()
+        clone.start_time = self.start_time.copy()
+        clone._row_of = self._row_of.copy()
+        clone.totals = self.totals.copy()
+        clone.journal = MoveJournal(clone)
+        clone.timelines = self.timelines.copy()
+        clone.precedence = self.precedence.copy()
+        clone._day_cache = dict(self._day_cache)
+        clone._locations = self._contractor_locations()
+        return clone
+
+    def _contractor_locations(self):
+        """The contractors' current locations as this schedule sees them."""
+        if self._mirror.owner is self:
+            return [contractor.current_location for contractor in self.contractors]
+        return list(self._locations)
+
+    def sync_contractors(self):
+        """
+        Make the contractors' schedules and locations reflect this schedule.
+
+        Copies share Contractor objects, so whenever a different copy is worked on,
+        the contractors' schedules are rebuilt from this copy's arrays, in
+        O(assignments), and their locations restored to where this copy left them.
+        Assigning and removing errands do this automatically; code that reads the
+        contractors' locations or schedules calls it first. Reading the schedule's own
+        views (assignments, completed and unassigned errands) does not.
+        """
+        if self._mirror.owner is self:
+            return
+        self._mirror.owner._locations = [contractor.current_location for contractor in self.contractors]
+        for contractor in self.contractors:
+            contractor.schedule = {}
+        rows = slice(0, self.num_assignments)
+        for errand_id, contractor_id, day, start_time in zip(self.errand_index[rows].tolist(),
+                                                             self.contractor_index[rows].tolist(),
+                                                             self.day[rows].tolist(),
+                                                             self.start_time[rows].tolist()):
+            contractor = self.contractors[contractor_id]
+            errand = self.errands[errand_id]
+            contractor.schedule.setdefault(day, []).append((errand, start_time))
+        for contractor, location in zip(self.contractors, self._locations):
+            contractor.current_location = location
+        self._locations = None
+        self._mirror.owner = self
+
+    def can_assign_errand(self, contractor, errand, day, start_time):
+        return self._plan_assignment(contractor, errand, day, start_time) is not None
+
+    def _plan_assignment(self, contractor, errand, day, start_time):
+        """The arrival time if the errand can be assigned, otherwise None."""
+        if self.is_errand_assigned(errand):
+            return None
+
+        if not self.precedence.ready(errand):
+            return None
+
+        arrival_time = plan_arrival(self.timelines.get(contractor, day), contractor, errand, start_time)
+        if arrival_time is None:
+            return None
+        end_time = arrival_time + errand.service_time
+
+        if end_time <= WORK_END or day == MAX_DAYS - 1:  # Allow overflow on the last day
+            return arrival_time
+        return None
+
+    def assign_errand(self, contractor, errand, day, start_time):
+        try:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Trying to assign errand %s to contractor %s on day %s at %s",
+                             errand.id, contractor.id, day, start_time)
+
+            arrival_time = self._plan_assignment(contractor, errand, day, start_time)
+            if arrival_time is not None:
+                self._add_assignment(contractor, errand, day, arrival_time)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Successfully assigned errand %s to contractor %s", errand.id, contractor.id)
+                return True
+            else:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Cannot perform errand %s: Time conflict or predecessors not completed", errand.id)
+        except Exception as e:
+            logger.error(f"Error assigning errand {errand.id}: {str(e)}")
+        return False
+
+    def restore_assignment(self, contractor, errand, day, start_time):
+        """
+        Add an assignment at a known start (arrival) time, without planning travel.
+
+        Used to rebuild a schedule from a saved solution, whose start times were
+        already planned when it was made.
+
+        Raises:
+            ValueError: If the errand is already assigned or the assignment overlaps
+                another of the contractor's errands that day.
+        """
+        if self.is_errand_assigned(errand):
+            raise ValueError(f"Errand {errand.id} is already assigned")
+        if self.timelines.get(contractor, day).overlaps(start_time, start_time + errand.service_time):
+            raise ValueError(f"Errand {errand.id} at {start_time} overlaps another errand of "
+                             f"contractor {contractor.id} on day {day}")
+        self._add_assignment(contractor, errand, day, start_time)
+
+    def _add_assignment(self, contractor, errand, day, start_time):
+        self.sync_contractors()
+        previous_location = contractor.current_location
+        contractor.assign_errand(day, errand, start_time)
+        self._insert_row(self.num_assignments, errand, contractor, day, start_time)
+        self.journal.record((ASSIGN, day, errand, contractor, start_time, None, None, previous_location))
+
+    def remove_assignment(self, day, assignment):
+        """
+        Remove an assignment and return its errand to the unassigned errands.
+
+        Args:
+            day (int): The day of the assignment.
+            assignment (tuple): The (errand, contractor, start_time) assignment.
+
+        Raises:
+            ValueError: If the assignment is not in the schedule on that day.
+        """
+        errand, contractor, start_time = assignment
+        errand_id = self._errand_ids.get(errand)
+        row = -1 if errand_id is None else self._row_of[errand_id]
+        if (row < 0 or self.day[row] != day or self.start_time[row] != start_time
+                or self.contractors[self.contractor_index[row]] != contractor):
+            raise ValueError(f"Assignment of errand {errand.id} on day {day} is not in the schedule")
+
+        self.sync_contractors()
+        previous_location = contractor.current_location
+        contractor_position = contractor.remove_errand(day, errand, start_time)
+        self._delete_row(row)
+        self.journal.record((REMOVE, day, errand, contractor, start_time, row, contractor_position,
+                             previous_location))
+
+    def _insert_row(self, row, errand, contractor, day, start_time):
+        """Insert an assignment at a row, shifting later rows down."""
+        last = self.num_assignments
+        errand_id = self._errand_ids[errand]
+        if row < last:
+            self._row_of[self.errand_index[row:last]] += 1
+            for array in (self.errand_index, self.contractor_index, self.day, self.start_time):
+                array[row + 1:last + 1] = array[row:last]
+        self.errand_index[row] = errand_id
+        self.contractor_index[row] = self._contractor_ids[contractor]
+        self.day[row] = day
+        self.start_time[row] = start_time
+        self._row_of[errand_id] = row
+        self.num_assignments = last + 1
+        self.precedence.complete(errand)
+        self.totals.add(errand, day, start_time)
+        self.timelines.for_update(contractor, day).add(start_time, start_time + errand.service_time,
+                                                       errand, errand.location)
+        self._day_cache.pop(day, None)
+
+    def _delete_row(self, row):
+        """Delete the assignment at a row, closing the gap so rows stay in assignment order."""
+        last = self.num_assignments
+        errand_id = self.errand_index[row]
+        errand = self.errands[errand_id]
+        contractor = self.contractors[self.contractor_index[row]]
+        day = int(self.day[row])
+        start_time = float(self.start_time[row])
+        for array in (self.errand_index, self.contractor_index, self.day, self.start_time):
+            array[row:last - 1] = array[row + 1:last]
+        self.num_assignments = last - 1
+        self._row_of[errand_id] = -1
+        self._row_of[self.errand_index[row:last - 1]] -= 1
+        self.precedence.reopen(errand)
+        self.totals.remove(errand, day, start_time)
+        self.timelines.for_update(contractor, day).remove(start_time, errand)
+        self._day_cache.pop(day, None)
+
+    def _undo(self, entry):
+        """Invert an operation recorded in the journal."""
+        kind, day, errand, contractor, start_time, row, contractor_position, previous_location = entry
+        # Contractor schedules are only touched if they currently reflect this copy;
+        # otherwise they are rebuilt from the arrays, and only the location is kept
+        owns_contractors = self._mirror.owner is self
+        if kind == ASSIGN:
+            # Later operations have already been undone, so the assignment is the last row
+            self._delete_row(self.num_assignments - 1)
+            if owns_contractors:
+                contractor.remove_errand(day, errand, start_time)
+                contractor.current_location = previous_location
+            else:
+                self._locations[self._contractor_ids[contractor]] = previous_location
+        else:
+            self._insert_row(row, errand, contractor, day, start_time)
+            if contractor_position is None:
+                return
+            if owns_contractors:
+                contractor.restore_errand(day, errand, start_time, contractor_position, previous_location)
+            else:
+                self._locations[self._contractor_ids[contractor]] = previous_location
+
+    def predecessors_completed(self, errand, excluding=None):
+        """
+        Check whether every predecessor of an errand is assigned, in O(predecessors).
+
+        Args:
+            errand (Errand): The errand to check.
+            excluding (Errand, optional): An errand to treat as unassigned, such as the
+                other errand of a swap.
+        """
+        return self.precedence.ready(errand, excluding)
+
+    def is_errand_assigned(self, errand):
+        errand_id = self._errand_ids.get(errand)
+        return errand_id is not None and self._row_of[errand_id] >= 0
+
+    def _day_assignments(self, day):
+        """The (errand, contractor, start_time) assignments on a day, in assignment order."""
+        cached = self._day_cache.get(day)
+        if cached is None:
+            rows = np.flatnonzero(self.day[:self.num_assignments] == day)
+            cached = tuple(
+                (self.errands[errand_id], self.contractors[contractor_id], start_time)
+                for errand_id, contractor_id, start_time in zip(self.errand_index[rows].tolist(),
+                                                                self.contractor_index[rows].tolist(),
+                                                                self.start_time[rows].tolist())
+            )
+            self._day_cache[day] = cached
+        return list(cached)
+
+    def calculate_total_profit(self):
+        return self.totals.profit
+
+    def calculate_sla_compliance(self):
+        total_errands = len(self.errands)
+        return self.num_assignments / total_errands if total_errands > 0 else 1.0
+
+    def calculate_resource_utilization(self):
+        total_work_time = (WORK_END - WORK_START) * MAX_DAYS * len(self.contractors)
+        return self.totals.used_time / total_work_time if total_work_time > 0 else 0.0
+
+    def get_unassigned_errands(self):
+        return list(self.unassigned_errands)
+
+    def __str__(self):
+        return f"Schedule with {len(self.contractors)} contractors and {len(self.errands)} errands"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def print_schedule(self):
+        for day in range(MAX_DAYS):
+            print(f"Day {day + 1}:")
+            for errand, contractor, start_time in self._day_assignments(day):
+                end_time = start_time + errand.service_time
+                print(f"  Contractor {contractor.id}: Errand {errand.id} ({start_time} - {end_time})")
+            print()
+
+    def get_contractor_schedule(self, contractor_id):
+        contractor_ids = [i for i, contractor in enumerate(self.contractors) if contractor.id == contractor_id]
+        rows = np.flatnonzero(np.isin(self.contractor_index[:self.num_assignments], contractor_ids))
+        schedule = [[] for _ in range(MAX_DAYS)]
+        for errand_id, day, start_time in zip(self.errand_index[rows].tolist(), self.day[rows].tolist(),
+                                              self.start_time[rows].tolist()):
+            schedule[day].append((self.errands[errand_id], start_time))
+        return schedule
+
+class _ContractorMirror:
+    """Records which copy of a schedule the shared Contractor objects currently reflect."""
+
+    def __init__(self, owner):
+        self.owner = owner
+
+class _AssignmentsView(Mapping):
+    """Read-only day -> assignment list mapping over an ArraySchedule."""
+
+    def __init__(self, schedule):
+        self._schedule = schedule
+
+    def __getitem__(self, day):
+        if not 0 <= day < MAX_DAYS:
+            raise KeyError(day)
+        return self._schedule._day_assignments(day)
+
+    def __iter__(self):
+        return iter(range(MAX_DAYS))
+
+    def __len__(self):
+        return MAX_DAYS
+
+class _CompletedErrands(Set):
+    """Set-like view of the assigned errands of an ArraySchedule."""
+
+    def __init__(self, schedule):
+        self._schedule = schedule
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)
+
+    def _ids(self):
+        schedule = self._schedule
+        return np.sort(schedule.errand_index[:schedule.num_assignments])
+
+    def __contains__(self, errand):
+        return self._schedule.is_errand_assigned(errand)
+
+    def __iter__(self):
+        errands = self._schedule.errands
+        return (errands[errand_id] for errand_id in self._ids().tolist())
+
+    def __len__(self):
+        return self._schedule.num_assignments
+
+class _UnassignedErrands(_CompletedErrands):
+    """
+    Set-like view of the unassigned errands of an ArraySchedule.
+
+    Errands return to this set when their assignment is removed, so ``add`` only
+    accepts errands that are already unassigned, and errands leave it only by being
+    assigned.
+    """
+
+    def _ids(self):
+        return np.flatnonzero(self._schedule._row_of < 0)
+
+    def __contains__(self, errand):
+        return errand in self._schedule._errand_ids and not self._schedule.is_errand_assigned(errand)
+
+    def __len__(self):
+        return len(self._schedule.errands) - self._schedule.num_assignments
+
+    def add(self, errand):
+        if errand not in self:
+            raise ValueError(f"Errand {errand.id} is assigned; remove its assignment instead")
+
+    def remove(self, errand):
+        if errand not in self:
+            raise KeyError(errand)
+        raise ValueError(f"Errand {errand.id} can only leave the unassigned errands by being assigned")
@@ -2,6 +2,8 @@ import logging
 from SyntheticErrandsScheduler.models.location import Location
 from SyntheticErrandsScheduler.config import WORK_START, WORK_END
 
+logger = logging.getLogger(__name__)
+
 class Contractor:
     def __init__(self, contractor_id, start_location):
         self.id = contractor_id
@@ -33,11 +35,50 @@ class Contractor:
         
         end_time = start_time + errand.service_time
         if end_time > WORK_END:
-            logging.warning(f"Errand {errand.id} extends beyond work hours for contractor {self.id} on day {day}")
+            logger.warning("Errand %s extends beyond work hours for contractor %s on day %s", errand.id, self.id, day)
         
         self.schedule[day].append((errand, start_time))
         self.current_location = errand.location
-        logging.debug(f"Assigned errand {errand.id} to contractor {self.id} on day {day} at {start_time}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Assigned errand %s to contractor %s on day %s at %s", errand.id, self.id, day, start_time)
+
+    def remove_errand(self, day, errand, start_time):
+        """
+        Remove an errand from the contractor's schedule.
+
+        The contractor is moved back to the location of its last remaining errand on
+        that day, or to its start location if none remain.
+
+        Args:
+            day (int): The day of the assignment.
+            errand (Errand): The errand to be removed.
+            start_time (int): The start time the errand was assigned at.
+
+        Returns:
+            int: The errand's former position in the day's schedule, or None if it was
+            not scheduled.
+        """
+        day_schedule = self.schedule.get(day)
+        if not day_schedule or (errand, start_time) not in day_schedule:
+            return None
+        position = day_schedule.index((errand, start_time))
+        del day_schedule[position]
+        self.current_location = day_schedule[-1][0].location if day_schedule else self.start_location
+        return position
+
+    def restore_errand(self, day, errand, start_time, position, location):
+        """
+        Put back an errand removed with remove_errand.
+
+        Args:
+            day (int): The day of the assignment.
+            errand (Errand): The errand to be restored.
+            start_time (int): The start time the errand was assigned at.
+            position (int): The position remove_errand returned.
+            location (Location): The contractor's location before the removal.
+        """
+        self.schedule.setdefault(day, []).insert(position, (errand, start_time))
+        self.current_location = location
 
     def __str__(self):
         return f"Contractor {self.id} at {self.current_location}"
@@ -1,7 +1,6 @@
 import logging
 from SyntheticErrandsScheduler.config import ERRANDS, PRIORITY_LEVELS, SLA_DAYS
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 class Errand:
@@ -18,7 +17,6 @@ class Errand:
             days_since_request (int, optional): Number of days since the errand was requested.
             predecessors (set, optional): Set of Errand objects that must be completed before this one.
         """
-        logger.debug(f"Initializing Errand with ID: {errand_id}, Type: {errand_type}")
         self.id = errand_id
         self.type = errand_type
         self.location = location
@@ -31,7 +29,8 @@ class Errand:
             raise ValueError(f"Invalid errand type: {errand_type}")
         
         self.details = ERRANDS[errand_type]
-        logger.debug(f"Errand {self.id} initialized successfully")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Errand %s initialized successfully (type: %s)", self.id, errand_type)
 
     @property
     def charge(self):
@@ -60,7 +59,6 @@ class Errand:
         Returns:
             float: The calculated profit.
         """
-        logger.debug(f"Calculating profit for Errand {self.id} on day {day}")
         base_profit = self.charge
         days_until_due = sla_days - self.days_since_request
 
@@ -75,7 +73,8 @@ class Errand:
             late_penalty = self.details['late_penalty'] * late_days * base_profit
             profit = max(0, base_profit - late_penalty)  # Ensure profit doesn't go negative
 
-        logger.debug(f"Calculated profit for Errand {self.id}: {profit}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Calculated profit for Errand %s on day %s: %s", self.id, day, profit)
         return profit
 
     def are_predecessors_completed(self, completed_errands):
@@ -103,5 +102,3 @@ class Errand:
 
     def __hash__(self):
         return hash(self.id)
-
-logger.debug("Errand class defined successfully")
\ No newline at end of file
@@ -0,0 +1,50 @@
+ASSIGN = 'assign'
+REMOVE = 'remove'
+
+class MoveJournal:
+    """
+    Transactional log of the assignments and removals made on a schedule.
+
+    Between ``checkpoint()`` and ``commit()`` or ``rollback()`` every assignment and
+    removal is recorded together with what is needed to invert it exactly, including
+    list positions and the contractor's previous location. Rolling back replays the
+    inverse operations newest first, so a rejected move or perturbation is undone
+    without copying the schedule or re-running feasibility checks.
+
+    Checkpoints nest: committing an inner checkpoint keeps its moves in the journal,
+    so an enclosing checkpoint can still roll them back.
+    """
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self._entries = []
+        self._checkpoints = []
+
+    @property
+    def recording(self):
+        return bool(self._checkpoints)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def record(self, entry):
+        """Record an operation if a checkpoint is open."""
+        if self._checkpoints:
+            self._entries.append(entry)
+
+    def checkpoint(self):
+        """Open a checkpoint that the next commit or rollback closes."""
+        self._checkpoints.append(len(self._entries))
+
+    def commit(self):
+        """Keep every move made since the latest checkpoint."""
+        self._checkpoints.pop()
+        if not self._checkpoints:
+            self._entries.clear()
+
+    def rollback(self):
+        """Undo every move made since the latest checkpoint, newest first."""
+        mark = self._checkpoints.pop()
+        entries = self._entries
+        while len(entries) > mark:
+            self.schedule._undo(entries.pop())
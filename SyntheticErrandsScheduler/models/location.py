@@ -1,30 +1,47 @@
 import math
-from SyntheticErrandsScheduler.config import GRID_SIZE, ROAD_NETWORK
+from SyntheticErrandsScheduler.utils.nearest_road import get_nearest_road_index
 
 class Location:
-    def __init__(self, x, y):
-        self.x, self.y = self.snap_to_road(x, y)
-    
+    """
+    A point on the road network.
+
+    Locations are snapped to the nearest road and interned: constructing a Location
+    for coordinates that snap to an existing one returns that same object. Each
+    carries the road cell id of its position, which the routing engine uses as an
+    array index. Because instances are shared, they are immutable.
+    """
+
+    __slots__ = ('x', 'y', 'road_id')
+
+    # Interned instances for the current map, keyed by the flat grid index of the snapped cell
+    _interned = {}
+
+    def __new__(cls, x, y):
+        index = get_nearest_road_index()
+        x, y, road_id = index.snap(x, y)
+        key = y * index.size + x
+        location = cls._interned.get(key)
+        if location is None:
+            location = object.__new__(cls)
+            object.__setattr__(location, 'x', x)
+            object.__setattr__(location, 'y', y)
+            object.__setattr__(location, 'road_id', road_id)
+            cls._interned[key] = location
+        return location
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Location is immutable")
+
+    def __reduce__(self):
+        # Unpickling goes through __new__, so the copy is interned in the receiving process
+        return (Location, (self.x, self.y))
+
     def snap_to_road(self, x, y):
         """
-        Snaps the given coordinates to the nearest road.
+        Snaps the given coordinates to the nearest road, using the precomputed nearest-road index.
         """
-        x, y = round(x), round(y)
-        if ROAD_NETWORK[y, x]:
-            return x, y
-        
-        # Find the nearest road
-        nearest_x, nearest_y = x, y
-        min_distance = float('inf')
-        for i in range(max(0, y-5), min(GRID_SIZE, y+6)):
-            for j in range(max(0, x-5), min(GRID_SIZE, x+6)):
-                if ROAD_NETWORK[i, j]:
-                    distance = abs(x-j) + abs(y-i)
-                    if distance < min_distance:
-                        min_distance = distance
-                        nearest_x, nearest_y = j, i
-        
-        return nearest_x, nearest_y
+        x, y, _ = get_nearest_road_index().snap(x, y)
+        return x, y
 
     def distance_to(self, other):
         """
@@ -39,12 +56,14 @@ class Location:
         return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Location):
             return False
         return self.x == other.x and self.y == other.y
 
     def __hash__(self):
-        return hash((self.x, self.y))
+        return self.y * 65536 + self.x
 
     def __str__(self):
         return f"Location({self.x}, {self.y})"
@@ -0,0 +1,79 @@
+from SyntheticErrandsScheduler.config import WORK_START, WORK_END, MAX_DAYS, SLA_DAYS, SCORE_WEIGHTS
+
+def early_completion_bonus(errand, day):
+    """
+    Calculate the early completion bonus for completing an errand on a day.
+
+    Args:
+        errand (Errand): The errand.
+        day (int): The day the errand is scheduled.
+
+    Returns:
+        float: The bonus, 5% of the charge for every day ahead of the SLA.
+    """
+    days_early = max(0, SLA_DAYS - (day - errand.days_since_request))
+    return days_early * 0.05 * errand.charge
+
+class ObjectiveTotals:
+    """
+    Running totals of the terms of the solution score.
+
+    Schedules update the totals on every assignment and removal, so the score of a
+    solution, and the change in score caused by a move, is available in O(1) instead
+    of by walking every assignment.
+    """
+
+    __slots__ = ('profit', 'assigned', 'early_completion_bonus', 'service_time', 'used_time')
+
+    def __init__(self):
+        self.profit = 0
+        self.assigned = 0
+        self.early_completion_bonus = 0.0
+        self.service_time = 0
+        self.used_time = 0.0
+
+    def add(self, errand, day, start_time, sign=1):
+        """
+        Account for an assignment, or for its removal if sign is -1.
+
+        Args:
+            errand (Errand): The assigned errand.
+            day (int): The day of the assignment.
+            start_time (float): The start time of the errand in minutes.
+            sign (int): 1 to add the assignment, -1 to remove it.
+        """
+        service_time = errand.service_time
+        self.profit += sign * errand.charge
+        self.assigned += sign
+        self.early_completion_bonus += sign * early_completion_bonus(errand, day)
+        self.service_time += sign * service_time
+        self.used_time += sign * min(service_time, WORK_END - start_time)  # Cap at WORK_END
+
+    def remove(self, errand, day, start_time):
+        self.add(errand, day, start_time, sign=-1)
+
+    def copy(self):
+        totals = ObjectiveTotals.__new__(ObjectiveTotals)
+        for name in ObjectiveTotals.__slots__:
+            setattr(totals, name, getattr(self, name))
+        return totals
+
+    def score(self, num_errands, num_contractors, num_days=MAX_DAYS):
+        """
+        Combine the totals into the weighted solution score.
+
+        Args:
+            num_errands (int): The number of errands in the problem.
+            num_contractors (int): The number of contractors in the problem.
+            num_days (int): The number of days in the planning period.
+
+        Returns:
+            float: The solution score.
+        """
+        sla_compliance = self.assigned / num_errands if num_errands > 0 else 1.0
+        total_capacity = num_contractors * num_days * (WORK_END - WORK_START)
+        resource_utilization = self.service_time / total_capacity if total_capacity > 0 else 0
+        return (self.profit * SCORE_WEIGHTS['profit'] +
+                sla_compliance * SCORE_WEIGHTS['sla_compliance'] +
+                self.early_completion_bonus * SCORE_WEIGHTS['early_completion_bonus'] +
+                resource_utilization * SCORE_WEIGHTS['resource_utilization'])
@@ -0,0 +1,112 @@
+import numpy as np
+
+class PrecedenceGraph:
+    """
+    Precedence DAG over the errands of a problem, built once from Errand.predecessors.
+
+    Errands are numbered by their position in the errand list. Every errand gets a
+    tuple of predecessor and successor numbers and a topological index, so that
+    precedence checks only look at an errand's own edges. Predecessors that are not
+    part of the problem can never be completed and are counted separately.
+    """
+
+    def __init__(self, errands):
+        """
+        Args:
+            errands (list): The errands of the problem.
+
+        Raises:
+            ValueError: If the predecessor relation contains a cycle.
+        """
+        self.errands = errands
+        self.index = {errand: i for i, errand in enumerate(errands)}
+        predecessors = [[] for _ in errands]
+        successors = [[] for _ in errands]
+        self.external = np.zeros(len(errands), dtype=np.int32)
+
+        for i, errand in enumerate(errands):
+            for predecessor in errand.predecessors:
+                j = self.index.get(predecessor)
+                if j is None:
+                    self.external[i] += 1
+                else:
+                    predecessors[i].append(j)
+                    successors[j].append(i)
+
+        self.predecessors = [tuple(values) for values in predecessors]
+        self.successors = [tuple(values) for values in successors]
+        self.has_edges = any(self.predecessors) or bool(self.external.any())
+        self.order = self._topological_order()
+        self.topological_index = np.empty(len(errands), dtype=np.int32)
+        self.topological_index[self.order] = np.arange(len(errands), dtype=np.int32)
+
+    def _topological_order(self):
+        """Order the errands so that every errand comes after its predecessors (Kahn's algorithm)."""
+        remaining = [len(values) for values in self.predecessors]
+        order = [i for i, count in enumerate(remaining) if count == 0]
+        for i in order:  # order grows while it is being walked
+            for successor in self.successors[i]:
+                remaining[successor] -= 1
+                if remaining[successor] == 0:
+                    order.append(successor)
+
+        if len(order) < len(self.errands):
+            cyclic = sorted(self.errands[i].id for i, count in enumerate(remaining) if count > 0)
+            raise ValueError(f"Errand predecessors contain a cycle through errands {cyclic}")
+        return order
+
+    def unfinished_counts(self):
+        """Number of unfinished predecessors of every errand when nothing is completed."""
+        return np.array([len(values) for values in self.predecessors], dtype=np.int32) + self.external
+
+class PrecedenceTracker:
+    """
+    Count of unfinished predecessors of every errand in one schedule.
+
+    Completing or reopening an errand only updates the counts of its successors, and
+    checking whether an errand's predecessors are all completed is a single lookup, so
+    neither needs the set of completed errands.
+    """
+
+    __slots__ = ('graph', 'unfinished')
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.unfinished = graph.unfinished_counts()
+
+    def copy(self):
+        tracker = PrecedenceTracker.__new__(PrecedenceTracker)
+        tracker.graph = self.graph
+        tracker.unfinished = self.unfinished.copy()
+        return tracker
+
+    def complete(self, errand):
+        """Record that an errand has been assigned."""
+        successors = self.graph.successors[self.graph.index[errand]]
+        if successors:
+            self.unfinished[list(successors)] -= 1
+
+    def reopen(self, errand):
+        """Record that an errand's assignment has been removed."""
+        successors = self.graph.successors[self.graph.index[errand]]
+        if successors:
+            self.unfinished[list(successors)] += 1
+
+    def ready(self, errand, excluding=None):
+        """
+        Check whether all predecessors of an errand are completed.
+
+        Args:
+            errand (Errand): The errand to check.
+            excluding (Errand, optional): An errand to treat as not completed, such as
+                the other errand of a swap.
+
+        Returns:
+            bool: True if every predecessor is completed.
+        """
+        if not self.graph.has_edges:
+            return True
+        i = self.graph.index[errand]
+        if self.unfinished[i]:
+            return False
+        return excluding is None or self.graph.index.get(excluding) not in self.graph.predecessors[i]
@@ -0,0 +1,88 @@
+from SyntheticErrandsScheduler.models.location import Location
+from SyntheticErrandsScheduler.models.errand import Errand
+from SyntheticErrandsScheduler.models.contractor import Contractor
+from SyntheticErrandsScheduler.models.array_schedule import ArraySchedule
+from SyntheticErrandsScheduler.models.schedule import create_schedule
+
+def describe_problem(schedule):
+    """
+    Describe a schedule's problem and current assignments with plain tuples.
+
+    The description only holds ids, numbers and strings, so it pickles to a few
+    bytes per errand and can be sent to another process, which rebuilds the
+    schedule with build_schedule.
+
+    Args:
+        schedule (Schedule or ArraySchedule): The schedule to describe.
+
+    Returns:
+        dict: 'backend', 'errands' as (id, type, x, y, start_time, end_time,
+        days_since_request, predecessor_ids) tuples, 'contractors' as (id, x, y)
+        tuples and 'assignments' as returned by describe_assignments.
+    """
+    return {
+        'backend': 'array' if isinstance(schedule, ArraySchedule) else 'dict',
+        'errands': [
+            (errand.id, errand.type, errand.location.x, errand.location.y, errand.start_time, errand.end_time,
+             errand.days_since_request, tuple(sorted(predecessor.id for predecessor in errand.predecessors)))
+            for errand in schedule.errands
+        ],
+        'contractors': [
+            (contractor.id, contractor.start_location.x, contractor.start_location.y)
+            for contractor in schedule.contractors
+        ],
+        'assignments': describe_assignments(schedule),
+    }
+
+def describe_assignments(schedule):
+    """
+    List a schedule's assignments as (errand_id, contractor_id, day, start_time) tuples.
+
+    Assignments are listed day by day in the order they were made on that day.
+    """
+    return [
+        (errand.id, contractor.id, day, float(start_time))
+        for day in range(schedule.num_days)
+        for errand, contractor, start_time in schedule.assignments[day]
+    ]
+
+def build_schedule(description):
+    """
+    Rebuild a schedule, with new errands and contractors, from describe_problem's output.
+
+    Returns:
+        Schedule or ArraySchedule: The schedule, with the described assignments.
+    """
+    errands = [Errand(errand_id, errand_type, Location(x, y), start_time=start_time, end_time=end_time,
+                      days_since_request=days_since_request)
+               for errand_id, errand_type, x, y, start_time, end_time, days_since_request, _
+               in description['errands']]
+    errands_by_id = {errand.id: errand for errand in errands}
+    for errand, (*_, predecessor_ids) in zip(errands, description['errands']):
+        errand.predecessors = {errands_by_id[errand_id] for errand_id in predecessor_ids}
+
+    contractors = [Contractor(contractor_id, Location(x, y)) for contractor_id, x, y in description['contractors']]
+    schedule = create_schedule(contractors, errands, backend=description['backend'])
+    load_assignments(schedule, description['assignments'])
+    return schedule
+
+def load_assignments(schedule, assignments):
+    """
+    Replace a schedule's assignments with those from describe_assignments.
+
+    The schedule's own assignments are removed first and its contractors reset, since
+    they may still hold the state of another schedule over the same contractors.
+
+    Raises:
+        ValueError: If an assignment conflicts with another.
+    """
+    for day in range(schedule.num_days):
+        for assignment in list(schedule.assignments[day]):
+            schedule.remove_assignment(day, assignment)
+    errands_by_id = {errand.id: errand for errand in schedule.errands}
+    contractors_by_id = {contractor.id: contractor for contractor in schedule.contractors}
+    for contractor in schedule.contractors:
+        contractor.schedule = {}
+        contractor.current_location = contractor.start_location
+    for errand_id, contractor_id, day, start_time in assignments:
+        schedule.restore_assignment(contractors_by_id[contractor_id], errands_by_id[errand_id], day, start_time)
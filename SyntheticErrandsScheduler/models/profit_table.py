@@ -0,0 +1,50 @@
+import numpy as np
+from SyntheticErrandsScheduler.config import MAX_DAYS, SLA_DAYS
+
+class ProfitTable:
+    """
+    Profit of every errand on every day of the planning period.
+
+    Profit only depends on the errand type, the days since the request and the day,
+    so it is computed once for all errands and days with NumPy when a schedule is
+    created. Rows follow the schedule's errand list and columns are days. Alongside
+    ``profit`` (what Errand.calculate_profit returns) are the ``early_bonus`` and
+    ``late_penalty`` it is made of, and the ``completion_bonus`` that the solution
+    score awards for finishing ahead of the SLA.
+    """
+
+    def __init__(self, errands, num_days=MAX_DAYS, sla_days=SLA_DAYS):
+        """
+        Args:
+            errands (list): The errands of the problem.
+            num_days (int): The number of days in the planning period.
+            sla_days (int): The number of days in the Service Level Agreement.
+        """
+        self.index = {errand: i for i, errand in enumerate(errands)}
+        charge = np.array([errand.charge for errand in errands], dtype=np.float64)[:, None]
+        early_incentive = np.array([errand.details['early_incentive'] for errand in errands],
+                                   dtype=np.float64)[:, None]
+        late_rate = np.array([errand.details['late_penalty'] for errand in errands], dtype=np.float64)[:, None]
+        days_since_request = np.array([errand.days_since_request for errand in errands],
+                                      dtype=np.float64)[:, None]
+        days = np.arange(num_days, dtype=np.float64)[None, :]
+
+        days_until_due = sla_days - days_since_request
+        on_time = days <= days_until_due
+        self.early_bonus = np.where(on_time, early_incentive * (days_until_due - days), 0.0)
+        self.late_penalty = np.where(on_time, 0.0, late_rate * (days - days_until_due) * charge)
+        # Late profit never goes negative
+        self.profit = np.where(on_time, charge + self.early_bonus, np.maximum(0.0, charge - self.late_penalty))
+        self.completion_bonus = np.maximum(0.0, sla_days - (days - days_since_request)) * 0.05 * charge
+
+        # Plain list copies for fast scalar lookups from Python code
+        self._profit_rows = self.profit.tolist()
+        self._completion_bonus_rows = self.completion_bonus.tolist()
+
+    def profit_of(self, errand, day):
+        """The profit of an errand scheduled on a day."""
+        return self._profit_rows[self.index[errand]][day]
+
+    def completion_bonus_of(self, errand, day):
+        """The solution score's early completion bonus for an errand completed on a day."""
+        return self._completion_bonus_rows[self.index[errand]][day]
@@ -1,8 +1,13 @@
-from SyntheticErrandsScheduler.config import WORK_START, WORK_END, MAX_DAYS, SLA_DAYS
-from SyntheticErrandsScheduler.utils.travel_time import calculate_travel_time
+from SyntheticErrandsScheduler.config import WORK_START, WORK_END, MAX_DAYS, SLA_DAYS, SCHEDULE_BACKEND
+from SyntheticErrandsScheduler.models.array_schedule import ArraySchedule, _ContractorMirror
+from SyntheticErrandsScheduler.models.objective import ObjectiveTotals
+from SyntheticErrandsScheduler.models.journal import MoveJournal, ASSIGN, REMOVE
+from SyntheticErrandsScheduler.models.timeline import TimelineIndex, plan_arrival
+from SyntheticErrandsScheduler.models.precedence import PrecedenceGraph, PrecedenceTracker
+from SyntheticErrandsScheduler.models.profit_table import ProfitTable
 import logging
 
-logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
 
 class Schedule:
     def __init__(self, contractors, errands):
@@ -11,62 +16,225 @@ class Schedule:
         self.unassigned_errands = set(errands)
         self.completed_errands = set()
         self.assignments = {d: [] for d in range(MAX_DAYS)}
-        self.total_profit = 0
+        self.totals = ObjectiveTotals()
+        self.journal = MoveJournal(self)
+        self.timelines = TimelineIndex()
+        self.precedence = PrecedenceTracker(PrecedenceGraph(errands))
+        self.profit_table = ProfitTable(errands)
+        self._mirror = _ContractorMirror(self)
+        # The contractors' schedules and locations as this copy left them, while
+        # another copy owns the contractors
+        self._contractor_state = None
 
     @property
     def num_days(self):
         return MAX_DAYS
 
+    @property
+    def total_profit(self):
+        return self.totals.profit
+
+    def score(self):
+        """The weighted solution score, from running totals in O(1)."""
+        return self.totals.score(len(self.errands), len(self.contractors), MAX_DAYS)
+
+    def sync_contractors(self):
+        """
+        Make the contractors' schedules and locations reflect this schedule.
+
+        Copies share Contractor objects, which reflect one copy at a time. When a
+        different copy is worked on, the contractors' schedules and locations are
+        handed to the copy that owned them and replaced by this copy's, in
+        O(contractors).
+        Assigning, removing and rolling back errands do this automatically; code that
+        reads the contractors' locations or schedules calls it first.
+        """
+        mirror = self._mirror
+        if mirror.owner is self:
+            return
+        mirror.owner._contractor_state = [(contractor.schedule, contractor.current_location)
+                                          for contractor in self.contractors]
+        for contractor, (schedule, location) in zip(self.contractors, self._contractor_state):
+            contractor.schedule = schedule
+            contractor.current_location = location
+        self._contractor_state = None
+        mirror.owner = self
+
+    def _contractor_snapshot(self):
+        """Copy the contractors' schedules and locations as this schedule sees them."""
+        if self._mirror.owner is self:
+            state = [(contractor.schedule, contractor.current_location) for contractor in self.contractors]
+        else:
+            state = self._contractor_state
+        return [({day: list(entries) for day, entries in schedule.items()}, location) for schedule, location in state]
+
     def can_assign_errand(self, contractor, errand, day, start_time):
+        return self._plan_assignment(contractor, errand, day, start_time) is not None
+
+    def _plan_assignment(self, contractor, errand, day, start_time):
+        """The arrival time if the errand can be assigned, otherwise None."""
         if errand not in self.unassigned_errands:
-            return False
+            return None
         
-        if not errand.are_predecessors_completed(self.completed_errands):
-            return False
+        if not self.precedence.ready(errand):
+            return None
 
-        travel_time = calculate_travel_time(contractor.current_location, errand.location)
-        arrival_time = start_time + travel_time
+        arrival_time = plan_arrival(self.timelines.get(contractor, day), contractor, errand, start_time)
+        if arrival_time is None:
+            return None
         end_time = arrival_time + errand.service_time
 
-        return end_time <= WORK_END or day == MAX_DAYS - 1  # Allow overflow on the last day
+        if end_time <= WORK_END or day == MAX_DAYS - 1:  # Allow overflow on the last day
+            return arrival_time
+        return None
 
     def assign_errand(self, contractor, errand, day, start_time):
         try:
-            logging.debug(f"Trying to assign errand {errand.id} to contractor {contractor.id} on day {day} at {start_time}")
-
-            if self.can_assign_errand(contractor, errand, day, start_time):
-                travel_time = calculate_travel_time(contractor.current_location, errand.location)
-                arrival_time = start_time + travel_time
-
-                contractor.assign_errand(day, errand, arrival_time)
-                self.assignments[day].append((errand, contractor, arrival_time))
-                self.unassigned_errands.remove(errand)
-                self.completed_errands.add(errand)
-                self.total_profit += errand.charge
-                logging.debug(f"Successfully assigned errand {errand.id} to contractor {contractor.id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Trying to assign errand %s to contractor %s on day %s at %s",
+                             errand.id, contractor.id, day, start_time)
+
+            arrival_time = self._plan_assignment(contractor, errand, day, start_time)
+            if arrival_time is not None:
+                self._add_assignment(contractor, errand, day, arrival_time)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Successfully assigned errand %s to contractor %s", errand.id, contractor.id)
                 return True
             else:
-                logging.debug(f"Cannot perform errand {errand.id}: Time conflict or predecessors not completed")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Cannot perform errand %s: Time conflict or predecessors not completed", errand.id)
         except Exception as e:
-            logging.error(f"Error assigning errand {errand.id}: {str(e)}")
+            logger.error(f"Error assigning errand {errand.id}: {str(e)}")
         return False
 
+    def restore_assignment(self, contractor, errand, day, start_time):
+        """
+        Add an assignment at a known start (arrival) time, without planning travel.
+
+        Used to rebuild a schedule from a saved solution, whose start times were
+        already planned when it was made.
+
+        Raises:
+            ValueError: If the errand is already assigned or the assignment overlaps
+                another of the contractor's errands that day.
+        """
+        if errand not in self.unassigned_errands:
+            raise ValueError(f"Errand {errand.id} is already assigned")
+        if self.timelines.get(contractor, day).overlaps(start_time, start_time + errand.service_time):
+            raise ValueError(f"Errand {errand.id} at {start_time} overlaps another errand of "
+                             f"contractor {contractor.id} on day {day}")
+        self._add_assignment(contractor, errand, day, start_time)
+
+    def _add_assignment(self, contractor, errand, day, start_time):
+        self.sync_contractors()
+        previous_location = contractor.current_location
+        contractor.assign_errand(day, errand, start_time)
+        self.assignments[day].append((errand, contractor, start_time))
+        self.unassigned_errands.remove(errand)
+        self.completed_errands.add(errand)
+        self.precedence.complete(errand)
+        self.totals.add(errand, day, start_time)
+        self.timelines.for_update(contractor, day).add(start_time, start_time + errand.service_time,
+                                                       errand, errand.location)
+        self.journal.record((ASSIGN, day, errand, contractor, start_time, None, None, previous_location))
+
+    def remove_assignment(self, day, assignment):
+        """
+        Remove an assignment and return its errand to the unassigned errands.
+
+        Args:
+            day (int): The day of the assignment.
+            assignment (tuple): The (errand, contractor, start_time) assignment.
+
+        Raises:
+            ValueError: If the assignment is not in the schedule on that day.
+        """
+        errand, contractor, start_time = assignment
+        position = self.assignments[day].index(assignment)
+        del self.assignments[day][position]
+        self.sync_contractors()
+        previous_location = contractor.current_location
+        contractor_position = contractor.remove_errand(day, errand, start_time)
+        self.completed_errands.discard(errand)
+        self.unassigned_errands.add(errand)
+        self.precedence.reopen(errand)
+        self.totals.remove(errand, day, start_time)
+        self.timelines.for_update(contractor, day).remove(start_time, errand)
+        self.journal.record((REMOVE, day, errand, contractor, start_time, position, contractor_position,
+                             previous_location))
+
+    def _undo(self, entry):
+        """Invert an operation recorded in the journal."""
+        kind, day, errand, contractor, start_time, position, contractor_position, previous_location = entry
+        self.sync_contractors()
+        if kind == ASSIGN:
+            # Later operations have already been undone, so the assignment is the day's last
+            self.assignments[day].pop()
+            contractor.remove_errand(day, errand, start_time)
+            contractor.current_location = previous_location
+            self.completed_errands.discard(errand)
+            self.unassigned_errands.add(errand)
+            self.precedence.reopen(errand)
+            self.totals.remove(errand, day, start_time)
+            self.timelines.for_update(contractor, day).remove(start_time, errand)
+        else:
+            self.assignments[day].insert(position, (errand, contractor, start_time))
+            if contractor_position is not None:
+                contractor.restore_errand(day, errand, start_time, contractor_position, previous_location)
+            self.unassigned_errands.discard(errand)
+            self.completed_errands.add(errand)
+            self.precedence.complete(errand)
+            self.totals.add(errand, day, start_time)
+            self.timelines.for_update(contractor, day).add(start_time, start_time + errand.service_time,
+                                                           errand, errand.location)
+
+    def predecessors_completed(self, errand, excluding=None):
+        """
+        Check whether every predecessor of an errand is assigned, in O(predecessors).
+
+        Args:
+            errand (Errand): The errand to check.
+            excluding (Errand, optional): An errand to treat as unassigned, such as the
+                other errand of a swap.
+        """
+        return self.precedence.ready(errand, excluding)
+
+    def is_errand_assigned(self, errand):
+        return errand in self.completed_errands
+
+    def copy(self):
+        """
+        Copy the schedule's assignments.
+
+        The copy shares the Errand and Contractor objects, and takes a snapshot of the
+        contractors' schedules and locations, which it restores when it is worked on
+        (see sync_contractors).
+        """
+        clone = Schedule.__new__(Schedule)
+        clone.contractors = self.contractors
+        clone.errands = self.errands
+        clone.profit_table = self.profit_table
+        clone.unassigned_errands = set(self.unassigned_errands)
+        clone.completed_errands = set(self.completed_errands)
+        clone.assignments = {day: list(day_assignments) for day, day_assignments in self.assignments.items()}
+        clone.totals = self.totals.copy()
+        clone.journal = MoveJournal(clone)
+        clone.timelines = self.timelines.copy()
+        clone.precedence = self.precedence.copy()
+        clone._mirror = self._mirror
+        clone._contractor_state = self._contractor_snapshot()
+        return clone
+
     def calculate_total_profit(self):
-        return sum(errand.charge for day in self.assignments for errand, _, _ in self.assignments[day])
+        return self.totals.profit
 
     def calculate_sla_compliance(self):
         total_errands = len(self.errands)
-        completed_errands = len(self.completed_errands)
-        return completed_errands / total_errands if total_errands > 0 else 1.0
+        return self.totals.assigned / total_errands if total_errands > 0 else 1.0
 
     def calculate_resource_utilization(self):
         total_work_time = (WORK_END - WORK_START) * MAX_DAYS * len(self.contractors)
-        used_time = sum(
-            min(errand.service_time, WORK_END - start_time)  # Cap at WORK_END
-            for day in self.assignments
-            for errand, _, start_time in self.assignments[day]
-        )
-        return used_time / total_work_time if total_work_time > 0 else 0.0
+        return self.totals.used_time / total_work_time if total_work_time > 0 else 0.0
 
     def get_unassigned_errands(self):
         return list(self.unassigned_errands)
@@ -94,4 +262,24 @@ class Schedule:
                 if cont.id == contractor_id
             ]
             schedule.append(day_schedule)
-        return schedule
\ No newline at end of file
+        return schedule
+
+def create_schedule(contractors, errands, backend=None):
+    """
+    Create an empty schedule with the configured backend.
+
+    Args:
+        contractors (list): The contractors to schedule.
+        errands (list): The errands to schedule.
+        backend (str, optional): 'array' for ArraySchedule or 'dict' for Schedule.
+            Defaults to SCHEDULE_BACKEND.
+
+    Returns:
+        Schedule or ArraySchedule: The new schedule.
+    """
+    backend = backend or SCHEDULE_BACKEND
+    if backend == 'array':
+        return ArraySchedule(contractors, errands)
+    if backend == 'dict':
+        return Schedule(contractors, errands)
+    raise ValueError(f"Invalid schedule backend: {backend}")
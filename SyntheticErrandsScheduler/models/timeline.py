@@ -0,0 +1,205 @@
+from bisect import bisect_left, bisect_right
+from SyntheticErrandsScheduler.utils.travel_time import calculate_travel_time
+
+class DayTimeline:
+    """
+    Sorted busy spans of one contractor on one day.
+
+    Each span is an interval [start, end) in minutes together with the location the
+    contractor is at when it starts and when it ends, and the errand it belongs to.
+    Spans never overlap and are kept in parallel lists sorted by start time, so
+    overlap detection, gap lookup and finding the earliest feasible insertion point
+    all start with a bisection instead of a scan or sort of the day's errands.
+    """
+
+    __slots__ = ('starts', 'ends', 'start_locations', 'end_locations', 'errands')
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.start_locations = []
+        self.end_locations = []
+        self.errands = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def copy(self):
+        timeline = DayTimeline.__new__(DayTimeline)
+        for name in DayTimeline.__slots__:
+            setattr(timeline, name, list(getattr(self, name)))
+        return timeline
+
+    def overlaps(self, start, end):
+        """Check whether [start, end) overlaps any busy span."""
+        index = bisect_left(self.starts, end)
+        return index > 0 and self.ends[index - 1] > start
+
+    def add(self, start, end, errand, start_location, end_location=None):
+        """
+        Add a busy span.
+
+        Raises:
+            ValueError: If the span overlaps an existing one.
+        """
+        if self.overlaps(start, end):
+            raise ValueError(f"Errand {errand.id} at {start}-{end} overlaps another errand")
+        index = bisect_right(self.starts, start)
+        self.starts.insert(index, start)
+        self.ends.insert(index, end)
+        self.start_locations.insert(index, start_location)
+        self.end_locations.insert(index, start_location if end_location is None else end_location)
+        self.errands.insert(index, errand)
+
+    def remove(self, start, errand):
+        """Remove the busy span of an errand that starts at start."""
+        index = bisect_left(self.starts, start)
+        while index < len(self.starts) and self.starts[index] == start:
+            if self.errands[index] == errand:
+                for values in (self.starts, self.ends, self.start_locations, self.end_locations, self.errands):
+                    del values[index]
+                return
+            index += 1
+        raise ValueError(f"Errand {errand.id} is not scheduled at {start}")
+
+    def gap_at(self, time):
+        """
+        Find the free gap containing a time.
+
+        Returns:
+            tuple: (gap_start, gap_end, previous_location, next_location), where the
+            gap bounds are None when the gap is open at that end and the locations are
+            None when there is no span before or after the gap. None if the time falls
+            inside a busy span.
+        """
+        index = bisect_right(self.starts, time)
+        if index > 0 and self.ends[index - 1] > time:
+            return None
+        if index > 0:
+            gap_start, previous_location = self.ends[index - 1], self.end_locations[index - 1]
+        else:
+            gap_start, previous_location = None, None
+        if index < len(self.starts):
+            gap_end, next_location = self.starts[index], self.start_locations[index]
+        else:
+            gap_end, next_location = None, None
+        return gap_start, gap_end, previous_location, next_location
+
+    def next_free_time(self, time):
+        """The earliest time at or after time that is not inside a busy span."""
+        index = bisect_right(self.starts, time)
+        if index == 0 or self.ends[index - 1] <= time:
+            return time
+        time = self.ends[index - 1]
+        # Skip spans that start right where the previous one ends
+        while index < len(self.starts) and self.starts[index] <= time:
+            time = max(time, self.ends[index])
+            index += 1
+        return time
+
+    def end_time(self, default):
+        """The end of the last busy span, or default if the day is empty."""
+        return self.ends[-1] if self.ends else default
+
+    def earliest_insertion(self, location, duration, not_before, home, travel_time, latest_end=None):
+        """
+        Find the earliest start for a new span that fits between the existing ones.
+
+        The span must leave time to travel to it from the previous span's end location
+        (or from home) and on to the next span's start location. Only gaps from the
+        one containing not_before onwards are examined.
+
+        Args:
+            location (Location): Where the new span takes place.
+            duration (float): Length of the new span in minutes.
+            not_before (float): Earliest time the contractor may set off.
+            home (Location): Where the contractor starts the day.
+            travel_time (callable): travel_time(origin, destination, departure_time)
+                returning minutes.
+            latest_end (float, optional): The span must end by this time.
+
+        Returns:
+            float: The start (arrival) time of the new span, or None if no gap fits.
+        """
+        index = bisect_right(self.starts, not_before)
+        if index > 0 and self.ends[index - 1] > not_before:
+            not_before = self.ends[index - 1]
+
+        while True:
+            previous_location = self.end_locations[index - 1] if index > 0 else home
+            arrival = not_before + travel_time(previous_location, location, not_before)
+            end = arrival + duration
+            if latest_end is not None and end > latest_end:
+                return None
+            if index == len(self.starts):
+                return arrival
+            if end + travel_time(location, self.start_locations[index], end) <= self.starts[index]:
+                return arrival
+            not_before = self.ends[index]
+            index += 1
+
+class TimelineIndex:
+    """
+    Day timelines of every contractor, keyed by (contractor, day).
+
+    Copies share timelines until one side changes them (copy on write), so copying
+    a schedule does not copy every contractor's day.
+    """
+
+    def __init__(self):
+        self._timelines = {}
+        self._owned = set()
+
+    def get(self, contractor, day):
+        """The timeline of a contractor's day, for reading only."""
+        timeline = self._timelines.get((contractor, day))
+        return _EMPTY_TIMELINE if timeline is None else timeline
+
+    def for_update(self, contractor, day):
+        """The timeline of a contractor's day, safe to modify."""
+        key = (contractor, day)
+        if key not in self._owned:
+            timeline = self._timelines.get(key)
+            self._timelines[key] = DayTimeline() if timeline is None else timeline.copy()
+            self._owned.add(key)
+        return self._timelines[key]
+
+    def copy(self):
+        clone = TimelineIndex.__new__(TimelineIndex)
+        clone._timelines = dict(self._timelines)
+        clone._owned = set()
+        # Both sides now share every timeline
+        self._owned = set()
+        return clone
+
+_EMPTY_TIMELINE = DayTimeline()
+
+def plan_arrival(timeline, contractor, errand, start_time):
+    """
+    Work out when a contractor setting off at start_time would arrive at an errand.
+
+    The contractor sets off from where its previous errand that day ends (or from its
+    start location), and must be able to finish the errand and travel on to its next
+    errand before that one starts.
+
+    Args:
+        timeline (DayTimeline): The contractor's timeline for the day.
+        contractor (Contractor): The contractor.
+        errand (Errand): The errand to fit in.
+        start_time (float): The time the contractor sets off, in minutes.
+
+    Returns:
+        float: The arrival time, or None if start_time is inside a busy span or the
+        errand would not fit in the gap.
+    """
+    gap = timeline.gap_at(start_time)
+    if gap is None:
+        return None
+    _, gap_end, previous_location, next_location = gap
+    origin = contractor.start_location if previous_location is None else previous_location
+    arrival_time = start_time + calculate_travel_time(origin, errand.location, departure_time=start_time)
+    if gap_end is not None:
+        end_time = arrival_time + errand.service_time
+        if end_time + calculate_travel_time(errand.location, next_location, departure_time=end_time) > gap_end:
+            return None
+    return arrival_time
@@ -1,5 +1,9 @@
 from .travel_time import (
     calculate_travel_time,
+    travel_time_matrix,
+    astar_travel_time,
+    set_routing_mode,
+    get_travel_time_cache,
     manhattan_distance,
     euclidean_distance,
     estimate_travel_time
@@ -17,6 +21,10 @@ from .city_map import (
 
 __all__ = [
     'calculate_travel_time',
+    'travel_time_matrix',
+    'astar_travel_time',
+    'set_routing_mode',
+    'get_travel_time_cache',
     'manhattan_distance',
     'euclidean_distance',
     'estimate_travel_time',
@@ -1,8 +1,6 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import ListedColormap
-from matplotlib.patches import Patch
-from SyntheticErrandsScheduler.config import GRID_SIZE, BUSYVILLE_MAP, ROAD_NETWORK, RESIDENTIAL, COMMERCIAL, PARK, INDUSTRIAL, ERRAND_COLORS
+from SyntheticErrandsScheduler.config import GRID_SIZE, RESIDENTIAL, COMMERCIAL, PARK, INDUSTRIAL, ERRAND_COLORS, get_busyville_map, get_road_network
+from SyntheticErrandsScheduler.utils.nearest_road import get_nearest_road_index
 
 def visualize_city_map(ax=None, show_roads=True):
     """
@@ -15,6 +13,11 @@ def visualize_city_map(ax=None, show_roads=True):
     Returns:
         matplotlib.figure.Figure: The figure object containing the visualized map.
     """
+    # Plotting libraries are imported on first use so headless runs never load them
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap
+    from matplotlib.patches import Patch
+
     if ax is None:
         fig, ax = plt.subplots(figsize=(12, 10))
     else:
@@ -27,7 +30,7 @@ def visualize_city_map(ax=None, show_roads=True):
     norm = plt.cm.colors.BoundaryNorm(bounds, cmap.N)
 
     # Plot the city map
-    im = ax.imshow(BUSYVILLE_MAP, cmap=cmap, norm=norm)
+    im = ax.imshow(get_busyville_map(), cmap=cmap, norm=norm)
 
     # Create legend patches
     legend_elements = [
@@ -44,7 +47,7 @@ def visualize_city_map(ax=None, show_roads=True):
 
     # Overlay the road network if requested
     if show_roads:
-        road_y, road_x = np.where(ROAD_NETWORK)
+        road_y, road_x = np.where(get_road_network())
         ax.scatter(road_x, road_y, color='gray', s=1, alpha=0.5)
 
     ax.set_title('Busyville Map')
@@ -72,6 +75,8 @@ def plot_route(route, ax=None, color='red', alpha=0.7, linewidth=2, show_directi
     Returns:
         matplotlib.figure.Figure: The figure object containing the plotted route.
     """
+    import matplotlib.pyplot as plt
+
     if ax is None:
         fig, ax = plt.subplots(figsize=(12, 10))
         visualize_city_map(ax=ax, show_roads=True)
@@ -103,7 +108,7 @@ def get_area_type(location):
     Returns:
         int: The area type (RESIDENTIAL, COMMERCIAL, PARK, or INDUSTRIAL).
     """
-    return BUSYVILLE_MAP[location.y, location.x]
+    return get_busyville_map()[location.y, location.x]
 
 def is_valid_location(x, y):
     """
@@ -128,31 +133,25 @@ def is_on_road(location):
     Returns:
         bool: True if the location is on a road, False otherwise.
     """
-    return ROAD_NETWORK[location.y, location.x]
+    return get_road_network()[location.y, location.x]
 
 def find_nearest_road(location):
     """
     Find the nearest road to a given location.
 
+    This uses the same nearest-road index as Location snapping, so both agree.
+
     Args:
         location (Location): The location to start from.
 
     Returns:
         tuple: (x, y) coordinates of the nearest road location.
     """
-    x, y = location.x, location.y
-    
-    if is_on_road(location):
-        return (x, y)
-
-    for d in range(1, GRID_SIZE):
-        for dx, dy in [(0, d), (d, 0), (0, -d), (-d, 0)]:
-            nx, ny = x + dx, y + dy
-            if is_valid_location(nx, ny) and ROAD_NETWORK[ny, nx]:
-                return (nx, ny)
-
-    # If we get here, there's no road on the map (shouldn't happen in a normal city map)
-    raise ValueError("No road found on the map")
+    x, y, road_cell = get_nearest_road_index().snap(location.x, location.y)
+    if road_cell < 0:
+        # There's no road on the map (shouldn't happen in a normal city map)
+        raise ValueError("No road found on the map")
+    return (x, y)
 
 def plot_schedule(schedule, day, ax=None):
     """
@@ -166,6 +165,8 @@ def plot_schedule(schedule, day, ax=None):
     Returns:
         matplotlib.figure.Figure: The figure object containing the plotted schedule.
     """
+    import matplotlib.pyplot as plt
+
     if ax is None:
         fig, ax = plt.subplots(figsize=(12, 10))
         visualize_city_map(ax=ax, show_roads=True)
@@ -0,0 +1,285 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import numpy as np
+from SyntheticErrandsScheduler.config import DISTANCE_MATRIX_CACHE_DIR, get_road_network
+from SyntheticErrandsScheduler.utils.road_graph import CompressedRoadGraph, get_road_graph
+
+logger = logging.getLogger(__name__)
+
+UNREACHABLE = np.iinfo(np.uint16).max
+
+class RoadDistanceMatrix:
+    """
+    All-pairs shortest road distances (in grid steps) between the nodes of the compressed road graph.
+
+    Only intersections and dead ends are stored in the uint16 matrix. Any other road
+    cell lies on a straight run between two of them, so the distance between two road
+    cells is the best of the four ways of leaving the first cell's run and entering the
+    second's, or the distance along the run when both cells are on the same one.
+    """
+
+    def __init__(self, roads, distances=None, graph=None):
+        """
+        Build the compressed graph for a road network and, unless given, the distance matrix.
+
+        Args:
+            roads (numpy.ndarray): Boolean road grid indexed as roads[y, x].
+            distances (numpy.ndarray, optional): Precomputed (n, n) uint16 node distance matrix.
+            graph (CompressedRoadGraph, optional): The compressed graph of roads, if already built.
+        """
+        self.graph = graph if graph is not None else CompressedRoadGraph.from_roads(roads)
+        self.roads = roads
+        self.size = roads.shape[0]
+        self.num_nodes = self.graph.num_nodes
+        self.num_cells = self.graph.num_road_cells
+
+        # Plain list copies for fast scalar lookups from Python code
+        self._cell_index_list = self.graph.cell_index.tolist()
+        self._anchors = list(zip(self.graph.anchor_nodes[:, 0].tolist(), self.graph.anchor_offsets[:, 0].tolist(),
+                                 self.graph.anchor_nodes[:, 1].tolist(), self.graph.anchor_offsets[:, 1].tolist(),
+                                 self.graph.cell_edges.tolist()))
+
+        self.distances = distances if distances is not None else self._compute_distances()
+
+    @property
+    def distances(self):
+        return self._distances
+
+    @distances.setter
+    def distances(self, distances):
+        self._distances = distances
+        self._distances_view = memoryview(np.ascontiguousarray(distances).reshape(-1))
+
+    def cell_id(self, x, y):
+        """
+        Get the road cell id of a grid cell.
+
+        Args:
+            x (int): The x-coordinate.
+            y (int): The y-coordinate.
+
+        Returns:
+            int: The road cell id, or -1 if the cell is not on a road.
+        """
+        if 0 <= x < self.size and 0 <= y < self.size:
+            return self._cell_index_list[y * self.size + x]
+        return -1
+
+    def cell_ids(self, xs, ys):
+        """
+        Get the road cell ids of many grid cells at once.
+
+        Args:
+            xs (numpy.ndarray): The x-coordinates.
+            ys (numpy.ndarray): The y-coordinates.
+
+        Returns:
+            numpy.ndarray: The road cell ids, with -1 for cells that are not on a road.
+        """
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        inside = (xs >= 0) & (xs < self.size) & (ys >= 0) & (ys < self.size)
+        ids = np.full(xs.shape, -1, dtype=np.int64)
+        ids[inside] = self.graph.cell_index[ys[inside] * self.size + xs[inside]]
+        return ids
+
+    def distance(self, source_cell, target_cell):
+        """
+        Get the road distance between two road cells.
+
+        Args:
+            source_cell (int): The starting road cell id.
+            target_cell (int): The ending road cell id.
+
+        Returns:
+            int: The number of road steps, or UNREACHABLE if there is no path.
+        """
+        if source_cell == target_cell:
+            return 0
+        s0, s0_offset, s1, s1_offset, source_edge = self._anchors[source_cell]
+        t0, t0_offset, t1, t1_offset, target_edge = self._anchors[target_cell]
+        distances = self._distances_view
+        n = self.num_nodes
+
+        best = UNREACHABLE
+        if source_edge >= 0 and source_edge == target_edge:
+            best = abs(s0_offset - t0_offset)
+        for node, offset in ((s0 * n, s0_offset), (s1 * n, s1_offset)):
+            for target, target_offset in ((t0, t0_offset), (t1, t1_offset)):
+                between = distances[node + target]
+                if between != UNREACHABLE and offset + between + target_offset < best:
+                    best = offset + between + target_offset
+        return best
+
+    def cell_distances(self, source_cells, target_cells):
+        """
+        Get the road distances from every source cell to every target cell.
+
+        Args:
+            source_cells (numpy.ndarray): Road cell ids of the sources.
+            target_cells (numpy.ndarray): Road cell ids of the targets.
+
+        Returns:
+            numpy.ndarray: (len(source_cells), len(target_cells)) int64 road distances,
+            with UNREACHABLE where there is no path.
+        """
+        graph = self.graph
+        source_cells = np.asarray(source_cells, dtype=np.int64)
+        target_cells = np.asarray(target_cells, dtype=np.int64)
+        result = np.full((len(source_cells), len(target_cells)), UNREACHABLE, dtype=np.int64)
+
+        for i in range(2):
+            source_nodes = graph.anchor_nodes[source_cells, i]
+            source_offsets = graph.anchor_offsets[source_cells, i].astype(np.int64)[:, None]
+            for j in range(2):
+                between = self.distances[np.ix_(source_nodes, graph.anchor_nodes[target_cells, j])].astype(np.int64)
+                candidate = source_offsets + between + graph.anchor_offsets[target_cells, j][None, :]
+                np.minimum(result, np.where(between == UNREACHABLE, UNREACHABLE, candidate), out=result)
+
+        source_edges = graph.cell_edges[source_cells][:, None]
+        same_edge = (source_edges >= 0) & (source_edges == graph.cell_edges[target_cells][None, :])
+        along_edge = np.abs(graph.anchor_offsets[source_cells, 0][:, None].astype(np.int64)
+                            - graph.anchor_offsets[target_cells, 0][None, :])
+        np.minimum(result, np.where(same_edge, along_edge, UNREACHABLE), out=result)
+        result[source_cells[:, None] == target_cells[None, :]] = 0
+        return np.minimum(result, UNREACHABLE)
+
+    def _compute_distances(self):
+        """
+        Run a shortest path search from every node of the compressed graph.
+
+        Distances that do not fit in uint16 are stored as UNREACHABLE.
+        """
+        n = self.num_nodes
+        distances = np.empty((n, n), dtype=np.uint16)
+        for node in range(n):
+            lengths = self.graph.shortest_path_lengths(node)
+            distances[node] = np.minimum(lengths, UNREACHABLE)
+        return distances
+
+def road_network_hash(roads):
+    """
+    Hash a road network so cached distance matrices can be matched to it.
+
+    Args:
+        roads (numpy.ndarray): Boolean road grid indexed as roads[y, x].
+
+    Returns:
+        str: Hex digest of the grid shape and road cells.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr(roads.shape).encode())
+    digest.update(np.packbits(np.asarray(roads, dtype=bool)).tobytes())
+    return digest.hexdigest()
+
+def distance_matrix_paths(roads, cache_dir):
+    """
+    Get the matrix and metadata file paths for a road network.
+
+    Args:
+        roads (numpy.ndarray): Boolean road grid indexed as roads[y, x].
+        cache_dir (str): Directory holding cached matrices.
+
+    Returns:
+        tuple: (matrix_path, metadata_path, road_hash)
+    """
+    road_hash = road_network_hash(roads)
+    base_name = f"road_node_distances_{roads.shape[0]}_{road_hash[:16]}"
+    return (os.path.join(cache_dir, base_name + ".npy"),
+            os.path.join(cache_dir, base_name + ".json"),
+            road_hash)
+
+def _load_cached_distances(matrix_path, metadata_path, road_hash, num_nodes):
+    """Open a cached matrix read-only, or return None if it is missing or stale."""
+    try:
+        with open(metadata_path) as f:
+            metadata = json.load(f)
+        if metadata.get("road_hash") != road_hash or metadata.get("num_nodes") != num_nodes:
+            logger.info(f"Distance matrix cache {matrix_path} is stale")
+            return None
+        distances = np.load(matrix_path, mmap_mode='r')
+    except (OSError, ValueError) as e:
+        logger.debug(f"No usable distance matrix cache at {matrix_path}: {e}")
+        return None
+
+    if distances.shape != (num_nodes, num_nodes) or distances.dtype != np.uint16:
+        logger.info(f"Distance matrix cache {matrix_path} has the wrong shape or type")
+        return None
+    return distances
+
+def _atomic_write(path, write):
+    """Write a file through a temporary file in the same directory, then rename it."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def _save_distances(distances, matrix_path, metadata_path, road_hash):
+    """Write the matrix and then its metadata, so the metadata only ever describes a complete file."""
+    os.makedirs(os.path.dirname(matrix_path), exist_ok=True)
+    metadata = {"road_hash": road_hash, "num_nodes": int(distances.shape[0])}
+    _atomic_write(matrix_path, lambda f: np.save(f, distances))
+    _atomic_write(metadata_path, lambda f: f.write(json.dumps(metadata).encode()))
+
+def load_distance_matrix(roads, cache_dir=DISTANCE_MATRIX_CACHE_DIR, graph=None):
+    """
+    Load the distance matrix for a road network from the cache, building it if needed.
+
+    The matrix is stored as an .npy file named after a hash of the road grid and
+    opened with mmap_mode='r', so every process using the same map shares one copy
+    through the OS page cache. A file whose recorded hash or shape does not match
+    the road grid is rebuilt.
+
+    Args:
+        roads (numpy.ndarray): Boolean road grid indexed as roads[y, x].
+        cache_dir (str, optional): Directory holding cached matrices. If None, the
+            matrix is built in memory and not persisted.
+        graph (CompressedRoadGraph, optional): The compressed graph of roads, if already built.
+
+    Returns:
+        RoadDistanceMatrix: The distance matrix for the road network.
+    """
+    if graph is None:
+        graph = CompressedRoadGraph.from_roads(roads)
+    if cache_dir is None:
+        return RoadDistanceMatrix(roads, graph=graph)
+
+    matrix_path, metadata_path, road_hash = distance_matrix_paths(roads, cache_dir)
+    num_nodes = graph.num_nodes
+    distances = _load_cached_distances(matrix_path, metadata_path, road_hash, num_nodes)
+    if distances is not None:
+        return RoadDistanceMatrix(roads, distances, graph=graph)
+
+    logger.info(f"Building road distance matrix for {num_nodes} road nodes")
+    matrix = RoadDistanceMatrix(roads, graph=graph)
+    try:
+        _save_distances(matrix.distances, matrix_path, metadata_path, road_hash)
+    except OSError as e:
+        logger.warning(f"Could not cache distance matrix at {matrix_path}: {e}")
+        return matrix
+
+    distances = _load_cached_distances(matrix_path, metadata_path, road_hash, num_nodes)
+    if distances is not None:
+        matrix.distances = distances
+    return matrix
+
+_distance_matrix = None
+
+def get_distance_matrix():
+    """
+    Get the shared distance matrix for ROAD_NETWORK, loading or building it on first use.
+
+    Returns:
+        RoadDistanceMatrix: The distance matrix for the configured road network.
+    """
+    global _distance_matrix
+    if _distance_matrix is None:
+        _distance_matrix = load_distance_matrix(get_road_network(), graph=get_road_graph())
+    return _distance_matrix
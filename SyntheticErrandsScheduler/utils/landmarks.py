@@ -0,0 +1,183 @@
+import numpy as np
+from SyntheticErrandsScheduler.config import MAIN_ROAD_SPACING, NUM_LANDMARKS, ACTIVE_LANDMARKS
+from SyntheticErrandsScheduler.utils.road_graph import RoadCorridors, UNREACHABLE_DISTANCE, get_road_graph
+from SyntheticErrandsScheduler.utils.pathfinding import GraphRouter
+
+class LandmarkRouter(GraphRouter):
+    """
+    A* search with landmark (ALT) lower bounds, for grids too large for an all-pairs matrix.
+
+    Preprocessing stores the road distance from a handful of landmarks to every node.
+    By the triangle inequality, ``|d(L, t) - d(L, v)|`` is a lower bound on the distance
+    from any node ``v`` to the target ``t``, which makes a far tighter A* heuristic than
+    the Manhattan distance once roads force detours.
+
+    Most queries on a city grid never need the search: the main and secondary roads
+    are long straight corridors, and when the start and goal are joined by a path
+    along at most three corridors that never moves away from the goal, its length is
+    the Manhattan distance, which no road path can beat. The corridor extents are
+    precomputed, so this check costs a few array slices. Paths with more turns are
+    looked for by a depth-first walk along edges that never move away from the goal,
+    which needs neither a heap nor the landmark bounds.
+    """
+
+    def __init__(self, graph, num_landmarks=NUM_LANDMARKS, active_landmarks=ACTIVE_LANDMARKS,
+                 spacing=MAIN_ROAD_SPACING):
+        """
+        Select landmarks and compute their distance arrays.
+
+        Args:
+            graph (RoadGraph): The road graph to search.
+            num_landmarks (int): The number of landmarks to place.
+            active_landmarks (int): The number of landmarks used by each query, picked
+                as those giving the best bound between its source and target.
+            spacing (int): Spacing of the main road grid; landmarks are placed on main
+                road intersections.
+        """
+        super().__init__(graph)
+        self.corridors = RoadCorridors(graph.roads)
+        self.active_landmarks = active_landmarks
+        self.landmarks, self.landmark_distances = select_landmarks(graph, num_landmarks, spacing)
+        self._landmark_views = [memoryview(row) for row in self.landmark_distances]
+
+    def _cell_bound(self, view, cell):
+        """Distance from a landmark to a road cell, through the nearer end of the cell's edge."""
+        node_0, offset_0, node_1, offset_1, _ = self._anchors[cell]
+        return min(view[node_0] + offset_0, view[node_1] + offset_1)
+
+    def _bounds_for(self, source_cell, target_cell):
+        """Pick the landmarks with the largest lower bound between source and target."""
+        ranked = []
+        for view in self._landmark_views:
+            to_target = self._cell_bound(view, target_cell)
+            if to_target >= UNREACHABLE_DISTANCE:
+                continue
+            ranked.append((abs(self._cell_bound(view, source_cell) - to_target), view, to_target))
+        ranked.sort(key=lambda entry: entry[0], reverse=True)
+        return [(view, to_target) for _, view, to_target in ranked[:self.active_landmarks]]
+
+    def _monotone_distance(self, source_cell, target_cell):
+        """
+        Walk depth-first from source to target along edges that never move away from it.
+
+        An edge keeps the path monotone when it brings the Manhattan distance to the
+        target down by its full length, so a walk that arrives is a shortest path.
+        Every node is visited at most once.
+
+        Returns:
+            int: The Manhattan distance, or None if no monotone path exists.
+        """
+        xs = self._xs_view
+        ys = self._ys_view
+        indptr = self._indptr_view
+        indices = self._indices_view
+        weights = self._weights_view
+        seen = self._seen_view
+        generation = self._next_generation()
+        target_x = self._cell_xs[target_cell]
+        target_y = self._cell_ys[target_cell]
+        remaining = abs(self._cell_xs[source_cell] - target_x) + abs(self._cell_ys[source_cell] - target_y)
+
+        source_0, source_0_offset, source_1, source_1_offset, source_edge = self._anchors[source_cell]
+        target_0, target_0_offset, target_1, target_1_offset, target_edge = self._anchors[target_cell]
+        if source_edge >= 0 and source_edge == target_edge and abs(source_0_offset - target_0_offset) == remaining:
+            return remaining
+        exits = set()
+        for node, offset in ((target_0, target_0_offset), (target_1, target_1_offset)):
+            if abs(xs[node] - target_x) + abs(ys[node] - target_y) == offset:
+                exits.add(node)
+
+        stack = []
+        for node, offset in ((source_0, source_0_offset), (source_1, source_1_offset)):
+            if seen[node] != generation and offset + abs(xs[node] - target_x) + abs(ys[node] - target_y) == remaining:
+                seen[node] = generation
+                stack.append(node)
+        while stack:
+            current = stack.pop()
+            if current in exits:
+                return remaining
+            to_target = abs(xs[current] - target_x) + abs(ys[current] - target_y)
+            onward = []
+            for position in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[position]
+                if seen[neighbor] != generation:
+                    dx = abs(xs[neighbor] - target_x)
+                    dy = abs(ys[neighbor] - target_y)
+                    if dx + dy + weights[position] == to_target:
+                        onward.append((abs(dx - dy), neighbor))
+            # Close the shorter leg first; heading for the diagonal runs into more dead ends
+            onward.sort()
+            for _, neighbor in onward:
+                seen[neighbor] = generation
+                stack.append(neighbor)
+        return None
+
+    def distance(self, source_cell, target_cell):
+        """
+        Find the shortest road distance between two road cells.
+
+        Args:
+            source_cell (int): The source road cell id.
+            target_cell (int): The target road cell id.
+
+        Returns:
+            int: The road distance in grid steps, or -1 if there is no path.
+        """
+        start = (self._cell_xs[source_cell], self._cell_ys[source_cell])
+        goal = (self._cell_xs[target_cell], self._cell_ys[target_cell])
+        if self.corridors.monotone_path_exists(start, goal):
+            return abs(start[0] - goal[0]) + abs(start[1] - goal[1])
+        distance = self._monotone_distance(source_cell, target_cell)
+        if distance is not None:
+            return distance
+        return super().distance(source_cell, target_cell)
+
+def select_landmarks(graph, num_landmarks, spacing=MAIN_ROAD_SPACING):
+    """
+    Place landmarks on main road intersections by farthest-point selection.
+
+    The first landmark is the intersection farthest from an arbitrary node; each
+    further landmark is the intersection farthest from all landmarks chosen so far,
+    which spreads them around the edge of the map where their bounds are tightest.
+
+    Args:
+        graph (RoadGraph): The road graph.
+        num_landmarks (int): The number of landmarks to place.
+        spacing (int): Spacing of the main road grid.
+
+    Returns:
+        tuple: (list of landmark node ids, (num_landmarks, num_nodes) int32 distance array)
+    """
+    candidates = np.flatnonzero((graph.xs % spacing == 0) & (graph.ys % spacing == 0))
+    if len(candidates) == 0:
+        candidates = np.arange(graph.num_nodes)
+
+    landmarks = []
+    rows = []
+    nearest = graph.shortest_path_lengths(int(candidates[0])).astype(np.int64)
+    for _ in range(min(num_landmarks, len(candidates))):
+        # Unreachable candidates rank lowest so landmarks stay in the main component
+        scores = np.where(nearest[candidates] == UNREACHABLE_DISTANCE, -1, nearest[candidates])
+        landmark = int(candidates[np.argmax(scores)])
+        if landmark in landmarks:
+            break
+        distances = graph.shortest_path_lengths(landmark)
+        landmarks.append(landmark)
+        rows.append(distances)
+        nearest = distances.astype(np.int64) if len(landmarks) == 1 else np.minimum(nearest, distances)
+
+    return landmarks, np.array(rows, dtype=np.int32).reshape(len(rows), graph.num_nodes)
+
+_landmark_router = None
+
+def get_landmark_router():
+    """
+    Get the shared landmark router for ROAD_NETWORK, building it on first use.
+
+    Returns:
+        LandmarkRouter: The router for the configured road network.
+    """
+    global _landmark_router
+    if _landmark_router is None:
+        _landmark_router = LandmarkRouter(get_road_graph())
+    return _landmark_router
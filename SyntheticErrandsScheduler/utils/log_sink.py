@@ -0,0 +1,137 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+
+DEFAULT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+class SamplingFilter(logging.Filter):
+    """
+    Let through one in every ``sample_rate`` records from each logging call site.
+
+    Records at or above ``always_level`` always pass. Sampling is counted separately
+    for every (logger, line) pair, so a chatty per-move message is thinned out without
+    hiding rarer progress messages. Records are dropped before their message is
+    formatted, so a dropped record costs only the counter update.
+    """
+
+    def __init__(self, sample_rate=1, always_level=logging.WARNING):
+        """
+        Args:
+            sample_rate (int): Keep one record in this many from each call site.
+            always_level (int): Records at this level or above are never dropped.
+        """
+        super().__init__()
+        if sample_rate < 1:
+            raise ValueError(f"Invalid sample rate: {sample_rate}")
+        self.sample_rate = sample_rate
+        self.always_level = always_level
+        self._counts = {}
+        self.dropped = 0
+
+    def filter(self, record):
+        if self.sample_rate == 1 or record.levelno >= self.always_level:
+            return True
+        key = (record.name, record.lineno)
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        if count % self.sample_rate == 0:
+            return True
+        self.dropped += 1
+        return False
+
+class LogSink:
+    """
+    Queue-backed logging sink.
+
+    Log calls only put records on an in-memory queue; a background listener thread
+    writes them to the real handlers, so the solver never waits on file or console
+    I/O. Records are sampled before they are queued, and only kept records have their
+    message formatted.
+    """
+
+    def __init__(self, handlers, sample_rate=1, max_queue_size=10000):
+        """
+        Args:
+            handlers (list): Handlers the background thread writes records to.
+            sample_rate (int): Keep one INFO/DEBUG record in this many from each call site.
+            max_queue_size (int): Maximum number of queued records; further records are
+                dropped rather than blocking the solver.
+        """
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.handler = _NonBlockingQueueHandler(self.queue)
+        self.sampler = SamplingFilter(sample_rate)
+        self.handler.addFilter(self.sampler)
+        self.listener = logging.handlers.QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self._running = False
+
+    def start(self):
+        if not self._running:
+            self.listener.start()
+            self._running = True
+
+    def stop(self):
+        """Write out any queued records and stop the background thread."""
+        if self._running:
+            self.listener.stop()
+            self._running = False
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records when the queue is full instead of blocking."""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+_log_sink = None
+
+def configure_logging(level=logging.INFO, filename=None, sample_rate=1, max_bytes=10 * 1024 * 1024,
+                      backup_count=3, fmt=DEFAULT_FORMAT):
+    """
+    Route all log records through a queue-backed, sampled sink.
+
+    This is meant to be called once by an application (such as main.py); the library
+    itself never configures logging. Calling it again replaces the previous sink.
+
+    Args:
+        level (int): The root logger level.
+        filename (str, optional): Log file path. The file is rotated at max_bytes, so
+            it cannot grow without bound. If None, records go to stderr.
+        sample_rate (int): Keep one INFO/DEBUG record in this many from each call site.
+            Warnings and errors are always kept.
+        max_bytes (int): Size at which the log file is rotated.
+        backup_count (int): Number of rotated log files to keep.
+        fmt (str): The log record format.
+
+    Returns:
+        LogSink: The running sink.
+    """
+    global _log_sink
+    if filename is None:
+        output = logging.StreamHandler()
+    else:
+        output = logging.handlers.RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count)
+    output.setFormatter(logging.Formatter(fmt))
+
+    root = logging.getLogger()
+    if _log_sink is not None:
+        root.removeHandler(_log_sink.handler)
+        _log_sink.stop()
+
+    _log_sink = LogSink([output], sample_rate=sample_rate)
+    root.addHandler(_log_sink.handler)
+    root.setLevel(level)
+    _log_sink.start()
+    return _log_sink
+
+def shutdown_logging():
+    """Flush and stop the sink installed by configure_logging, if any."""
+    global _log_sink
+    if _log_sink is not None:
+        logging.getLogger().removeHandler(_log_sink.handler)
+        _log_sink.stop()
+        _log_sink = None
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,120 @@
+import numpy as np
+from SyntheticErrandsScheduler.config import get_road_network
+from SyntheticErrandsScheduler.utils.road_graph import get_road_graph
+
+class NearestRoadIndex:
+    """
+    Lookup table from every grid cell to its nearest road cell.
+
+    Distances are Manhattan distances, and ties are broken towards the road cell that
+    comes first in row-major order (smallest y, then smallest x). The table is built
+    once per map with a vectorized distance transform, so snapping a coordinate is a
+    single array lookup.
+    """
+
+    def __init__(self, roads, cell_index=None):
+        """
+        Compute the nearest road cell of every grid cell.
+
+        Args:
+            roads (numpy.ndarray): Boolean road grid indexed as roads[y, x].
+            cell_index (numpy.ndarray, optional): Flat grid index to road cell id map of
+                the routing graph. Defaults to numbering the road cells row by row.
+        """
+        self.size = roads.shape[0]
+        if cell_index is None:
+            cell_index = np.full(roads.size, -1, dtype=np.int32)
+            cell_index[np.flatnonzero(roads.ravel())] = np.arange(np.count_nonzero(roads), dtype=np.int32)
+
+        nearest, distance = nearest_road_transform(roads)
+        self.nearest = nearest
+        self.distance = distance
+        self.snapped_y, self.snapped_x = np.divmod(np.maximum(nearest, 0), self.size)
+        self.road_cell = np.where(nearest >= 0, cell_index[np.maximum(nearest, 0)], -1).astype(np.int32)
+
+        # Plain list copies for fast scalar lookups from Python code
+        self._snapped_x_list = self.snapped_x.ravel().tolist()
+        self._snapped_y_list = self.snapped_y.ravel().tolist()
+        self._road_cell_list = self.road_cell.ravel().tolist()
+
+    def snap(self, x, y):
+        """
+        Snap a coordinate to the nearest road cell.
+
+        Coordinates are rounded to the nearest grid cell and clamped to the map first.
+
+        Args:
+            x (float): The x-coordinate.
+            y (float): The y-coordinate.
+
+        Returns:
+            tuple: (x, y, road_cell_id) of the nearest road cell. If the map has no
+            roads, the clamped coordinate is returned with a road cell id of -1.
+        """
+        last = self.size - 1
+        x = min(max(round(x), 0), last)
+        y = min(max(round(y), 0), last)
+        index = y * self.size + x
+        road_cell = self._road_cell_list[index]
+        if road_cell < 0:
+            return x, y, -1
+        return self._snapped_x_list[index], self._snapped_y_list[index], road_cell
+
+def nearest_road_transform(roads):
+    """
+    Compute the Manhattan distance transform of a road grid, with the nearest road cell.
+
+    The Manhattan distance is separable, so the transform is a column pass followed by
+    a row pass. Each pass takes ``min_j (f(j) + |i - j|)`` along one axis, which splits
+    into ``i + cummin(f(j) - j)`` over ``j <= i`` and ``-i + reverse_cummin(f(j) + j)``
+    over ``j >= i``. Distances and flat road cell indices are packed into a single
+    integer key (``distance * cells + index``) so that one minimum gives both the
+    distance and the row-major tie-break.
+
+    Args:
+        roads (numpy.ndarray): Boolean road grid indexed as roads[y, x].
+
+    Returns:
+        tuple: (nearest, distance) arrays shaped like roads, holding the flat grid
+        index of the nearest road cell and its distance, or -1 where there are no roads.
+    """
+    num_cells = roads.size
+    infinity = np.int64(1) << 62
+    flat_index = np.arange(num_cells, dtype=np.int64).reshape(roads.shape)
+    keys = np.where(roads, flat_index, infinity)
+
+    keys = _min_plus_manhattan(keys, axis=0, step=num_cells)
+    keys = _min_plus_manhattan(keys, axis=1, step=num_cells)
+
+    no_road = keys >= infinity
+    nearest = np.where(no_road, -1, keys % num_cells)
+    distance = np.where(no_road, -1, keys // num_cells)
+    return nearest, distance
+
+def _min_plus_manhattan(keys, axis, step):
+    """Compute min_j (keys[j] + |i - j| * step) along one axis."""
+    shape = [1, 1]
+    shape[axis] = keys.shape[axis]
+    offsets = np.arange(keys.shape[axis], dtype=np.int64).reshape(shape) * step
+
+    from_before = np.minimum.accumulate(keys - offsets, axis=axis) + offsets
+    reversed_keys = np.flip(keys + offsets, axis=axis)
+    from_after = np.flip(np.minimum.accumulate(reversed_keys, axis=axis), axis=axis) - offsets
+    return np.minimum(from_before, from_after)
+
+_nearest_road_index = None
+
+def get_nearest_road_index():
+    """
+    Get the shared nearest-road index for ROAD_NETWORK, building it on first use.
+
+    Road cell ids match the routing graph, so they can be passed straight to the
+    distance matrix and routers.
+
+    Returns:
+        NearestRoadIndex: The nearest-road index for the configured road network.
+    """
+    global _nearest_road_index
+    if _nearest_road_index is None:
+        _nearest_road_index = NearestRoadIndex(get_road_network(), get_road_graph().cell_index)
+    return _nearest_road_index
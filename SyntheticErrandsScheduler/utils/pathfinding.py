@@ -0,0 +1,284 @@
+import heapq
+import numpy as np
+from SyntheticErrandsScheduler.config import get_road_network
+from SyntheticErrandsScheduler.utils.road_graph import get_road_graph
+
+class AStarRouter:
+    """
+    On-demand A* search over a road grid.
+
+    The open list is a binary heap with lazy deletion, and the g-scores and closed set
+    are flat NumPy arrays indexed by ``y * size + x``. The arrays are allocated once
+    and reused by every search; a generation counter marks which entries belong to
+    the current search, so nothing has to be cleared between calls.
+    """
+
+    def __init__(self, roads):
+        """
+        Allocate the search buffers for a road network.
+
+        Args:
+            roads (numpy.ndarray): Boolean road grid indexed as roads[y, x].
+        """
+        self.size = roads.shape[0]
+        num_cells = roads.size
+
+        self._roads = np.ascontiguousarray(roads.ravel(), dtype=np.uint8)
+        self._g_score = np.zeros(num_cells, dtype=np.int32)
+        self._seen = np.zeros(num_cells, dtype=np.uint32)
+        self._closed = np.zeros(num_cells, dtype=np.uint32)
+        self._generation = 0
+
+        # Memoryviews give plain-int element access in the search loop
+        self._roads_view = memoryview(self._roads)
+        self._g_view = memoryview(self._g_score)
+        self._seen_view = memoryview(self._seen)
+        self._closed_view = memoryview(self._closed)
+
+    def _next_generation(self):
+        self._generation += 1
+        if self._generation == np.iinfo(np.uint32).max:
+            self._seen.fill(0)
+            self._closed.fill(0)
+            self._generation = 1
+        return self._generation
+
+    def distance(self, start, goal):
+        """
+        Find the shortest road distance between two grid cells.
+
+        As in the original search, the start cell does not have to be on a road, but
+        every other cell of the path does.
+
+        Args:
+            start (tuple): (x, y) coordinates of the start cell.
+            goal (tuple): (x, y) coordinates of the goal cell.
+
+        Returns:
+            int: The number of road steps, or -1 if there is no path.
+        """
+        size = self.size
+        roads = self._roads_view
+        g_score = self._g_view
+        seen = self._seen_view
+        closed = self._closed_view
+        generation = self._next_generation()
+
+        goal_x, goal_y = goal
+        start_index = start[1] * size + start[0]
+        goal_index = goal_y * size + goal_x
+
+        g_score[start_index] = 0
+        seen[start_index] = generation
+        open_heap = [(abs(start[0] - goal_x) + abs(start[1] - goal_y), 0, start_index)]
+
+        while open_heap:
+            _, negative_g, current = heapq.heappop(open_heap)
+            if closed[current] == generation:
+                continue  # Stale heap entry
+            if current == goal_index:
+                return -negative_g
+            closed[current] = generation
+
+            y, x = divmod(current, size)
+            tentative_g = 1 - negative_g
+            for neighbor, nx, ny, valid in (
+                (current + 1, x + 1, y, x + 1 < size),
+                (current - 1, x - 1, y, x > 0),
+                (current + size, x, y + 1, y + 1 < size),
+                (current - size, x, y - 1, y > 0),
+            ):
+                if not valid or not roads[neighbor] or closed[neighbor] == generation:
+                    continue
+                if seen[neighbor] != generation or tentative_g < g_score[neighbor]:
+                    seen[neighbor] = generation
+                    g_score[neighbor] = tentative_g
+                    f = tentative_g + abs(nx - goal_x) + abs(ny - goal_y)
+                    # Ties on f are broken towards the deeper node, which keeps the search on the path
+                    heapq.heappush(open_heap, (f, -tentative_g, neighbor))
+
+        return -1
+
+class GraphRouter:
+    """
+    On-demand A* search over a road graph, between road cells.
+
+    A road cell that is not a node of the graph lies on an edge, so the search starts
+    from both end nodes of the source cell's edge at their offsets and finishes at
+    either end node of the target cell's edge. The first complete route is not
+    necessarily the shortest, so the search continues until no open node can beat it.
+    Search buffers are reused between calls as in AStarRouter.
+    """
+
+    def __init__(self, graph):
+        """
+        Allocate the search buffers for a road graph.
+
+        Args:
+            graph (RoadGraph): The road graph to search.
+        """
+        self.graph = graph
+
+        num_nodes = graph.num_nodes
+        self._g_score = np.zeros(num_nodes, dtype=np.int64)
+        self._seen = np.zeros(num_nodes, dtype=np.uint32)
+        self._closed = np.zeros(num_nodes, dtype=np.uint32)
+        self._generation = 0
+
+        # Memoryviews give plain-int element access in the search loop
+        self._indptr_view = memoryview(np.ascontiguousarray(graph.indptr, dtype=np.int64))
+        self._indices_view = memoryview(np.ascontiguousarray(graph.indices, dtype=np.int32))
+        self._weights_view = memoryview(np.ascontiguousarray(graph.weights, dtype=np.int32))
+        self._xs_view = memoryview(np.ascontiguousarray(graph.xs, dtype=np.int64))
+        self._ys_view = memoryview(np.ascontiguousarray(graph.ys, dtype=np.int64))
+        self._g_view = memoryview(self._g_score)
+        self._seen_view = memoryview(self._seen)
+        self._closed_view = memoryview(self._closed)
+        self._anchors = list(zip(graph.anchor_nodes[:, 0].tolist(), graph.anchor_offsets[:, 0].tolist(),
+                                 graph.anchor_nodes[:, 1].tolist(), graph.anchor_offsets[:, 1].tolist(),
+                                 graph.cell_edges.tolist()))
+        self._cell_xs = graph.cell_xs.tolist()
+        self._cell_ys = graph.cell_ys.tolist()
+
+    def _next_generation(self):
+        self._generation += 1
+        if self._generation == np.iinfo(np.uint32).max:
+            self._seen.fill(0)
+            self._closed.fill(0)
+            self._generation = 1
+        return self._generation
+
+    def _bounds_for(self, source_cell, target_cell):
+        """
+        Get extra lower bounds for the search, as (node distance view, distance to target) pairs.
+
+        The base router only uses the Manhattan distance.
+        """
+        return []
+
+    def distance(self, source_cell, target_cell):
+        """
+        Find the shortest road distance between two road cells.
+
+        Args:
+            source_cell (int): The source road cell id.
+            target_cell (int): The target road cell id.
+
+        Returns:
+            int: The road distance in grid steps, or -1 if there is no path.
+        """
+        if source_cell == target_cell:
+            return 0
+
+        source_0, source_0_offset, source_1, source_1_offset, source_edge = self._anchors[source_cell]
+        target_0, target_0_offset, target_1, target_1_offset, target_edge = self._anchors[target_cell]
+        best = float('inf')
+        if source_edge >= 0 and source_edge == target_edge:
+            best = abs(source_0_offset - target_0_offset)
+        exits = {target_0: target_0_offset}
+        if target_1_offset < exits.get(target_1, target_1_offset + 1):
+            exits[target_1] = target_1_offset
+
+        xs = self._xs_view
+        ys = self._ys_view
+        indptr = self._indptr_view
+        indices = self._indices_view
+        weights = self._weights_view
+        g_score = self._g_view
+        seen = self._seen_view
+        closed = self._closed_view
+        generation = self._next_generation()
+        target_x = self._cell_xs[target_cell]
+        target_y = self._cell_ys[target_cell]
+        bounds = self._bounds_for(source_cell, target_cell)
+
+        # The heuristic is inlined below, as it runs for every push. Edge lengths are
+        # grid steps, so the Manhattan distance is a bound as well as the extra bounds.
+        open_heap = []
+        for node, offset in ((source_0, source_0_offset), (source_1, source_1_offset)):
+            if seen[node] != generation or offset < g_score[node]:
+                seen[node] = generation
+                g_score[node] = offset
+                h = abs(xs[node] - target_x) + abs(ys[node] - target_y)
+                for view, to_target in bounds:
+                    h = max(h, abs(view[node] - to_target))
+                heapq.heappush(open_heap, (offset + h, -offset, node))
+
+        while open_heap:
+            f, negative_g, current = heapq.heappop(open_heap)
+            if f >= best:
+                break
+            if closed[current] == generation:
+                continue  # Stale heap entry
+            closed[current] = generation
+
+            g = -negative_g
+            exit_offset = exits.get(current)
+            if exit_offset is not None and g + exit_offset < best:
+                best = g + exit_offset
+
+            for position in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[position]
+                if closed[neighbor] == generation:
+                    continue
+                tentative_g = g + weights[position]
+                if seen[neighbor] != generation or tentative_g < g_score[neighbor]:
+                    seen[neighbor] = generation
+                    g_score[neighbor] = tentative_g
+                    h = abs(xs[neighbor] - target_x) + abs(ys[neighbor] - target_y)
+                    for view, to_target in bounds:
+                        bound = view[neighbor] - to_target
+                        if bound < 0:
+                            bound = -bound
+                        if bound > h:
+                            h = bound
+                    # Ties on f are broken towards the deeper node, which keeps the search on the path
+                    heapq.heappush(open_heap, (tentative_g + h, -tentative_g, neighbor))
+
+        return best if best != float('inf') else -1
+
+    def cell_distance(self, start, goal):
+        """
+        Find the shortest road distance between two grid cells.
+
+        Args:
+            start (tuple): (x, y) coordinates of the start cell.
+            goal (tuple): (x, y) coordinates of the goal cell.
+
+        Returns:
+            int: The road distance in grid steps, or -1 if either cell is off the road
+            or there is no path.
+        """
+        source = self.graph.cell_id(*start)
+        target = self.graph.cell_id(*goal)
+        if source < 0 or target < 0:
+            return -1
+        return self.distance(source, target)
+
+_astar_router = None
+
+def get_astar_router():
+    """
+    Get the shared A* router for ROAD_NETWORK, creating it on first use.
+
+    Returns:
+        AStarRouter: The router for the configured road network.
+    """
+    global _astar_router
+    if _astar_router is None:
+        _astar_router = AStarRouter(get_road_network())
+    return _astar_router
+
+_graph_router = None
+
+def get_graph_router():
+    """
+    Get the shared A* router over the compressed graph of ROAD_NETWORK, creating it on first use.
+
+    Returns:
+        GraphRouter: The router for the configured road network.
+    """
+    global _graph_router
+    if _graph_router is None:
+        _graph_router = GraphRouter(get_road_graph())
+    return _graph_router
@@ -0,0 +1,385 @@
+import heapq
+import numpy as np
+from SyntheticErrandsScheduler.config import get_road_network
+
+UNREACHABLE_DISTANCE = np.iinfo(np.int32).max
+
+# Neighbour offsets in the same order as the A* search in pathfinding.py
+NEIGHBOR_OFFSETS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+def build_neighbor_table(roads, cells, cell_index):
+    """
+    Build a (num_cells, 4) table of neighbouring road cell ids.
+
+    Args:
+        roads (numpy.ndarray): Boolean road grid indexed as roads[y, x].
+        cells (numpy.ndarray): Flat grid index of every road cell.
+        cell_index (numpy.ndarray): Flat grid index to road cell id map (-1 for non-road cells).
+
+    Returns:
+        numpy.ndarray: Neighbour road cell ids, padded with -1.
+    """
+    size = roads.shape[0]
+    ys, xs = np.divmod(cells, size)
+    neighbors = np.full((len(cells), len(NEIGHBOR_OFFSETS)), -1, dtype=np.int64)
+
+    for k, (dx, dy) in enumerate(NEIGHBOR_OFFSETS):
+        nx, ny = xs + dx, ys + dy
+        inside = (nx >= 0) & (nx < size) & (ny >= 0) & (ny < size)
+        neighbors[inside, k] = cell_index[ny[inside] * size + nx[inside]]
+
+    return neighbors
+
+class RoadGraph:
+    """
+    Road network as a weighted graph in compressed sparse row (CSR) form.
+
+    The edges of node ``v`` are ``indices[indptr[v]:indptr[v + 1]]`` with lengths
+    ``weights[indptr[v]:indptr[v + 1]]``. Road cells are numbered separately, row by
+    row, and every road cell is attached to the graph by two anchors: the nodes at
+    either end of the road segment it lies on, and its distance to each. In this
+    base graph every road cell is a node, so both anchors are the cell itself.
+    """
+
+    def __init__(self, roads, cells, indptr, indices, weights, road_cells=None,
+                 anchor_nodes=None, anchor_offsets=None, cell_edges=None):
+        """
+        Args:
+            roads (numpy.ndarray): Boolean road grid indexed as roads[y, x].
+            cells (numpy.ndarray): Flat grid index (y * size + x) of every node.
+            indptr (numpy.ndarray): CSR row pointers, of length num_nodes + 1.
+            indices (numpy.ndarray): CSR neighbour node ids.
+            weights (numpy.ndarray): CSR edge lengths in grid steps.
+            road_cells (numpy.ndarray, optional): Flat grid index of every road cell.
+            anchor_nodes (numpy.ndarray, optional): (num_road_cells, 2) anchor node ids.
+            anchor_offsets (numpy.ndarray, optional): (num_road_cells, 2) distances to the anchors.
+            cell_edges (numpy.ndarray, optional): Segment id of every road cell, -1 for nodes.
+        """
+        size = roads.shape[0]
+        self.roads = roads
+        self.size = size
+        self.cells = cells
+        self.num_nodes = len(cells)
+        self.ys, self.xs = np.divmod(cells, size)
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+
+        self.node_index = np.full(size * size, -1, dtype=np.int32)
+        self.node_index[cells] = np.arange(self.num_nodes, dtype=np.int32)
+
+        if road_cells is None:
+            road_cells = cells
+            anchor_nodes = np.repeat(np.arange(self.num_nodes, dtype=np.int32)[:, None], 2, axis=1)
+            anchor_offsets = np.zeros((self.num_nodes, 2), dtype=np.int32)
+            cell_edges = np.full(self.num_nodes, -1, dtype=np.int32)
+        self.road_cells = road_cells
+        self.num_road_cells = len(road_cells)
+        self.anchor_nodes = anchor_nodes
+        self.anchor_offsets = anchor_offsets
+        self.cell_edges = cell_edges
+
+        self.cell_ys, self.cell_xs = np.divmod(road_cells, size)
+        self.cell_index = np.full(size * size, -1, dtype=np.int32)
+        self.cell_index[road_cells] = np.arange(self.num_road_cells, dtype=np.int32)
+
+    @classmethod
+    def from_roads(cls, roads):
+        """
+        Build the graph of road cells, with unit-length edges between adjacent cells.
+
+        Args:
+            roads (numpy.ndarray): Boolean road grid indexed as roads[y, x].
+
+        Returns:
+            RoadGraph: The road cell graph.
+        """
+        cells = np.flatnonzero(roads.ravel())
+        cell_index = np.full(roads.size, -1, dtype=np.int32)
+        cell_index[cells] = np.arange(len(cells), dtype=np.int32)
+
+        neighbors = build_neighbor_table(roads, cells, cell_index)
+        has_edge = neighbors >= 0
+        indptr = np.zeros(len(cells) + 1, dtype=np.int64)
+        np.cumsum(has_edge.sum(axis=1), out=indptr[1:])
+        indices = neighbors[has_edge].astype(np.int32)
+        weights = np.ones(len(indices), dtype=np.int32)
+        return cls(roads, cells, indptr, indices, weights)
+
+    def node_id(self, x, y):
+        """
+        Get the node id of a grid cell.
+
+        Args:
+            x (int): The x-coordinate.
+            y (int): The y-coordinate.
+
+        Returns:
+            int: The node id, or -1 if the cell is not a node.
+        """
+        if 0 <= x < self.size and 0 <= y < self.size:
+            return int(self.node_index[y * self.size + x])
+        return -1
+
+    def cell_id(self, x, y):
+        """
+        Get the road cell id of a grid cell.
+
+        Args:
+            x (int): The x-coordinate.
+            y (int): The y-coordinate.
+
+        Returns:
+            int: The road cell id, or -1 if the cell is not on a road.
+        """
+        if 0 <= x < self.size and 0 <= y < self.size:
+            return int(self.cell_index[y * self.size + x])
+        return -1
+
+    @property
+    def has_unit_weights(self):
+        return bool(np.all(self.weights == 1))
+
+    def shortest_path_lengths(self, source):
+        """
+        Compute the road distance from one node to every node.
+
+        Unit-weight graphs use a level-synchronous breadth-first search vectorized over
+        each frontier; other graphs use Dijkstra's algorithm.
+
+        Args:
+            source (int): The source node id.
+
+        Returns:
+            numpy.ndarray: int32 distances, with UNREACHABLE_DISTANCE for unreachable nodes.
+        """
+        if self.has_unit_weights:
+            return self._breadth_first_lengths(source)
+        return self._dijkstra_lengths(source)
+
+    def _breadth_first_lengths(self, source):
+        distances = np.full(self.num_nodes, UNREACHABLE_DISTANCE, dtype=np.int32)
+        distances[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        level = 0
+        while len(frontier):
+            level += 1
+            starts = self.indptr[frontier]
+            counts = self.indptr[frontier + 1] - starts
+            # Positions of every edge leaving the frontier
+            positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            neighbors = self.indices[positions]
+            neighbors = np.unique(neighbors[distances[neighbors] == UNREACHABLE_DISTANCE])
+            distances[neighbors] = level
+            frontier = neighbors.astype(np.int64)
+        return distances
+
+    def _dijkstra_lengths(self, source):
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        weights = self.weights.tolist()
+        distances = [UNREACHABLE_DISTANCE] * self.num_nodes
+        distances[source] = 0
+        heap = [(0, source)]
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > distances[node]:
+                continue
+            for position in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[position]
+                candidate = distance + weights[position]
+                if candidate < distances[neighbor]:
+                    distances[neighbor] = candidate
+                    heapq.heappush(heap, (candidate, neighbor))
+        return np.array(distances, dtype=np.int32)
+
+class CompressedRoadGraph(RoadGraph):
+    """
+    Road graph with straight runs of road collapsed into weighted edges.
+
+    Only intersections and dead ends (road cells without exactly two road neighbours)
+    are nodes; each chain of two-neighbour cells between them becomes one edge whose
+    weight is its length. Each road cell on such a chain is anchored to the two end
+    nodes of its edge, at its offset along the edge and the remaining length.
+    """
+
+    @classmethod
+    def from_roads(cls, roads):
+        """
+        Build the compressed graph of a road network.
+
+        Args:
+            roads (numpy.ndarray): Boolean road grid indexed as roads[y, x].
+
+        Returns:
+            CompressedRoadGraph: The compressed road graph.
+        """
+        road_cells = np.flatnonzero(roads.ravel())
+        num_road_cells = len(road_cells)
+        cell_index = np.full(roads.size, -1, dtype=np.int32)
+        cell_index[road_cells] = np.arange(num_road_cells, dtype=np.int32)
+
+        neighbors = build_neighbor_table(roads, road_cells, cell_index)
+        is_node = ((neighbors >= 0).sum(axis=1) != 2).tolist()
+        neighbor_lists = [[n for n in row if n >= 0] for row in neighbors.tolist()]
+
+        node_of_cell = [-1] * num_road_cells
+        node_cells = []
+        cell_edges = [-1] * num_road_cells
+        cell_offsets = [0] * num_road_cells
+        edges = []
+
+        def add_node(cell):
+            node_of_cell[cell] = len(node_cells)
+            node_cells.append(cell)
+
+        def trace_edges(start):
+            for first in neighbor_lists[start]:
+                if is_node[first]:
+                    if start < first:
+                        edges.append((start, first, 1))
+                    continue
+                if cell_edges[first] >= 0:
+                    continue  # Already traced from its other end
+
+                edge = len(edges)
+                previous, current, length = start, first, 1
+                while not is_node[current]:
+                    cell_edges[current] = edge
+                    cell_offsets[current] = length
+                    a, b = neighbor_lists[current]
+                    previous, current = current, (b if a == previous else a)
+                    length += 1
+                edges.append((start, current, length))
+
+        for cell in range(num_road_cells):
+            if is_node[cell]:
+                add_node(cell)
+        for cell in list(node_cells):
+            trace_edges(cell)
+
+        # Loops of two-neighbour cells with no intersection get one of their cells as a node
+        for cell in range(num_road_cells):
+            if not is_node[cell] and cell_edges[cell] < 0:
+                is_node[cell] = True
+                add_node(cell)
+                trace_edges(cell)
+
+        edge_u = np.array([node_of_cell[u] for u, _, _ in edges], dtype=np.int32)
+        edge_v = np.array([node_of_cell[v] for _, v, _ in edges], dtype=np.int32)
+        edge_length = np.array([length for _, _, length in edges], dtype=np.int32)
+
+        # Both directions of every edge except self-loops, which never shorten a path
+        keep = edge_u != edge_v
+        sources = np.concatenate([edge_u[keep], edge_v[keep]])
+        targets = np.concatenate([edge_v[keep], edge_u[keep]])
+        lengths = np.concatenate([edge_length[keep], edge_length[keep]])
+        order = np.argsort(sources, kind='stable')
+        indptr = np.zeros(len(node_cells) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(node_cells)), out=indptr[1:])
+
+        cell_edges = np.array(cell_edges, dtype=np.int32)
+        cell_offsets = np.array(cell_offsets, dtype=np.int32)
+        node_of_cell = np.array(node_of_cell, dtype=np.int32)
+        on_edge = cell_edges >= 0
+        anchor_nodes = np.repeat(node_of_cell[:, None], 2, axis=1)
+        anchor_offsets = np.zeros((num_road_cells, 2), dtype=np.int32)
+        anchor_nodes[on_edge, 0] = edge_u[cell_edges[on_edge]]
+        anchor_nodes[on_edge, 1] = edge_v[cell_edges[on_edge]]
+        anchor_offsets[on_edge, 0] = cell_offsets[on_edge]
+        anchor_offsets[on_edge, 1] = edge_length[cell_edges[on_edge]] - cell_offsets[on_edge]
+
+        graph = cls(roads, road_cells[np.array(node_cells, dtype=np.int64)], indptr,
+                    targets[order].astype(np.int32), lengths[order].astype(np.int32),
+                    road_cells=road_cells, anchor_nodes=anchor_nodes,
+                    anchor_offsets=anchor_offsets, cell_edges=cell_edges)
+        graph.edge_u = edge_u
+        graph.edge_v = edge_v
+        graph.edge_length = edge_length
+        return graph
+
+class RoadCorridors:
+    """
+    Extent of the straight road run through every road cell, in both directions.
+
+    For a road cell (x, y), the horizontal run is the longest stretch of road cells in
+    row y containing it, and the vertical run the same in column x. With these, a
+    straight road segment between two cells can be checked in O(1).
+    """
+
+    def __init__(self, roads):
+        """
+        Args:
+            roads (numpy.ndarray): Boolean road grid indexed as roads[y, x].
+        """
+        self.row_start, self.row_end = _run_extents(roads)
+        column_start, column_end = _run_extents(roads.T)
+        self.column_start = np.ascontiguousarray(column_start.T)
+        self.column_end = np.ascontiguousarray(column_end.T)
+
+    def monotone_path_exists(self, start, goal):
+        """
+        Check for a road path from start to goal with at most two turns that never
+        moves away from the goal.
+
+        Such a path is exactly as long as the Manhattan distance, which is a lower bound
+        on any road path, so it is a shortest path.
+
+        Args:
+            start (tuple): (x, y) coordinates of a road cell.
+            goal (tuple): (x, y) coordinates of a road cell.
+
+        Returns:
+            bool: True if a monotone path was found.
+        """
+        sx, sy = start
+        gx, gy = goal
+        low_x, high_x = min(sx, gx), max(sx, gx)
+        low_y, high_y = min(sy, gy), max(sy, gy)
+
+        # Along row sy to some column, along that column to row gy, then along row gy
+        first = max(low_x, self.row_start[sy, sx], self.row_start[gy, gx])
+        last = min(high_x, self.row_end[sy, sx], self.row_end[gy, gx])
+        if first <= last and np.any((self.column_start[sy, first:last + 1] <= low_y) &
+                                    (self.column_end[sy, first:last + 1] >= high_y)):
+            return True
+
+        # Along column sx to some row, along that row to column gx, then along column gx
+        first = max(low_y, self.column_start[sy, sx], self.column_start[gy, gx])
+        last = min(high_y, self.column_end[sy, sx], self.column_end[gy, gx])
+        return bool(first <= last and np.any((self.row_start[first:last + 1, sx] <= low_x) &
+                                             (self.row_end[first:last + 1, sx] >= high_x)))
+
+def _run_extents(roads):
+    """
+    Get the first and last column of the horizontal road run through every cell.
+
+    Cells that are not on a road get an empty run (start greater than end).
+    """
+    height, width = roads.shape
+    columns = np.broadcast_to(np.arange(width, dtype=np.int32), roads.shape)
+
+    starts_run = roads & ~np.pad(roads, ((0, 0), (1, 0)))[:, :-1]
+    start = np.maximum.accumulate(np.where(starts_run, columns, -1), axis=1)
+
+    ends_run = roads & ~np.pad(roads, ((0, 0), (0, 1)))[:, 1:]
+    end_or_max = np.where(ends_run, columns, width)
+    end = np.minimum.accumulate(end_or_max[:, ::-1], axis=1)[:, ::-1]
+
+    start = np.where(roads, start, width).astype(np.int32)
+    end = np.where(roads, end, -1).astype(np.int32)
+    return start, end
+
+_road_graph = None
+
+def get_road_graph():
+    """
+    Get the shared compressed graph of ROAD_NETWORK, building it on first use.
+
+    Returns:
+        CompressedRoadGraph: The compressed road graph.
+    """
+    global _road_graph
+    if _road_graph is None:
+        _road_graph = CompressedRoadGraph.from_roads(get_road_network())
+    return _road_graph
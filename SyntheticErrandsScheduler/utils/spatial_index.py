@@ -0,0 +1,192 @@
+import heapq
+from itertools import islice
+from SyntheticErrandsScheduler.config import SPATIAL_BUCKET_SIZE
+
+class SpatialIndex:
+    """
+    Uniform grid of buckets over located items, for nearest-neighbour candidate queries.
+
+    Each item (an errand or contractor, say) is stored in the bucket covering its
+    location. Queries visit square rings of buckets outward from the query point and
+    stop as soon as no unvisited bucket can hold a closer item, so they only touch the
+    neighbourhood of the query. Distances are Manhattan distances in grid cells, the
+    same metric as the road grid.
+    """
+
+    def __init__(self, bucket_size=SPATIAL_BUCKET_SIZE):
+        """
+        Args:
+            bucket_size (int): Width and height of each bucket in grid cells.
+        """
+        if bucket_size < 1:
+            raise ValueError(f"Invalid bucket size: {bucket_size}")
+        self.bucket_size = bucket_size
+        self._buckets = {}
+        self._positions = {}
+        self._min_bucket = None
+        self._max_bucket = None
+
+    @classmethod
+    def from_items(cls, items, location_of, bucket_size=SPATIAL_BUCKET_SIZE):
+        """
+        Build an index over a collection of items.
+
+        Args:
+            items (Iterable): The items to index.
+            location_of (callable): Function returning the Location of an item.
+            bucket_size (int): Width and height of each bucket in grid cells.
+
+        Returns:
+            SpatialIndex: The populated index.
+        """
+        index = cls(bucket_size)
+        for item in items:
+            index.insert(item, location_of(item))
+        return index
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, item):
+        return item in self._positions
+
+    def insert(self, item, location):
+        """
+        Add an item at a location, moving it if it is already indexed.
+
+        Args:
+            item: The item to add. Items are compared by their hash and equality.
+            location (Location): The item's location.
+        """
+        if item in self._positions:
+            self.remove(item)
+        key = (location.x // self.bucket_size, location.y // self.bucket_size)
+        self._buckets.setdefault(key, {})[item] = (location.x, location.y)
+        self._positions[item] = key
+        if self._min_bucket is None:
+            self._min_bucket = key
+            self._max_bucket = key
+        else:
+            self._min_bucket = (min(self._min_bucket[0], key[0]), min(self._min_bucket[1], key[1]))
+            self._max_bucket = (max(self._max_bucket[0], key[0]), max(self._max_bucket[1], key[1]))
+
+    def remove(self, item):
+        """
+        Remove an item from the index. Items that are not indexed are ignored.
+
+        Args:
+            item: The item to remove.
+        """
+        key = self._positions.pop(item, None)
+        if key is None:
+            return
+        bucket = self._buckets[key]
+        del bucket[item]
+        if not bucket:
+            del self._buckets[key]
+
+    def _ring(self, center, radius):
+        """Yield the non-empty buckets on the square ring at a bucket distance of radius."""
+        cx, cy = center
+        if radius == 0:
+            bucket = self._buckets.get(center)
+            if bucket:
+                yield bucket
+            return
+        for bx in range(cx - radius, cx + radius + 1):
+            for by in (cy - radius, cy + radius):
+                bucket = self._buckets.get((bx, by))
+                if bucket:
+                    yield bucket
+        for by in range(cy - radius + 1, cy + radius):
+            for bx in (cx - radius, cx + radius):
+                bucket = self._buckets.get((bx, by))
+                if bucket:
+                    yield bucket
+
+    def _max_ring(self, center):
+        """Bucket distance from center to the farthest occupied bucket bound."""
+        if self._min_bucket is None:
+            return -1
+        return max(center[0] - self._min_bucket[0], self._max_bucket[0] - center[0],
+                   center[1] - self._min_bucket[1], self._max_bucket[1] - center[1])
+
+    def iter_nearest(self, location, predicate=None):
+        """
+        Iterate over items in order of distance from a location.
+
+        Rings of buckets are only scanned as the iteration reaches them, so stopping
+        early costs no more than the neighbourhood visited. The index must not be
+        modified while the iteration is in progress.
+
+        Args:
+            location (Location): The query location.
+            predicate (callable, optional): Only items for which this returns True are
+                yielded.
+
+        Yields:
+            tuple: (distance, item) pairs, nearest first.
+        """
+        x, y = location.x, location.y
+        size = self.bucket_size
+        center = (x // size, y // size)
+        heap = []
+        sequence = 0
+
+        for radius in range(self._max_ring(center) + 1):
+            for bucket in self._ring(center, radius):
+                for item, (ix, iy) in bucket.items():
+                    if predicate is None or predicate(item):
+                        # The sequence number keeps the heap from ever comparing items
+                        heapq.heappush(heap, (abs(ix - x) + abs(iy - y), sequence, item))
+                        sequence += 1
+            # Every item in an unvisited ring is at least radius * size + 1 cells away
+            while heap and heap[0][0] <= radius * size:
+                distance, _, item = heapq.heappop(heap)
+                yield distance, item
+
+        while heap:
+            distance, _, item = heapq.heappop(heap)
+            yield distance, item
+
+    def nearest(self, location, k, predicate=None):
+        """
+        Find the k items nearest to a location.
+
+        Args:
+            location (Location): The query location.
+            k (int): The maximum number of items to return.
+            predicate (callable, optional): Only items for which this returns True are
+                considered.
+
+        Returns:
+            list: Up to k items, nearest first.
+        """
+        return [item for _, item in islice(self.iter_nearest(location, predicate), max(k, 0))]
+
+    def within_radius(self, location, radius):
+        """
+        Find every item within a Manhattan distance of a location.
+
+        Args:
+            location (Location): The query location.
+            radius (int): The maximum distance in grid cells.
+
+        Returns:
+            list: The items within the radius, nearest first.
+        """
+        x, y = location.x, location.y
+        size = self.bucket_size
+        center = (x // size, y // size)
+        last_ring = min(radius // size + 1, self._max_ring(center))
+        found = []
+
+        for ring in range(last_ring + 1):
+            for bucket in self._ring(center, ring):
+                for item, (ix, iy) in bucket.items():
+                    distance = abs(ix - x) + abs(iy - y)
+                    if distance <= radius:
+                        found.append((distance, len(found), item))
+
+        found.sort()
+        return [item for _, _, item in found]
@@ -1,10 +1,290 @@
 import math
-from SyntheticErrandsScheduler.config import GRID_SIZE, SPEED, ROAD_NETWORK
+from collections import OrderedDict
+import numpy as np
+from SyntheticErrandsScheduler.config import SPEED, ROUTING_MODE, TRAVEL_TIME_CACHE_SIZE, TRAFFIC_FACTORS, TRAFFIC_PERIODS
+from SyntheticErrandsScheduler.utils.distance_matrix import get_distance_matrix, UNREACHABLE
+from SyntheticErrandsScheduler.utils.pathfinding import get_astar_router, get_graph_router
+from SyntheticErrandsScheduler.utils.landmarks import get_landmark_router
 
-def calculate_travel_time(start_location, end_location):
+ROUTING_MODES = ('matrix', 'astar', 'landmarks')
+
+_routing_mode = ROUTING_MODE
+
+def set_routing_mode(mode):
+    """
+    Select how travel times are computed.
+
+    Args:
+        mode (str): 'matrix' to look up a precomputed all-pairs distance matrix,
+            'astar' to search on demand (for grids too large to precompute), or
+            'landmarks' to search on demand with landmark lower bounds (for very
+            large grids).
+    """
+    global _routing_mode
+    if mode not in ROUTING_MODES:
+        raise ValueError(f"Invalid routing mode: {mode}")
+    _routing_mode = mode
+
+def get_routing_mode():
+    return _routing_mode
+
+class TravelTimeCache:
+    """
+    Bounded least-recently-used cache of travel times keyed on location coordinates.
+    """
+
+    def __init__(self, maxsize=TRAVEL_TIME_CACHE_SIZE):
+        """
+        Args:
+            maxsize (int): The maximum number of entries to keep.
+        """
+        if maxsize < 1:
+            raise ValueError(f"Invalid cache size: {maxsize}")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, start_location, end_location, compute):
+        """
+        Get the cached travel time between two locations, computing it on a miss.
+
+        Args:
+            start_location (Location): The starting location.
+            end_location (Location): The ending location.
+            compute (callable): Function of (start_location, end_location) used on a miss.
+
+        Returns:
+            float: The travel time in minutes.
+        """
+        key = (start_location.x, start_location.y, end_location.x, end_location.y)
+        entries = self._entries
+        travel_time = entries.get(key)
+        if travel_time is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return travel_time
+
+        self.misses += 1
+        travel_time = compute(start_location, end_location)
+        entries[key] = travel_time
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return travel_time
+
+    def resize(self, maxsize):
+        """
+        Change the maximum size, evicting the least recently used entries if needed.
+
+        Args:
+            maxsize (int): The new maximum number of entries.
+        """
+        if maxsize < 1:
+            raise ValueError(f"Invalid cache size: {maxsize}")
+        self.maxsize = maxsize
+        while len(self._entries) > maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """
+        Get the cache statistics.
+
+        Returns:
+            dict: Hits, misses, evictions, hit rate, current size and maximum size.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+_travel_time_cache = TravelTimeCache()
+
+def get_travel_time_cache():
+    """
+    Get the shared cache used for searched travel times.
+
+    Returns:
+        TravelTimeCache: The travel time cache.
+    """
+    return _travel_time_cache
+
+MINUTES_PER_DAY = 24 * 60
+
+def build_traffic_factor_table(periods=TRAFFIC_PERIODS, factors=TRAFFIC_FACTORS):
+    """
+    Build a per-minute table of traffic factors for one day.
+
+    Args:
+        periods (list): (start minute, end minute, period name) tuples.
+        factors (dict): Traffic factor for each period name, including 'normal'.
+
+    Returns:
+        list: The traffic factor for every minute of the day.
+    """
+    table = [factors['normal']] * MINUTES_PER_DAY
+    for start, end, period in periods:
+        factor = factors[period]
+        for minute in range(max(0, start), min(end, MINUTES_PER_DAY)):
+            table[minute] = factor
+    return table
+
+_traffic_factor_table = build_traffic_factor_table()
+_traffic_factor_array = np.array(_traffic_factor_table)
+
+def traffic_factor(departure_time):
+    """
+    Get the traffic factor for a departure time.
+
+    Args:
+        departure_time (float): Departure time in minutes since midnight.
+
+    Returns:
+        float: The travel time multiplier for that time of day.
+    """
+    return _traffic_factor_table[int(departure_time) % MINUTES_PER_DAY]
+
+def traffic_factors(departure_times):
+    """
+    Get the traffic factors for an array of departure times.
+
+    Args:
+        departure_times (numpy.ndarray): Departure times in minutes since midnight.
+            Times that are not finite get the factor for midnight.
+
+    Returns:
+        numpy.ndarray: The travel time multiplier for every departure time.
+    """
+    departure_times = np.asarray(departure_times, dtype=float)
+    minutes = np.where(np.isfinite(departure_times), departure_times, 0).astype(np.int64)
+    return _traffic_factor_array[minutes % MINUTES_PER_DAY]
+
+def calculate_travel_time(start_location, end_location, departure_time=None):
+    """
+    Calculate the travel time between two locations.
+
+    In 'matrix' mode both locations' road cell ids are looked up in the precomputed
+    road distance matrix, and locations that are not on a road fall back to an A* search. In
+    'astar' and 'landmarks' mode every call runs a search. Searched travel times
+    are memoized in the shared travel time cache.
+
+    Args:
+        start_location (Location): The starting location.
+        end_location (Location): The ending location.
+        departure_time (float, optional): Departure time in minutes since midnight. If
+            given, the travel time is scaled by the traffic factor for that time.
+
+    Returns:
+        float: The travel time in minutes.
+    """
+    travel_time = _base_travel_time(start_location, end_location)
+    if departure_time is None:
+        return travel_time
+    return travel_time * traffic_factor(departure_time)
+
+def _base_travel_time(start_location, end_location):
+    """Travel time between two locations under normal traffic."""
+    if _routing_mode == 'astar':
+        return _travel_time_cache.get(start_location, end_location, astar_travel_time)
+    if _routing_mode == 'landmarks':
+        return _travel_time_cache.get(start_location, end_location, landmark_travel_time)
+
+    start_cell = start_location.road_id
+    end_cell = end_location.road_id
+    if start_cell < 0 or end_cell < 0:
+        return _travel_time_cache.get(start_location, end_location, astar_travel_time)
+
+    distance = get_distance_matrix().distance(start_cell, end_cell)
+    if distance == UNREACHABLE:
+        return float('inf')
+    return steps_to_minutes(distance)
+
+def steps_to_minutes(distance):
+    """
+    Convert a road distance in grid steps to travel time in minutes.
+
+    The path length counts both endpoints, matching the original A* implementation.
+
+    Args:
+        distance (int): The number of road steps between two locations.
+
+    Returns:
+        float: The travel time in minutes.
+    """
+    return (distance + 1) / SPEED * 60
+
+def travel_time_matrix(sources, targets, departure_time=None):
+    """
+    Calculate travel times from every source location to every target location.
+
+    In 'matrix' mode the times are gathered from the distance matrix with a few
+    fancy-indexing operations; pairs involving an off-road location, and every pair
+    in the on-demand modes, are computed one at a time.
+
+    Args:
+        sources (Sequence[Location]): The starting locations.
+        targets (Sequence[Location]): The ending locations.
+        departure_time (float, optional): Departure time in minutes since midnight, used
+            to scale every travel time by the traffic factor for that time.
+
+    Returns:
+        numpy.ndarray: Array of shape (len(sources), len(targets)) with travel times in minutes.
+    """
+    sources = list(sources)
+    targets = list(targets)
+    times = np.empty((len(sources), len(targets)), dtype=float)
+    if not sources or not targets:
+        return times
+
+    if _routing_mode != 'matrix':
+        for i, source in enumerate(sources):
+            for j, target in enumerate(targets):
+                times[i, j] = calculate_travel_time(source, target, departure_time)
+        return times
+
+    matrix = get_distance_matrix()
+    source_cells = np.array([loc.road_id for loc in sources], dtype=np.int64)
+    target_cells = np.array([loc.road_id for loc in targets], dtype=np.int64)
+
+    distances = matrix.cell_distances(np.maximum(source_cells, 0), np.maximum(target_cells, 0))
+    times[:] = steps_to_minutes(distances.astype(float))
+    times[distances == UNREACHABLE] = float('inf')
+
+    for i in np.flatnonzero(source_cells < 0):
+        for j in range(len(targets)):
+            times[i, j] = _base_travel_time(sources[i], targets[j])
+    for j in np.flatnonzero(target_cells < 0):
+        for i in range(len(sources)):
+            times[i, j] = _base_travel_time(sources[i], targets[j])
+
+    if departure_time is not None:
+        times *= traffic_factor(departure_time)
+    return times
+
+def astar_travel_time(start_location, end_location):
     """
     Calculate the travel time between two locations using A* pathfinding algorithm.
 
+    Road locations are searched on the compressed road graph; a start location that
+    is not on a road is searched on the full grid.
+
     Args:
         start_location (Location): The starting location.
         end_location (Location): The ending location.
@@ -12,52 +292,39 @@ def calculate_travel_time(start_location, end_location):
     Returns:
         float: The travel time in minutes.
     """
-    def heuristic(a, b):
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-    def get_neighbors(node):
-        x, y = node
-        neighbors = []
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and ROAD_NETWORK[ny, nx]:
-                neighbors.append((nx, ny))
-        return neighbors
-
-    start = (start_location.x, start_location.y)
-    goal = (end_location.x, end_location.y)
-
-    open_set = {start}
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
-
-    while open_set:
-        current = min(open_set, key=lambda x: f_score[x])
-
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            path.reverse()
-            return len(path) / SPEED * 60  # Convert to minutes
-
-        open_set.remove(current)
-
-        for neighbor in get_neighbors(current):
-            tentative_g_score = g_score[current] + 1
-
-            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = g_score[neighbor] + heuristic(neighbor, goal)
-                if neighbor not in open_set:
-                    open_set.add(neighbor)
-
-    # If we get here, there's no path
-    return float('inf')
+    source = start_location.road_id
+    target = end_location.road_id
+    if source >= 0 and target >= 0:
+        distance = get_graph_router().distance(source, target)
+    else:
+        distance = get_astar_router().distance((start_location.x, start_location.y),
+                                               (end_location.x, end_location.y))
+    if distance < 0:
+        return float('inf')
+    return steps_to_minutes(distance)
+
+def landmark_travel_time(start_location, end_location):
+    """
+    Calculate the travel time between two locations using A* with landmark bounds.
+
+    Locations that are not on a road fall back to the plain A* search.
+
+    Args:
+        start_location (Location): The starting location.
+        end_location (Location): The ending location.
+
+    Returns:
+        float: The travel time in minutes.
+    """
+    source = start_location.road_id
+    target = end_location.road_id
+    if source < 0 or target < 0:
+        return astar_travel_time(start_location, end_location)
+
+    distance = get_landmark_router().distance(source, target)
+    if distance < 0:
+        return float('inf')
+    return steps_to_minutes(distance)
 
 def manhattan_distance(start_location, end_location):
     """
@@ -0,0 +1,39 @@
+import statistics
+import subprocess
+import sys
+import time
+
+HEADLESS_MODULE = "SyntheticErrandsScheduler.main"
+HEAVY_MODULES = ("matplotlib", "tkinter", "SyntheticErrandsScheduler.gui")
+
+def import_time_us(module):
+    """Cumulative import time of a module in a fresh interpreter, as reported by -X importtime."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise RuntimeError(f"No import time reported for {module}")
+
+def loaded_heavy_modules(module):
+    """Heavy modules pulled in by importing a module in a fresh interpreter."""
+    check = (f"import sys, {module}; "
+             f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+def main(repeats=7):
+    times = [import_time_us(HEADLESS_MODULE) / 1000 for _ in range(repeats)]
+    print(f"import {HEADLESS_MODULE}: {statistics.median(times):.1f} ms median "
+          f"(min {min(times):.1f} ms over {repeats} runs)")
+    heavy = loaded_heavy_modules(HEADLESS_MODULE)
+    print(f"Heavy modules loaded: {', '.join(heavy) if heavy else 'none'}")
+
+    from SyntheticErrandsScheduler.config import create_busyville_map, create_road_network
+    start_time = time.perf_counter()
+    create_road_network(create_busyville_map())
+    print(f"Map and road network construction: {(time.perf_counter() - start_time) * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
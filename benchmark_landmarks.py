@@ -0,0 +1,66 @@
+import random
+import time
+import numpy as np
+from SyntheticErrandsScheduler.config import GRID_SIZE, create_busyville_map, create_road_network
+from SyntheticErrandsScheduler.utils.road_graph import CompressedRoadGraph
+from SyntheticErrandsScheduler.utils.landmarks import LandmarkRouter
+from SyntheticErrandsScheduler.utils.pathfinding import AStarRouter
+
+def scaled_busyville_map(size):
+    """Busyville's districts stretched over a larger grid, so parks and industry keep their share."""
+    scale = size // GRID_SIZE
+    return np.kron(create_busyville_map(), np.ones((scale, scale), dtype=int))
+
+def random_road_cells(graph, count, rng):
+    cells = [rng.randrange(graph.num_road_cells) for _ in range(count)]
+    return [(int(graph.cell_xs[cell]), int(graph.cell_ys[cell])) for cell in cells]
+
+def main(grid_size=2000, num_queries=500, seed=0):
+    rng = random.Random(seed)
+
+    start_time = time.perf_counter()
+    roads = create_road_network(scaled_busyville_map(grid_size))
+    print(f"Road network ({grid_size}x{grid_size}): {time.perf_counter() - start_time:.2f} s")
+
+    start_time = time.perf_counter()
+    graph = CompressedRoadGraph.from_roads(roads)
+    print(f"Compressed road graph ({graph.num_road_cells} road cells -> {graph.num_nodes} nodes, "
+          f"{len(graph.indices) // 2} edges): {time.perf_counter() - start_time:.2f} s")
+
+    start_time = time.perf_counter()
+    router = LandmarkRouter(graph)
+    print(f"Landmark preprocessing ({len(router.landmarks)} landmarks): {time.perf_counter() - start_time:.2f} s")
+
+    pairs = list(zip(random_road_cells(graph, num_queries, rng), random_road_cells(graph, num_queries, rng)))
+
+    latencies = []
+    landmark_results = []
+    for start, goal in pairs:
+        start_time = time.perf_counter()
+        landmark_results.append(router.cell_distance(start, goal))
+        latencies.append(time.perf_counter() - start_time)
+    latencies = np.array(latencies) * 1000
+    print(f"Landmark router: {latencies.mean():.3f} ms/query mean, {np.median(latencies):.3f} ms median, "
+          f"{np.percentile(latencies, 99):.3f} ms p99")
+
+    # Monotone paths are exactly as long as the Manhattan distance, so only the rest need the ALT search
+    corridor = np.array([router.corridors.monotone_path_exists(start, goal) for start, goal in pairs])
+    monotone = np.array([distance == abs(start[0] - goal[0]) + abs(start[1] - goal[1])
+                         for (start, goal), distance in zip(pairs, landmark_results)])
+    for label, mask in (("corridor check", corridor), ("monotone walk", monotone & ~corridor),
+                        ("ALT search", ~monotone)):
+        if mask.any():
+            print(f"  {label + ':':16s}{mask.sum():4d} queries, {latencies[mask].mean():.3f} ms/query mean, "
+                  f"{np.percentile(latencies[mask], 99):.3f} ms p99")
+
+    astar = AStarRouter(roads)
+    start_time = time.perf_counter()
+    astar_results = [astar.distance(start, goal) for start, goal in pairs]
+    astar_elapsed = time.perf_counter() - start_time
+    print(f"Heap A*:         {astar_elapsed * 1000 / num_queries:.3f} ms/query mean")
+
+    mismatches = sum(1 for a, b in zip(landmark_results, astar_results) if a != b)
+    print(f"Mismatched distances: {mismatches}")
+
+if __name__ == "__main__":
+    main()
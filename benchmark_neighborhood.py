@@ -0,0 +1,84 @@
+import random
+import time
+from SyntheticErrandsScheduler.models import Location, Errand, Contractor, create_schedule
+from SyntheticErrandsScheduler.algorithms.batch_evaluation import evaluate_insertions
+from SyntheticErrandsScheduler.algorithms.initial_solution import generate_initial_solution
+from SyntheticErrandsScheduler.algorithms.local_search import calculate_assignment_score, local_search
+from SyntheticErrandsScheduler.algorithms.neighborhood import Neighborhood
+from SyntheticErrandsScheduler.config import ERRANDS, GRID_SIZE, WORK_START, WORK_END
+
+def make_schedule(num_errands, num_contractors, rng):
+    errands = [Errand(i, rng.choice(list(ERRANDS)),
+                      Location(rng.randint(0, GRID_SIZE - 1), rng.randint(0, GRID_SIZE - 1)),
+                      days_since_request=rng.randint(0, 7))
+               for i in range(num_errands)]
+    contractors = [Contractor(i, Location(rng.randint(0, GRID_SIZE - 1), rng.randint(0, GRID_SIZE - 1)))
+                   for i in range(num_contractors)]
+    schedule, _ = generate_initial_solution(create_schedule(contractors, errands))
+    return schedule
+
+def scalar_best(schedule, errand):
+    """The best insertion found one candidate at a time, as try_relocate does."""
+    best = None
+    for day in range(schedule.num_days):
+        for contractor in schedule.contractors:
+            for start_time in range(WORK_START, WORK_END - errand.service_time + 1, 15):
+                if schedule.can_assign_errand(contractor, errand, day, start_time):
+                    score = calculate_assignment_score(schedule, day, errand, contractor, start_time)
+                    if best is None or score > best[3]:
+                        best = (day, contractor, start_time, score)
+    return best
+
+def compare_local_search(num_errands, num_contractors, seed, max_time):
+    """Full neighbourhoods against granular candidate lists with don't-look bits."""
+    settings = {
+        'full': {'neighbors': None, 'dont_look_bits': False},
+        'granular': {},
+    }
+    for name, options in settings.items():
+        schedule = make_schedule(num_errands, num_contractors, random.Random(seed))
+        initial_score = schedule.score()
+        neighborhood = Neighborhood(schedule, **options)
+        start_time = time.perf_counter()
+        local_search(schedule, max_time=max_time, neighborhood=neighborhood)
+        elapsed = time.perf_counter() - start_time
+        print(f"{name:>8}: score {initial_score:.2f} -> {schedule.score():.2f}, "
+              f"{neighborhood.evaluations} move evaluations, {elapsed:.2f} s")
+
+def main(num_errands=150, num_contractors=5, num_moves=40, seed=0, max_time=20):
+    rng = random.Random(seed)
+    schedule = make_schedule(num_errands, num_contractors, rng)
+    moves = [(day, assignment) for day in range(schedule.num_days) for assignment in schedule.assignments[day]]
+    moves = rng.sample(moves, min(num_moves, len(moves)))
+
+    timings = {'scalar': 0.0, 'batched': 0.0}
+    mismatches = 0
+    for day, assignment in moves:
+        schedule.journal.checkpoint()
+        schedule.remove_assignment(day, assignment)
+        errand = assignment[0]
+
+        start_time = time.perf_counter()
+        expected = scalar_best(schedule, errand)
+        timings['scalar'] += time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        found = evaluate_insertions(schedule, errand).best()
+        timings['batched'] += time.perf_counter() - start_time
+
+        if (expected is None) != (found is None) or (expected and abs(expected[3] - found[3]) > 1e-9):
+            mismatches += 1
+        schedule.journal.rollback()
+
+    cells = schedule.num_days * num_contractors
+    print(f"{len(moves)} relocations over {cells} contractor-days with {len(schedule.completed_errands)} assignments")
+    for name, elapsed in timings.items():
+        print(f"{name:>8}: {elapsed * 1000 / len(moves):.3f} ms per errand")
+    print(f"Speedup: {timings['scalar'] / timings['batched']:.1f}x")
+    print(f"Mismatched best scores: {mismatches}")
+
+    print(f"Local search (stopping after {max_time} s):")
+    compare_local_search(num_errands, num_contractors, seed, max_time)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import random
+import time
+from SyntheticErrandsScheduler.models.location import Location
+from SyntheticErrandsScheduler.config import GRID_SIZE, SPEED, ROAD_NETWORK
+from SyntheticErrandsScheduler.utils.pathfinding import get_astar_router
+from SyntheticErrandsScheduler.utils.travel_time import steps_to_minutes
+
+def original_astar_travel_time(start_location, end_location):
+    """The set-based A* search that calculate_travel_time used before the heap router."""
+    def heuristic(a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def get_neighbors(node):
+        x, y = node
+        neighbors = []
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and ROAD_NETWORK[ny, nx]:
+                neighbors.append((nx, ny))
+        return neighbors
+
+    start = (start_location.x, start_location.y)
+    goal = (end_location.x, end_location.y)
+
+    open_set = {start}
+    came_from = {}
+    g_score = {start: 0}
+    f_score = {start: heuristic(start, goal)}
+
+    while open_set:
+        current = min(open_set, key=lambda x: f_score[x])
+
+        if current == goal:
+            path = []
+            while current in came_from:
+                path.append(current)
+                current = came_from[current]
+            path.append(start)
+            path.reverse()
+            return len(path) / SPEED * 60
+
+        open_set.remove(current)
+
+        for neighbor in get_neighbors(current):
+            tentative_g_score = g_score[current] + 1
+
+            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                f_score[neighbor] = g_score[neighbor] + heuristic(neighbor, goal)
+                if neighbor not in open_set:
+                    open_set.add(neighbor)
+
+    return float('inf')
+
+def heap_astar_travel_time(start_location, end_location):
+    """
+    Travel time from the heap AStarRouter on the full grid.
+
+    astar_travel_time sends road locations to the compressed graph router, so the
+    benchmark calls the grid router directly.
+    """
+    distance = get_astar_router().distance((start_location.x, start_location.y),
+                                           (end_location.x, end_location.y))
+    return float('inf') if distance < 0 else steps_to_minutes(distance)
+
+def time_queries(function, pairs):
+    start_time = time.perf_counter()
+    results = [function(start, end) for start, end in pairs]
+    return results, time.perf_counter() - start_time
+
+def main(num_pairs=300, seed=0):
+    rng = random.Random(seed)
+    pairs = [
+        (Location(rng.randint(0, GRID_SIZE-1), rng.randint(0, GRID_SIZE-1)),
+         Location(rng.randint(0, GRID_SIZE-1), rng.randint(0, GRID_SIZE-1)))
+        for _ in range(num_pairs)
+    ]
+
+    get_astar_router()  # Allocate the search buffers outside the timed loop
+    original_results, original_elapsed = time_queries(original_astar_travel_time, pairs)
+    heap_results, heap_elapsed = time_queries(heap_astar_travel_time, pairs)
+
+    mismatches = sum(1 for a, b in zip(original_results, heap_results) if a != b)
+    print(f"{num_pairs} queries on a {GRID_SIZE}x{GRID_SIZE} grid")
+    print(f"Original A*: {original_elapsed * 1000 / num_pairs:.3f} ms/query")
+    print(f"Heap A*:     {heap_elapsed * 1000 / num_pairs:.3f} ms/query")
+    print(f"Speedup:     {original_elapsed / heap_elapsed:.1f}x")
+    print(f"Mismatched distances: {mismatches}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import random
+from functools import partial
+import pytest
+from SyntheticErrandsScheduler.models import Location, Errand, Contractor, create_schedule
+from SyntheticErrandsScheduler.config import ERRANDS, WORK_START
+
+BACKENDS = ('dict', 'array')
+
+def random_schedule(backend='array', num_errands=30, num_contractors=3, seed=0, errand_types=None,
+                    predecessors=(), assign=0, days=range(3), window=300, append=False):
+    """
+    Build a schedule of random errands and contractors on a 100 x 100 grid.
+
+    Args:
+        backend (str): The schedule backend, as for create_schedule.
+        num_errands (int): Number of errands.
+        num_contractors (int): Number of contractors.
+        seed (int): Seed of the random generator.
+        errand_types (list, optional): Errand types to choose from. Defaults to every type.
+        predecessors (iterable): (successor, predecessor) pairs of errand indices.
+        assign (int): How many of the first errands to try to assign, each to a random
+            contractor on a random day out of days. Errands that do not fit stay unassigned.
+        days (Sequence[int]): The days errands are assigned on.
+        window (int): Errands start a random multiple of 15 minutes below window after
+            WORK_START, or after the end of the contractor-day if append is True.
+        append (bool): Whether errands are appended to their contractor-day.
+
+    Returns:
+        Schedule: The schedule.
+    """
+    rng = random.Random(seed)
+    errand_types = list(errand_types or ERRANDS)
+    errands = [Errand(i, rng.choice(errand_types), Location(rng.randint(0, 99), rng.randint(0, 99)),
+                      days_since_request=rng.randint(0, 7))
+               for i in range(num_errands)]
+    for successor, predecessor in predecessors:
+        errands[successor].predecessors.add(errands[predecessor])
+    contractors = [Contractor(i, Location(rng.randint(0, 99), rng.randint(0, 99))) for i in range(num_contractors)]
+    schedule = create_schedule(contractors, errands, backend=backend)
+    for errand in errands[:assign]:
+        contractor, day = rng.choice(contractors), rng.choice(days)
+        start_time = schedule.timelines.get(contractor, day).end_time(WORK_START) if append else WORK_START
+        schedule.assign_errand(contractor, errand, day, start_time + rng.randrange(0, window, 15))
+    return schedule
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    """Each schedule backend in turn. Tests pin one with @pytest.mark.parametrize('backend', [...])."""
+    return request.param
+
+@pytest.fixture
+def make_schedule(backend):
+    """random_schedule on the backend under test; pass backend= to build on another one."""
+    return partial(random_schedule, backend=backend)
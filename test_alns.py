@@ -0,0 +1,71 @@
+import random
+import pytest
+from SyntheticErrandsScheduler.algorithms import ALNS, modified_iterated_local_search
+from SyntheticErrandsScheduler.algorithms.alns import DESTROY_OPERATORS, REPAIR_OPERATORS
+
+# A chain 3 -> 7 -> 11 -> 12, with 20 also waiting on 3
+SCHEDULE = dict(seed=8, predecessors=[(7, 3), (11, 7), (12, 11), (20, 3)], assign=30, days=range(4), window=480)
+
+def test_registry_holds_operators():
+    assert {'random', 'shaw', 'worst', 'route'} <= set(DESTROY_OPERATORS)
+    assert {'greedy', 'regret-2', 'regret-3'} <= set(REPAIR_OPERATORS)
+
+def assert_precedence_holds(schedule):
+    for errand in schedule.completed_errands:
+        assert all(predecessor in schedule.completed_errands for predecessor in errand.predecessors)
+
+def test_destroy_and_repair_operators(make_schedule):
+    random.seed(4)
+    for destroy in DESTROY_OPERATORS.values():
+        schedule = make_schedule(**SCHEDULE)
+        assigned = len(schedule.completed_errands)
+        destroy(schedule, 5)
+        assert assigned - len(schedule.completed_errands) >= 5
+        assert_precedence_holds(schedule)
+
+        for repair in REPAIR_OPERATORS.values():
+            repaired = schedule.copy()
+            repair(repaired)
+            assert len(repaired.completed_errands) > len(schedule.completed_errands)
+            assert_precedence_holds(repaired)
+
+def test_destroy_removes_assigned_successors(make_schedule):
+    random.seed(7)
+    cascaded = 0
+    for destroy in DESTROY_OPERATORS.values():
+        for _ in range(10):
+            schedule = make_schedule(**SCHEDULE)
+            head = schedule.errands[3]
+            assert head in schedule.completed_errands
+            dependents = {errand for errand in schedule.completed_errands if errand.id in (7, 11, 12, 20)}
+            destroy(schedule, 8)
+            assert_precedence_holds(schedule)
+            if head not in schedule.completed_errands:
+                assert not dependents & schedule.completed_errands
+                cascaded += bool(dependents)
+    assert cascaded > 0
+
+def test_weights_follow_gain_per_cpu_second(make_schedule):
+    random.seed(5)
+    alns = ALNS(destroy_operators=['random', 'route'], repair_operators=['greedy'], segment_length=10)
+    schedule = make_schedule(**SCHEDULE)
+    for _ in range(30):
+        alns.perturb(schedule)
+        destroy_name = alns._last[0][0]
+        alns.update(10.0 if destroy_name == 'route' else 0.0)
+
+    stats = alns.operator_stats()
+    assert stats['route']['weight'] > stats['random']['weight']
+    assert stats['random']['weight'] >= alns.min_weight
+    assert stats['route']['calls'] + stats['random']['calls'] == stats['greedy']['calls'] == 30
+    assert stats['random']['improvements'] == 0
+
+def test_mils_with_alns(make_schedule):
+    random.seed(6)
+    alns = ALNS()
+    solution = modified_iterated_local_search(make_schedule(**SCHEDULE), max_iterations=3, max_time=5, perturbation=alns)
+    assert solution.completed_errands
+    assert sum(stats['calls'] for stats in alns.operator_stats().values()) > 0
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
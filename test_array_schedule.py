@@ -0,0 +1,67 @@
+import pytest
+from SyntheticErrandsScheduler.config import WORK_START
+
+# Every test here builds on the array backend, comparing with the dict one where needed
+pytestmark = pytest.mark.parametrize('backend', ['array'])
+
+def fill(schedule):
+    for day in range(2):
+        for contractor in schedule.contractors:
+            contractor.reset_day()
+            start_time = WORK_START
+            for errand in sorted(schedule.unassigned_errands, key=lambda e: e.id)[:3]:
+                schedule.assign_errand(contractor, errand, day, start_time)
+                start_time += 120
+
+def test_matches_dict_schedule(make_schedule):
+    dict_schedule, array_schedule = make_schedule(backend='dict', seed=5), make_schedule(seed=5)
+    fill(dict_schedule)
+    fill(array_schedule)
+
+    assert array_schedule.calculate_total_profit() == dict_schedule.calculate_total_profit()
+    assert array_schedule.calculate_sla_compliance() == dict_schedule.calculate_sla_compliance()
+    assert array_schedule.calculate_resource_utilization() == dict_schedule.calculate_resource_utilization()
+    assert set(array_schedule.unassigned_errands) == dict_schedule.unassigned_errands
+    assert set(array_schedule.completed_errands) == dict_schedule.completed_errands
+    for day in range(array_schedule.num_days):
+        assert array_schedule.assignments[day] == dict_schedule.assignments[day]
+    for contractor in array_schedule.contractors:
+        assert (array_schedule.get_contractor_schedule(contractor.id) ==
+                dict_schedule.get_contractor_schedule(contractor.id))
+
+def test_copy_is_independent(make_schedule):
+    schedule = make_schedule(seed=5)
+    fill(schedule)
+    profit = schedule.calculate_total_profit()
+    errand, contractor, start_time = schedule.assignments[0][0]
+
+    clone = schedule.copy()
+    clone.remove_assignment(0, (errand, contractor, start_time))
+
+    assert errand in clone.unassigned_errands and errand not in clone.completed_errands
+    assert clone.calculate_total_profit() == profit - errand.charge
+    assert (errand, start_time) not in contractor.schedule[0]
+
+    # Reading the original leaves the shared contractors with the clone's state
+    assert schedule.is_errand_assigned(errand)
+    assert schedule.calculate_total_profit() == profit
+    assert (errand, contractor, start_time) in schedule.assignments[0]
+    assert (errand, start_time) not in contractor.schedule[0]
+
+    # Syncing the original restores them
+    schedule.sync_contractors()
+    assert (errand, start_time) in contractor.schedule[0]
+
+def test_remove_keeps_assignment_order(make_schedule):
+    schedule = make_schedule(seed=5)
+    fill(schedule)
+    expected = schedule.assignments[1]
+    schedule.remove_assignment(0, schedule.assignments[0][1])
+
+    assert schedule.assignments[1] == expected
+    assignment = schedule.assignments[0][0]
+    schedule.remove_assignment(0, assignment)
+    assert assignment not in schedule.assignments[0]
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from SyntheticErrandsScheduler.algorithms.batch_evaluation import evaluate_insertions, evaluate_route_insertions
+from SyntheticErrandsScheduler.algorithms.local_search import calculate_assignment_score, relocate_errand
+from SyntheticErrandsScheduler.config import MAX_DAYS
+
+@pytest.fixture
+def schedule(make_schedule):
+    return make_schedule(num_errands=40, seed=11, assign=30, days=(0, 1, MAX_DAYS - 1), window=480)
+
+def test_grid_matches_scalar_checks(schedule):
+    for errand in sorted(schedule.unassigned_errands, key=lambda e: e.id)[:4]:
+        grid = evaluate_insertions(schedule, errand, days=[0, 1, 5, MAX_DAYS - 1])
+        for d, day in enumerate(grid.days):
+            for c, contractor in enumerate(grid.contractors):
+                for s, slot in enumerate(grid.slots):
+                    slot = int(slot)
+                    assert grid.feasible[d, c, s] == schedule.can_assign_errand(contractor, errand, int(day), slot)
+                    expected = calculate_assignment_score(schedule, int(day), errand, contractor, slot)
+                    assert abs(grid.scores[d, c, s] - expected) < 1e-9
+
+def test_best_is_highest_feasible_score(schedule):
+    errand = min(schedule.unassigned_errands, key=lambda e: e.id)
+    grid = evaluate_insertions(schedule, errand)
+    day, contractor, start_time, score = grid.best()
+    assert score == grid.scores[grid.feasible].max()
+    assert schedule.assign_errand(contractor, errand, day, start_time)
+
+    assert evaluate_insertions(schedule, errand).best() is None
+    assert grid.best(np.zeros(grid.feasible.shape, dtype=bool)) is None
+
+def test_route_insertions_match_grids(schedule):
+    errands = sorted(schedule.unassigned_errands, key=lambda e: e.id) + [schedule.errands[0]]
+    for day in (0, 1, MAX_DAYS - 1):
+        for contractor in schedule.contractors:
+            feasible = evaluate_route_insertions(schedule, errands, day, contractor)
+            assert feasible.any()
+            for errand, row in zip(errands, feasible):
+                grid = evaluate_insertions(schedule, errand, days=[day], contractors=[contractor])
+                assert np.array_equal(row[:len(grid.slots)], grid.feasible[0, 0])
+                assert not row[len(grid.slots):].any()
+
+def test_relocate_errand_moves_one_errand(schedule):
+    before = {errand: (day, contractor) for day in range(MAX_DAYS)
+              for errand, contractor, _ in schedule.assignments[day]}
+    assert relocate_errand(schedule)
+    after = {errand: (day, contractor) for day in range(MAX_DAYS)
+             for errand, contractor, _ in schedule.assignments[day]}
+    assert set(after) == set(before)
+    assert sum(1 for errand in before if before[errand] != after[errand]) == 1
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,30 @@
+import json
+import numpy as np
+from SyntheticErrandsScheduler.config import create_busyville_map, create_road_network
+from SyntheticErrandsScheduler.utils.distance_matrix import load_distance_matrix, distance_matrix_paths
+
+def small_road_network():
+    return create_road_network(create_busyville_map(30))
+
+def test_matrix_is_cached_and_memory_mapped(tmp_path):
+    roads = small_road_network()
+    built = load_distance_matrix(roads, cache_dir=str(tmp_path))
+    loaded = load_distance_matrix(roads, cache_dir=str(tmp_path))
+
+    assert isinstance(loaded.distances, np.memmap)
+    assert np.array_equal(np.asarray(built.distances), np.asarray(loaded.distances))
+
+def test_stale_matrix_is_rebuilt(tmp_path):
+    roads = small_road_network()
+    expected = np.array(load_distance_matrix(roads, cache_dir=None).distances)
+    matrix_path, metadata_path, _ = distance_matrix_paths(roads, str(tmp_path))
+
+    load_distance_matrix(roads, cache_dir=str(tmp_path))
+    with open(metadata_path, 'w') as f:
+        json.dump({"road_hash": "stale", "num_nodes": len(expected)}, f)
+    np.save(matrix_path, np.zeros_like(expected))
+
+    rebuilt = load_distance_matrix(roads, cache_dir=str(tmp_path))
+    assert np.array_equal(np.asarray(rebuilt.distances), expected)
+    with open(metadata_path) as f:
+        assert json.load(f)["road_hash"] != "stale"
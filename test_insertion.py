@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from SyntheticErrandsScheduler.algorithms.batch_evaluation import evaluate_insertions
+from SyntheticErrandsScheduler.algorithms.insertion import InsertionCache, regret_insertion
+from SyntheticErrandsScheduler.algorithms.perturbation import reinsert_unassigned_errands
+
+# Errand 9 waits on errand 20, which is left unassigned
+SCHEDULE = dict(seed=11, predecessors=[(9, 20)], assign=15, days=range(4), window=480)
+
+def assert_matches_fresh_grids(cache, schedule):
+    scores = cache.scores()
+    for errand in schedule.unassigned_errands:
+        grid = evaluate_insertions(schedule, errand, contractors=cache.contractors)
+        if errand in cache.waiting:
+            assert errand not in cache
+            continue
+        row, width = cache.errands.index(errand), len(grid.slots)
+        assert np.array_equal(cache.slots[:width], grid.slots)
+        assert np.array_equal(cache.feasible[row, :, :, :width], grid.feasible)
+        assert not cache.feasible[row, :, :, width:].any()
+        assert np.allclose(np.where(grid.feasible, scores[row, :, :, :width], 0),
+                           np.where(grid.feasible, grid.scores, 0))
+
+def test_cache_stays_equal_to_fresh_evaluation(make_schedule):
+    schedule = make_schedule(**SCHEDULE)
+    cache = InsertionCache(schedule)
+    assert cache.waiting == {schedule.errands[9]}
+    assert_matches_fresh_grids(cache, schedule)
+    for _ in range(6):
+        errand, (day, contractor, start_time, _) = cache.highest_regret(2)
+        assert schedule.assign_errand(contractor, errand, day, start_time)
+        cache.inserted(errand, contractor, day)
+        assert_matches_fresh_grids(cache, schedule)
+
+    # Inserting errand 20 lets errand 9 join the cache
+    predecessor = schedule.errands[20]
+    day, contractor, start_time, _ = cache.best_insertion(predecessor)
+    assert schedule.assign_errand(contractor, predecessor, day, start_time)
+    cache.inserted(predecessor, contractor, day)
+    assert not cache.waiting and schedule.errands[9] in cache
+    assert_matches_fresh_grids(cache, schedule)
+
+def test_highest_regret_prefers_errand_with_one_option(make_schedule):
+    schedule = make_schedule(**SCHEDULE)
+    cache = InsertionCache(schedule)
+    lonely = cache.errands[0]
+    d, c, s = map(int, np.argwhere(cache.feasible[0])[0])
+    cache.feasible[0] = False
+    cache.feasible[0, d, c, s] = True
+    errand, (day, contractor, start_time, _) = cache.highest_regret(2)
+    assert errand is lonely
+    assert (day, contractor, start_time) == (d, cache.contractors[c], int(cache.slots[s]))
+
+def test_highest_regret_skips_errands_without_a_feasible_slot(make_schedule):
+    schedule = make_schedule(**SCHEDULE)
+    cache = InsertionCache(schedule)
+    stuck = cache.errands[0]
+    cache.feasible[0] = False
+    errand, _ = cache.highest_regret(2)
+    assert errand is not stuck and stuck in cache
+    assert cache.best_insertion(stuck) is None
+
+    # They stay in the cache, but there is nothing to insert
+    cache.feasible[:] = False
+    assert cache.highest_regret(2) is None and stuck in cache
+
+def test_regret_insertion_inserts_errands(make_schedule):
+    schedule = make_schedule(**SCHEDULE)
+    unassigned = set(schedule.unassigned_errands)
+    inserted = regret_insertion(schedule, k=3)
+    assert inserted and set(inserted) <= unassigned
+    assert all(errand in schedule.completed_errands for errand in inserted)
+    for errand in schedule.completed_errands:
+        assert all(predecessor in schedule.completed_errands for predecessor in errand.predecessors)
+
+    schedule = make_schedule(**SCHEDULE)
+    assigned = len(schedule.completed_errands)
+    reinserted = reinsert_unassigned_errands(schedule)
+    assert len(schedule.completed_errands) == assigned + len(reinserted) > assigned
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
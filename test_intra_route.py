@@ -0,0 +1,94 @@
+import pytest
+from SyntheticErrandsScheduler.models import Location, Errand, Contractor, create_schedule
+from SyntheticErrandsScheduler.algorithms.intra_route import Route, optimize_routes
+from SyntheticErrandsScheduler.config import ERRANDS, WORK_START, WORK_END, MAX_DAYS
+from SyntheticErrandsScheduler.utils.travel_time import calculate_travel_time
+
+@pytest.fixture
+def schedule(make_schedule):
+    # Short errands appended to random contractor-days after a random wait
+    short_types = [name for name, errand_type in ERRANDS.items() if errand_type['time'] <= 60]
+    return make_schedule(num_errands=40, num_contractors=2, seed=5, errand_types=short_types,
+                         assign=40, append=True, window=30)
+
+def new_order(i, j, runs, n):
+    middle = [p for first, last in runs
+              for p in (range(first, last + 1) if first <= last else range(first, last - 1, -1))]
+    assert sorted(middle) == list(range(i, j + 1))
+    return list(range(i)) + middle + list(range(j + 1, n))
+
+def brute_force(route, order, i, j):
+    """Travel and feasibility of a new order, walking the whole route under normal traffic."""
+    nodes = [0] + [p + 1 for p in order]
+    travel = sum(route.travel[a][b] for a, b in zip(nodes, nodes[1:]))
+    time = route.ends[i - 1] if i > 0 else route.departure
+    for position in range(i, len(order)):
+        p = order[position]
+        arrival = time + route.travel[nodes[position]][p + 1]
+        if position > j:
+            # Errands after the move keep their start unless pushed later
+            arrival = max(arrival, route.starts[p])
+        time = arrival + route.ends[p] - route.starts[p]
+        if time > route.latest_end:
+            return travel, False
+    return travel, True
+
+def test_deltas_and_slack_match_brute_force(schedule):
+    checked, infeasible = 0, 0
+    for day in range(3):
+        for contractor in schedule.contractors:
+            route = Route(schedule, contractor, day)
+            if len(route) < 3:
+                continue
+            base = route.travel_minutes()
+            for moves in (route.two_opt_moves(), route.or_opt_moves()):
+                for i, j, runs in moves:
+                    delta, feasible = route.evaluate(i, j, runs)
+                    travel, expected = brute_force(route, new_order(i, j, runs, len(route)), i, j)
+                    assert abs(base + delta - travel) < 1e-6
+                    assert feasible == expected
+                    checked += 1
+                    infeasible += not feasible
+    assert checked > 100 and infeasible > 0
+
+def test_or_opt_untangles_a_zigzag(backend):
+    errands = [Errand(i, 'Delivery', Location(x, 50)) for i, x in enumerate((20, 80, 40, 60))]
+    contractor = Contractor(0, Location(0, 50))
+    schedule = create_schedule([contractor], errands, backend=backend)
+    time = WORK_START
+    for errand in errands:
+        assert schedule.assign_errand(contractor, errand, 0, time)
+        time = schedule.timelines.get(contractor, 0).end_time(WORK_START)
+    before = Route(schedule, contractor, 0).travel_minutes()
+
+    assert optimize_routes(schedule)
+    route = Route(schedule, contractor, 0)
+    assert route.travel_minutes() < before
+    assert [errand.location.x for errand in route.errands] == [20, 40, 60, 80]
+
+def test_optimize_routes_keeps_assignments_consistent(schedule):
+    score = schedule.score()
+    placement = {errand: (contractor, day) for day in range(schedule.num_days)
+                 for errand, contractor, _ in schedule.assignments[day]}
+    before = sum(Route(schedule, c, d).travel_minutes() for c in schedule.contractors for d in range(3))
+
+    assert optimize_routes(schedule)
+    after = sum(Route(schedule, c, d).travel_minutes() for c in schedule.contractors for d in range(3))
+    assert after < before
+    assert abs(schedule.score() - score) < 1e-9
+    assert {errand: (contractor, day) for day in range(schedule.num_days)
+            for errand, contractor, _ in schedule.assignments[day]} == placement
+
+    for day in range(3):
+        for contractor in schedule.contractors:
+            timeline = schedule.timelines.get(contractor, day)
+            for p in range(1, len(timeline)):
+                departure = timeline.ends[p - 1]
+                travel = calculate_travel_time(timeline.errands[p - 1].location, timeline.errands[p].location,
+                                               departure_time=departure)
+                assert timeline.starts[p] >= departure + travel - 1e-9
+            if day < MAX_DAYS - 1 and len(timeline):
+                assert timeline.ends[-1] <= WORK_END
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,85 @@
+import random
+import pytest
+from SyntheticErrandsScheduler.config import WORK_START, MAX_DAYS
+
+@pytest.fixture
+def schedule(make_schedule):
+    return make_schedule(seed=21, assign=15)
+
+def snapshot(schedule):
+    return ({day: schedule.assignments[day] for day in range(MAX_DAYS)},
+            set(schedule.unassigned_errands),
+            schedule.totals.profit, schedule.totals.assigned,
+            [({day: list(entries) for day, entries in contractor.schedule.items() if entries},
+              contractor.current_location)
+             for contractor in schedule.contractors])
+
+def random_moves(schedule, rng, count):
+    for _ in range(count):
+        day = rng.randrange(3)
+        assignments = schedule.assignments[day]
+        if assignments and rng.random() < 0.5:
+            schedule.remove_assignment(day, rng.choice(assignments))
+        elif schedule.unassigned_errands:
+            errand = rng.choice(sorted(schedule.unassigned_errands, key=lambda e: e.id))
+            schedule.assign_errand(rng.choice(schedule.contractors), errand, day, WORK_START + rng.randrange(0, 300, 15))
+
+def test_rollback_restores_schedule(schedule):
+    before = snapshot(schedule)
+    bonus = schedule.totals.early_completion_bonus
+    schedule.journal.checkpoint()
+    random_moves(schedule, random.Random(1), 40)
+    assert snapshot(schedule) != before
+    schedule.journal.rollback()
+
+    assert snapshot(schedule) == before
+    assert not schedule.journal.recording and len(schedule.journal) == 0
+    assert abs(schedule.totals.early_completion_bonus - bonus) < 1e-9
+
+def test_nested_commit_is_rolled_back_by_outer_checkpoint(schedule):
+    before = snapshot(schedule)
+    rng = random.Random(2)
+    schedule.journal.checkpoint()
+    random_moves(schedule, rng, 10)
+    schedule.journal.checkpoint()
+    random_moves(schedule, rng, 10)
+    schedule.journal.commit()
+    middle = snapshot(schedule)
+    schedule.journal.checkpoint()
+    random_moves(schedule, rng, 10)
+    schedule.journal.rollback()
+    assert snapshot(schedule) == middle
+
+    schedule.journal.rollback()
+    assert snapshot(schedule) == before
+
+def test_commit_keeps_moves(schedule):
+    schedule.journal.checkpoint()
+    random_moves(schedule, random.Random(3), 20)
+    after = snapshot(schedule)
+    schedule.journal.commit()
+    assert snapshot(schedule) == after
+    assert len(schedule.journal) == 0
+
+def test_copies_keep_their_own_contractor_state(schedule):
+    before = snapshot(schedule)
+    clone = schedule.copy()
+    random_moves(clone, random.Random(4), 20)
+    after = snapshot(clone)
+    # A perturbed copy, rejected later
+    rejected = schedule.copy()
+    rejected.journal.checkpoint()
+    random_moves(rejected, random.Random(5), 20)
+    assert snapshot(rejected) != before
+
+    schedule.sync_contractors()
+    assert snapshot(schedule) == before
+    clone.sync_contractors()
+    assert snapshot(clone) == after
+    # Rolled back while the clone holds the contractors
+    rejected.journal.rollback()
+    rejected.sync_contractors()
+    assert snapshot(rejected) == before
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,30 @@
+import pickle
+import pytest
+from SyntheticErrandsScheduler.models.location import Location
+from SyntheticErrandsScheduler.utils.distance_matrix import get_distance_matrix
+
+def test_locations_are_interned():
+    location = Location(42, 58)
+    assert Location(42, 58) is location
+    assert Location(42.2, 57.9) is location
+    assert pickle.loads(pickle.dumps(location)) is location
+    assert {location: 1}[Location(42, 58)] == 1
+
+def test_locations_are_slotted_and_immutable():
+    location = Location(10, 10)
+    assert not hasattr(location, '__dict__')
+    with pytest.raises(AttributeError):
+        location.x = 11
+
+def test_road_id_indexes_the_distance_matrix():
+    matrix = get_distance_matrix()
+    for x, y in [(0, 0), (10, 10), (37, 64), (99, 99)]:
+        location = Location(x, y)
+        assert location.road_id == matrix.cell_id(location.x, location.y)
+        assert location.road_id >= 0
+
+if __name__ == "__main__":
+    test_locations_are_interned()
+    test_locations_are_slotted_and_immutable()
+    test_road_id_indexes_the_distance_matrix()
+    print("Location tests passed.")
@@ -0,0 +1,35 @@
+import logging
+import subprocess
+import sys
+from SyntheticErrandsScheduler.utils.log_sink import SamplingFilter, configure_logging, shutdown_logging
+
+def test_library_import_does_not_configure_logging():
+    check = ("import logging, SyntheticErrandsScheduler.main; "
+             "root = logging.getLogger(); print(len(root.handlers), root.level)")
+    result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["0", str(logging.WARNING)]
+
+def test_sampling_filter_keeps_one_in_n_per_call_site():
+    sampler = SamplingFilter(sample_rate=3)
+    def record(level, lineno):
+        return logging.LogRecord("solver", level, __file__, lineno, "message", None, None)
+
+    kept = [sampler.filter(record(logging.INFO, 10)) for _ in range(9)]
+    assert kept.count(True) == 3
+    assert sampler.filter(record(logging.INFO, 20))  # A new call site starts its own count
+    assert all(sampler.filter(record(logging.WARNING, 10)) for _ in range(5))
+    assert sampler.dropped == 6
+
+def test_queue_sink_writes_sampled_records_to_file(tmp_path):
+    log_file = tmp_path / "solver.log"
+    logger = logging.getLogger("SyntheticErrandsScheduler.test_log_sink")
+    configure_logging(level=logging.INFO, filename=str(log_file), sample_rate=4)
+    try:
+        for i in range(8):
+            logger.info("Iteration %d", i)
+        logger.warning("Something worth keeping")
+    finally:
+        shutdown_logging()
+
+    lines = log_file.read_text().splitlines()
+    assert [line.split(" - ")[-1] for line in lines] == ["Iteration 0", "Iteration 4", "Something worth keeping"]
@@ -0,0 +1,33 @@
+import numpy as np
+from SyntheticErrandsScheduler.config import ROAD_NETWORK
+from SyntheticErrandsScheduler.models.location import Location
+from SyntheticErrandsScheduler.utils.city_map import find_nearest_road
+from SyntheticErrandsScheduler.utils.distance_matrix import get_distance_matrix
+from SyntheticErrandsScheduler.utils.nearest_road import get_nearest_road_index
+
+def test_snaps_to_nearest_road_in_row_major_order():
+    road_ys, road_xs = np.nonzero(ROAD_NETWORK)
+    index = get_nearest_road_index()
+    for y in range(0, ROAD_NETWORK.shape[0], 3):
+        for x in range(0, ROAD_NETWORK.shape[1], 3):
+            distances = np.abs(road_xs - x) + np.abs(road_ys - y)
+            nearest = np.flatnonzero(distances == distances.min())[0]
+            snapped_x, snapped_y, road_cell = index.snap(x, y)
+            assert (snapped_x, snapped_y) == (road_xs[nearest], road_ys[nearest])
+            assert road_cell == get_distance_matrix().cell_id(snapped_x, snapped_y)
+
+def test_snapping_paths_agree():
+    for x, y in [(0, 0), (3, 7), (15, 15), (42, 58), (99, 99)]:
+        location = Location(x, y)
+        assert ROAD_NETWORK[location.y, location.x]
+        assert find_nearest_road(location) == (location.x, location.y)
+        assert get_nearest_road_index().snap(x, y)[:2] == (location.x, location.y)
+
+def test_out_of_range_coordinates_are_clamped():
+    assert get_nearest_road_index().snap(-4.2, 250)[:2] == get_nearest_road_index().snap(0, 99)[:2]
+
+if __name__ == "__main__":
+    test_snaps_to_nearest_road_in_row_major_order()
+    test_snapping_paths_agree()
+    test_out_of_range_coordinates_are_clamped()
+    print("Nearest road tests passed.")
@@ -0,0 +1,61 @@
+import pytest
+from SyntheticErrandsScheduler.algorithms.neighborhood import Neighborhood, get_candidate_lists
+from SyntheticErrandsScheduler.algorithms.local_search import local_search, swap_errands
+from SyntheticErrandsScheduler.models.problem import describe_assignments
+
+@pytest.fixture
+def schedule(make_schedule):
+    return make_schedule(num_errands=40, num_contractors=4, seed=3, assign=40, days=range(4), window=480)
+
+def manhattan(a, b):
+    return abs(a.x - b.x) + abs(a.y - b.y)
+
+def test_candidate_lists_hold_nearest(schedule):
+    lists = get_candidate_lists(schedule, 5)
+    assert get_candidate_lists(schedule.copy(), 5) is lists
+    for errand in schedule.errands:
+        distances = sorted(manhattan(errand.location, other.location) for other in schedule.errands if other != errand)
+        assert errand not in lists.errands[errand]
+        assert sorted(manhattan(errand.location, other.location) for other in lists.errands[errand]) == distances[:5]
+        nearest = sorted(manhattan(errand.location, c.start_location) for c in schedule.contractors)[:5]
+        assert [manhattan(errand.location, c.start_location) for c in lists.contractors[errand]] == nearest
+
+def test_dont_look_bits_follow_touched_errands(schedule):
+    neighborhood = Neighborhood(schedule, neighbors=3)
+    errand, contractor, start_time = schedule.assignments[0][0]
+    assert neighborhood.should_look(errand)
+
+    neighborhood.touched(schedule, errand, contractor, 0)
+    assert neighborhood.next_pass()
+    assert neighborhood.should_look(errand)
+    assert all(neighborhood.should_look(other) for other in neighborhood.candidates.errands[errand])
+    untouched = [e for e in schedule.errands if not neighborhood.should_look(e)]
+    assert untouched
+
+    assert not neighborhood.next_pass()
+    assert Neighborhood(schedule, dont_look_bits=False).next_pass()
+
+def test_granular_search_keeps_errands_and_uses_fewer_evaluations(schedule):
+    results = {}
+    for name, options in (('full', {'neighbors': None, 'dont_look_bits': False}), ('granular', {})):
+        searched = schedule.copy()
+        assigned = len(searched.completed_errands)
+        neighborhood = Neighborhood(searched, **options)
+        local_search(searched, max_time=2, neighborhood=neighborhood)
+        assert len(searched.completed_errands) == assigned
+        results[name] = neighborhood.evaluations
+    assert 0 < results['granular'] < results['full']
+
+@pytest.mark.parametrize('backend', ['array'])
+def test_swaps_touch_the_errands_they_swap(make_schedule):
+    def swap(schedule):
+        neighborhood = Neighborhood(schedule)
+        assert swap_errands(schedule, neighborhood)
+        return sorted(describe_assignments(schedule)), sorted(errand.id for errand in neighborhood._touched)
+
+    # The array backend hands out copies of the day's assignments, which go stale after a swap
+    options = dict(num_errands=12, seed=2, errand_types=['Delivery'], assign=12, days=[0], window=480)
+    assert swap(make_schedule(**options)) == swap(make_schedule(backend='dict', **options))
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,54 @@
+import random
+import pytest
+from SyntheticErrandsScheduler.models import Location, Errand
+from SyntheticErrandsScheduler.models.objective import ObjectiveTotals
+from SyntheticErrandsScheduler.algorithms.local_search import local_search
+from SyntheticErrandsScheduler.algorithms.mils import check_solution_score, recalculate_solution_score
+from SyntheticErrandsScheduler.config import WORK_START, MAX_DAYS
+
+def test_running_totals_match_recomputation(make_schedule):
+    schedule = make_schedule(num_errands=40, num_contractors=4, seed=11)
+    rng = random.Random(2)
+    for _ in range(200):
+        day = rng.randrange(MAX_DAYS)
+        assignments = schedule.assignments[day]
+        if assignments and (rng.random() < 0.4 or not schedule.unassigned_errands):
+            schedule.remove_assignment(day, rng.choice(assignments))
+        else:
+            errand = rng.choice(sorted(schedule.unassigned_errands, key=lambda e: e.id))
+            contractor = rng.choice(schedule.contractors)
+            schedule.assign_errand(contractor, errand, day, WORK_START + rng.randrange(0, 400, 15))
+        check_solution_score(schedule)
+
+    assert schedule.totals.assigned == len(schedule.completed_errands)
+    assert abs(schedule.score() - recalculate_solution_score(schedule)) < 1e-6
+
+def test_removal_undoes_assignment(make_schedule):
+    schedule = make_schedule(num_errands=40, num_contractors=4, seed=11)
+    before = schedule.score()
+    errand, contractor = schedule.errands[0], schedule.contractors[0]
+    assert schedule.assign_errand(contractor, errand, 3, WORK_START)
+    assert schedule.score() > before
+
+    schedule.remove_assignment(3, schedule.assignments[3][0])
+    assert abs(schedule.score() - before) < 1e-9
+    assert schedule.totals.assigned == 0 and schedule.total_profit == 0
+
+@pytest.mark.parametrize('seed', range(3))
+def test_local_search_never_lowers_the_score(make_schedule, seed):
+    schedule = make_schedule(num_errands=40, num_contractors=4, seed=seed, assign=40, days=range(4), window=480)
+    before = schedule.score()
+    local_search(schedule, max_time=2)
+    assert schedule.score() >= before - 1e-9
+    check_solution_score(schedule)
+
+def test_totals_copy_is_independent():
+    totals = ObjectiveTotals()
+    errand = Errand(0, 'Delivery', Location(0, 0))
+    totals.add(errand, 0, WORK_START)
+    clone = totals.copy()
+    clone.remove(errand, 0, WORK_START)
+    assert totals.assigned == 1 and clone.assigned == 0
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
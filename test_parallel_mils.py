@@ -0,0 +1,58 @@
+import pickle
+import time
+import pytest
+from SyntheticErrandsScheduler.models import describe_problem, build_schedule
+from SyntheticErrandsScheduler.models.problem import describe_assignments, load_assignments
+from SyntheticErrandsScheduler.algorithms import run_parallel_mils
+from SyntheticErrandsScheduler.algorithms.mils import run_seeds
+
+@pytest.fixture
+def schedule(make_schedule):
+    return make_schedule(num_errands=20, num_contractors=2, seed=5, predecessors=[(5, 2)], assign=8)
+
+def test_description_round_trip(schedule):
+    description = describe_problem(schedule)
+    rebuilt = build_schedule(pickle.loads(pickle.dumps(description)))
+
+    assert describe_problem(rebuilt) == description
+    assert abs(rebuilt.score() - schedule.score()) < 1e-9
+    assert {e.id for e in rebuilt.errands[5].predecessors} == {2}
+
+def test_load_assignments_replaces_assignments(schedule):
+    other = schedule.copy()
+    for day in (0, 1):
+        other.remove_assignment(day, other.assignments[day][0])
+    copy = schedule.copy()
+    load_assignments(copy, describe_assignments(other))
+    assert describe_assignments(copy) == describe_assignments(other)
+    assert abs(copy.score() - other.score()) < 1e-9
+    assert len(copy.unassigned_errands) == len(schedule.unassigned_errands) + 2
+
+def test_run_seeds_are_reproducible():
+    root, seeds = run_seeds(123, 4)
+    assert run_seeds(root, 4) == (123, seeds)
+    assert len(set(seeds)) == 4
+
+@pytest.mark.parametrize('backend', ['array'])
+def test_parallel_runs_keep_best_and_time_limit(schedule):
+    started = time.time()
+    best, run_stats = run_parallel_mils(schedule, num_runs=3, workers=2, seed=7, time_limit=10,
+                                        max_iterations=5, max_time=5)
+    assert time.time() - started < 10 + 2
+
+    finished = [stats for stats in run_stats if stats['status'] == 'ok']
+    assert [stats['run'] for stats in run_stats] == [0, 1, 2]
+    assert finished
+    assert abs(best.score() - max(stats['score'] for stats in finished)) < 1e-6
+    assert best.contractors is schedule.contractors
+
+def test_parallel_runs_out_of_time_return_the_input(schedule):
+    started = time.time()
+    # With no time left, every worker gives up before building its schedule
+    best, run_stats = run_parallel_mils(schedule, num_runs=2, workers=2, seed=7, time_limit=0)
+    assert time.time() - started < 5
+    assert all(stats['status'] == 'timed out' for stats in run_stats)
+    assert describe_assignments(best) == describe_assignments(schedule)
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
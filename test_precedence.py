@@ -0,0 +1,53 @@
+import pytest
+from SyntheticErrandsScheduler.models import Location, Errand, Contractor, create_schedule
+from SyntheticErrandsScheduler.models.precedence import PrecedenceGraph
+from SyntheticErrandsScheduler.config import WORK_START
+
+def make_chain():
+    first = Errand(0, 'Delivery', Location(10, 10))
+    second = Errand(1, 'Delivery', Location(12, 10), predecessors={first})
+    third = Errand(2, 'Delivery', Location(14, 10), predecessors={first, second})
+    return [third, second, first]
+
+def test_topological_order():
+    errands = make_chain()
+    graph = PrecedenceGraph(errands)
+    assert [errands[i].id for i in graph.order] == [0, 1, 2]
+    assert graph.topological_index.tolist() == [2, 1, 0]
+    assert graph.unfinished_counts().tolist() == [2, 1, 0]
+
+def test_cycles_are_rejected():
+    first = Errand(0, 'Delivery', Location(10, 10))
+    second = Errand(1, 'Delivery', Location(12, 10), predecessors={first})
+    first.predecessors = {second}
+    try:
+        PrecedenceGraph([first, second, Errand(2, 'Delivery', Location(0, 0))])
+    except ValueError as e:
+        assert '[0, 1]' in str(e)
+    else:
+        raise AssertionError("Cyclic predecessors were accepted")
+
+def test_schedule_tracks_unfinished_predecessors(backend):
+    third, second, first = errands = make_chain()
+    contractor = Contractor(0, Location(10, 10))
+    schedule = create_schedule([contractor], errands, backend=backend)
+
+    assert not schedule.can_assign_errand(contractor, second, 0, WORK_START)
+    assert schedule.assign_errand(contractor, first, 0, WORK_START)
+    assert schedule.predecessors_completed(second)
+    assert not schedule.predecessors_completed(second, excluding=first)
+    assert not schedule.predecessors_completed(third)
+
+    schedule.journal.checkpoint()
+    assert schedule.assign_errand(contractor, second, 0, WORK_START + 120)
+    assert schedule.predecessors_completed(third)
+    schedule.journal.rollback()
+    assert not schedule.predecessors_completed(third)
+
+    clone = schedule.copy()
+    clone.remove_assignment(0, clone.assignments[0][0])
+    assert not clone.predecessors_completed(second)
+    assert schedule.predecessors_completed(second)
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
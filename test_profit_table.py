@@ -0,0 +1,43 @@
+import random
+import pytest
+from SyntheticErrandsScheduler.models import Location, Errand, Contractor, create_schedule
+from SyntheticErrandsScheduler.models.objective import early_completion_bonus
+from SyntheticErrandsScheduler.models.profit_table import ProfitTable
+from SyntheticErrandsScheduler.algorithms.mils import calculate_early_completion_bonus
+from SyntheticErrandsScheduler.config import ERRANDS, MAX_DAYS, WORK_START
+
+def make_errands():
+    errands = []
+    for errand_type in ERRANDS:
+        for days_since_request in (0, 3, 7, 13, 20):
+            errands.append(Errand(len(errands), errand_type, Location(len(errands) % 100, 5),
+                                  days_since_request=days_since_request))
+    return errands
+
+def test_table_matches_errand_profit():
+    errands = make_errands()
+    table = ProfitTable(errands)
+    assert table.profit.shape == (len(errands), MAX_DAYS)
+    for i, errand in enumerate(errands):
+        for day in range(MAX_DAYS):
+            assert table.profit[i, day] == errand.calculate_profit(day)
+            assert table.profit_of(errand, day) == errand.calculate_profit(day)
+            assert table.completion_bonus_of(errand, day) == early_completion_bonus(errand, day)
+            assert table.early_bonus[i, day] >= 0 and table.late_penalty[i, day] >= 0
+            assert table.early_bonus[i, day] == 0 or table.late_penalty[i, day] == 0
+
+def test_early_completion_bonus_reads_table(backend):
+    errands = make_errands()
+    contractor = Contractor(0, Location(0, 5))
+    schedule = create_schedule([contractor], errands, backend=backend)
+    rng = random.Random(4)
+    for errand in rng.sample(errands, 6):
+        schedule.assign_errand(contractor, errand, rng.randrange(MAX_DAYS), WORK_START)
+
+    expected = sum(early_completion_bonus(errand, day)
+                   for day in range(MAX_DAYS) for errand, _, _ in schedule.assignments[day])
+    assert abs(calculate_early_completion_bonus(schedule) - expected) < 1e-9
+    assert abs(schedule.totals.early_completion_bonus - expected) < 1e-9
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,65 @@
+import random
+import numpy as np
+from SyntheticErrandsScheduler.config import ROAD_NETWORK
+from SyntheticErrandsScheduler.utils.distance_matrix import get_distance_matrix
+from SyntheticErrandsScheduler.utils.road_graph import RoadGraph, CompressedRoadGraph, get_road_graph
+from SyntheticErrandsScheduler.utils.landmarks import LandmarkRouter
+from SyntheticErrandsScheduler.utils.pathfinding import AStarRouter, GraphRouter
+
+def random_cell_pairs(graph, count, seed):
+    rng = random.Random(seed)
+    return [(rng.randrange(graph.num_road_cells), rng.randrange(graph.num_road_cells)) for _ in range(count)]
+
+def test_compressed_graph_keeps_only_intersections_and_dead_ends():
+    full = RoadGraph.from_roads(ROAD_NETWORK)
+    graph = get_road_graph()
+
+    assert graph.num_road_cells == full.num_nodes
+    assert graph.num_nodes < full.num_nodes // 4
+    assert graph.weights.sum() == full.weights.sum()
+    degrees = (full.indptr[1:] - full.indptr[:-1])[graph.cell_index[graph.cells]]
+    assert (degrees != 2).all()
+
+def test_compressed_graph_distances_match_grid_search():
+    graph = get_road_graph()
+    router = GraphRouter(graph)
+    astar = AStarRouter(ROAD_NETWORK)
+    for source, target in random_cell_pairs(graph, 300, seed=5):
+        start = (int(graph.cell_xs[source]), int(graph.cell_ys[source]))
+        goal = (int(graph.cell_xs[target]), int(graph.cell_ys[target]))
+        assert router.distance(source, target) == astar.distance(start, goal)
+
+def test_compressed_graph_handles_loops():
+    roads = np.zeros((6, 6), dtype=bool)
+    roads[1, 1:5] = roads[4, 1:5] = roads[1:5, 1] = roads[1:5, 4] = True
+    graph = CompressedRoadGraph.from_roads(roads)
+    router = GraphRouter(graph)
+
+    assert graph.num_nodes == 1
+    assert router.cell_distance((1, 1), (4, 4)) == 6
+    assert router.cell_distance((2, 1), (1, 2)) == 2
+    assert router.cell_distance((4, 2), (2, 4)) == 4
+
+def test_landmark_router_matches_distance_matrix():
+    matrix = get_distance_matrix()
+    router = LandmarkRouter(CompressedRoadGraph.from_roads(ROAD_NETWORK), num_landmarks=8)
+    walked = searched = 0
+    for source, target in random_cell_pairs(router.graph, 300, seed=11):
+        start = (int(router.graph.cell_xs[source]), int(router.graph.cell_ys[source]))
+        goal = (int(router.graph.cell_xs[target]), int(router.graph.cell_ys[target]))
+        distance = router.distance(source, target)
+        assert distance == matrix.distance(source, target)
+        if not router.corridors.monotone_path_exists(start, goal):
+            if distance == abs(start[0] - goal[0]) + abs(start[1] - goal[1]):
+                walked += 1
+            else:
+                searched += 1
+    # The corridor shortcut, the monotone walk and the landmark search must all be exercised
+    assert walked > 0 and searched > 0 and walked + searched < 300
+
+if __name__ == "__main__":
+    test_compressed_graph_keeps_only_intersections_and_dead_ends()
+    test_compressed_graph_distances_match_grid_search()
+    test_compressed_graph_handles_loops()
+    test_landmark_router_matches_distance_matrix()
+    print("Routing tests passed.")
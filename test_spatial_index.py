@@ -0,0 +1,52 @@
+import random
+from SyntheticErrandsScheduler.config import GRID_SIZE
+from SyntheticErrandsScheduler.models.location import Location
+from SyntheticErrandsScheduler.utils.spatial_index import SpatialIndex
+
+def brute_force_distances(items, location):
+    return sorted(abs(item.x - location.x) + abs(item.y - location.y) for item in items)
+
+def random_locations(rng, count):
+    return [Location(rng.randint(0, GRID_SIZE - 1), rng.randint(0, GRID_SIZE - 1)) for _ in range(count)]
+
+def test_nearest_and_radius_queries_match_brute_force():
+    rng = random.Random(5)
+    items = list(set(random_locations(rng, 300)))
+    index = SpatialIndex.from_items(items, lambda item: item, bucket_size=7)
+
+    for query in random_locations(rng, 50):
+        nearest = index.nearest(query, 10)
+        assert [query.distance_to(item) for item in nearest] == brute_force_distances(items, query)[:10]
+
+        nearby = index.within_radius(query, 15)
+        assert sorted(query.distance_to(item) for item in nearby) == \
+            [d for d in brute_force_distances(items, query) if d <= 15]
+
+def test_incremental_insert_and_remove():
+    rng = random.Random(9)
+    items = list(set(random_locations(rng, 200)))
+    index = SpatialIndex.from_items(items[:100], lambda item: item)
+    for item in items[100:]:
+        index.insert(item, item)
+    removed = set(items[::3])
+    for item in removed:
+        index.remove(item)
+    index.remove(items[0])  # Already removed
+
+    remaining = [item for item in items if item not in removed]
+    assert len(index) == len(remaining)
+    query = Location(50, 50)
+    found = index.nearest(query, len(items))
+    assert set(found) == set(remaining)
+    assert [query.distance_to(item) for item in found] == brute_force_distances(remaining, query)
+
+def test_nearest_with_predicate():
+    items = [Location(0, 0), Location(10, 0), Location(20, 0)]
+    index = SpatialIndex.from_items(items, lambda item: item)
+    assert index.nearest(Location(0, 0), 1, predicate=lambda item: item.x > 5) == [items[1]]
+
+if __name__ == "__main__":
+    test_nearest_and_radius_queries_match_brute_force()
+    test_incremental_insert_and_remove()
+    test_nearest_with_predicate()
+    print("Spatial index tests passed.")
@@ -0,0 +1,54 @@
+import pytest
+from SyntheticErrandsScheduler.models import Location, Errand
+from SyntheticErrandsScheduler.models.timeline import DayTimeline
+from SyntheticErrandsScheduler.config import WORK_START, WORK_END
+
+def test_overlap_and_gaps():
+    timeline = DayTimeline()
+    errand1, errand2 = Errand(1, 'Delivery', Location(0, 0)), Errand(2, 'Delivery', Location(10, 0))
+    timeline.add(600, 660, errand1, errand1.location)
+    timeline.add(700, 760, errand2, errand2.location)
+
+    assert timeline.overlaps(650, 670) and timeline.overlaps(590, 610) and timeline.overlaps(500, 800)
+    assert not timeline.overlaps(660, 700) and not timeline.overlaps(540, 600)
+    assert timeline.gap_at(630) is None
+    assert timeline.gap_at(680) == (660, 700, errand1.location, errand2.location)
+    assert timeline.gap_at(500) == (None, 600, None, errand1.location)
+    assert timeline.next_free_time(620) == 660 and timeline.next_free_time(670) == 670
+
+    try:
+        timeline.add(650, 710, Errand(3, 'Delivery', Location(5, 0)), Location(5, 0))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Overlapping span was accepted")
+
+    timeline.remove(600, errand1)
+    assert len(timeline) == 1 and timeline.gap_at(630) == (None, 700, None, errand2.location)
+
+def test_earliest_insertion_skips_gaps_that_are_too_short():
+    timeline = DayTimeline()
+    home = Location(0, 0)
+    for i, start in enumerate((500, 560, 700)):
+        errand = Errand(i, 'Delivery', Location(0, 0))
+        timeline.add(start, start + 50, errand, errand.location)
+    travel_time = lambda origin, destination, departure: 5
+
+    # The 550-560 gap is too short for a 20 minute span plus travel; 610-700 fits
+    assert timeline.earliest_insertion(Location(1, 1), 20, 540, home, travel_time) == 615
+    assert timeline.earliest_insertion(Location(1, 1), 20, 400, home, travel_time) == 405
+    assert timeline.earliest_insertion(Location(1, 1), 120, 400, home, travel_time, latest_end=800) is None
+
+def test_schedule_rejects_overlapping_assignments(make_schedule):
+    schedule = make_schedule(num_errands=60, num_contractors=2, seed=8, assign=60, days=range(2),
+                             window=WORK_END - 60 - WORK_START)
+    assert len(schedule.unassigned_errands) > 0
+    for day in range(2):
+        for contractor in schedule.contractors:
+            spans = sorted((start_time, start_time + errand.service_time)
+                           for errand, cont, start_time in schedule.assignments[day] if cont == contractor)
+            assert all(end <= next_start for (_, end), (next_start, _) in zip(spans, spans[1:]))
+            assert len(schedule.timelines.get(contractor, day)) == len(spans)
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
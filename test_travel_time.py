@@ -0,0 +1,74 @@
+import random
+from SyntheticErrandsScheduler.models.location import Location
+from SyntheticErrandsScheduler.config import GRID_SIZE, TRAFFIC_FACTORS
+from SyntheticErrandsScheduler.utils.travel_time import calculate_travel_time, astar_travel_time, set_routing_mode, TravelTimeCache, travel_time_matrix, traffic_factor
+
+def random_location(rng):
+    return Location(rng.randint(0, GRID_SIZE-1), rng.randint(0, GRID_SIZE-1))
+
+def test_matrix_matches_astar():
+    rng = random.Random(42)
+    for _ in range(200):
+        start, end = random_location(rng), random_location(rng)
+        assert calculate_travel_time(start, end) == astar_travel_time(start, end)
+
+def test_same_location():
+    location = Location(10, 10)
+    assert calculate_travel_time(location, location) == astar_travel_time(location, location)
+
+def test_on_demand_routing_modes():
+    rng = random.Random(7)
+    pairs = [(random_location(rng), random_location(rng)) for _ in range(50)]
+    expected = [calculate_travel_time(start, end) for start, end in pairs]
+    for mode in ('astar', 'landmarks'):
+        set_routing_mode(mode)
+        try:
+            assert [calculate_travel_time(start, end) for start, end in pairs] == expected
+        finally:
+            set_routing_mode('matrix')
+
+def test_travel_time_matrix_matches_pairwise():
+    rng = random.Random(3)
+    sources = [random_location(rng) for _ in range(5)] + [Location(99, 99)]
+    targets = [random_location(rng) for _ in range(8)]
+    times = travel_time_matrix(sources, targets)
+
+    assert times.shape == (len(sources), len(targets))
+    for i, source in enumerate(sources):
+        for j, target in enumerate(targets):
+            assert times[i, j] == calculate_travel_time(source, target)
+
+def test_departure_time_scales_by_traffic_period():
+    start, end = Location(0, 0), Location(50, 50)
+    base = calculate_travel_time(start, end)
+
+    assert traffic_factor(8 * 60) == TRAFFIC_FACTORS['morning_rush']
+    assert traffic_factor(12 * 60) == TRAFFIC_FACTORS['normal']
+    assert calculate_travel_time(start, end, departure_time=8 * 60) == base * TRAFFIC_FACTORS['morning_rush']
+    assert calculate_travel_time(start, end, departure_time=17 * 60) == base * TRAFFIC_FACTORS['evening_rush']
+    assert travel_time_matrix([start], [end], departure_time=23 * 60)[0, 0] == base * TRAFFIC_FACTORS['night']
+
+def test_travel_time_cache_eviction():
+    cache = TravelTimeCache(maxsize=2)
+    a, b, c = Location(0, 0), Location(10, 0), Location(20, 0)
+    cache.get(a, b, astar_travel_time)
+    cache.get(a, c, astar_travel_time)
+    cache.get(a, b, astar_travel_time)  # a->b becomes most recently used
+    cache.get(b, c, astar_travel_time)  # evicts a->c
+    cache.get(a, b, astar_travel_time)
+    cache.get(a, c, astar_travel_time)
+
+    stats = cache.stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 4
+    assert stats['evictions'] == 2
+    assert stats['size'] == 2
+
+if __name__ == "__main__":
+    test_matrix_matches_astar()
+    test_same_location()
+    test_on_demand_routing_modes()
+    test_travel_time_matrix_matches_pairwise()
+    test_departure_time_scales_by_traffic_period()
+    test_travel_time_cache_eviction()
+    print("Travel time tests passed.")